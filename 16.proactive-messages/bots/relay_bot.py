@@ -30,6 +30,13 @@ def build_sender_id(activity) -> str:
     return f"{user_id}|{aad_id}" if aad_id else user_id
 
 
+def mentions_bot(activity) -> bool:
+    bot_id = activity.recipient.id if activity.recipient else ""
+    return bool(bot_id) and any(
+        m.mentioned and m.mentioned.id == bot_id for m in TurnContext.get_mentions(activity)
+    )
+
+
 class RelayBot(ActivityHandler):
     def __init__(self, store: ConversationReferenceStore, nanobot: NanobotClient):
         self.store = store
@@ -52,6 +59,7 @@ class RelayBot(ActivityHandler):
                 "channel": "teams",
                 "message_id": activity.id,
                 "tenant_id": chat_id.split("|", 1)[0],
+                "was_mentioned": mentions_bot(activity),
             },
         )
 
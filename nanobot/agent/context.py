@@ -2,28 +2,68 @@
 
 import base64
 import mimetypes
+import os
 import platform
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Hashable
+
+from loguru import logger
 
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.skills import SkillsLoader
 
 
+@dataclass
+class _Segment:
+    """A cached piece of the system prompt and the file state it was built from."""
+    text: str
+    key: Hashable
+    paths: list[Path]
+    fingerprint: tuple
+    checked_at: float
+
+
+@dataclass
+class SegmentStats:
+    """Cache counters of one system prompt segment."""
+    hits: int = 0
+    rebuilds: int = 0
+
+
 class ContextBuilder:
     """
     Builds the context (system prompt + messages) for the agent.
     
     Assembles bootstrap files, memory, skills, and conversation history
     into a coherent prompt for the LLM.
+
+    Two layouts are supported:
+    - ``legacy``: time, session and memory live in the system prompt.
+    - ``stable``: the system prompt only holds identity, bootstrap files and
+      skills, so it stays byte-identical across minutes and chats and can be
+      served from the provider's prompt cache. Time, session and memory are
+      sent in a runtime block ahead of the current user message.
     """
     
     BOOTSTRAP_FILES = ["AGENTS.md", "SOUL.md", "USER.md", "TOOLS.md", "IDENTITY.md"]
     
-    def __init__(self, workspace: Path):
+    # Cached segments are trusted without touching the filesystem for this long;
+    # after that a stat() of their source files decides whether to rebuild.
+    REVALIDATE_INTERVAL = 1.0
+
+    LAYOUTS = ("legacy", "stable")
+
+    def __init__(self, workspace: Path, prompt_layout: str = "legacy"):
+        if prompt_layout not in self.LAYOUTS:
+            raise ValueError(f"Unknown prompt layout: {prompt_layout}")
         self.workspace = workspace
+        self.prompt_layout = prompt_layout
         self.memory = MemoryStore(workspace)
         self.skills = SkillsLoader(workspace)
+        self._segments: dict[str, _Segment] = {}
+        self._stats: dict[str, SegmentStats] = {}
     
     def build_system_prompt(self, skill_names: list[str] | None = None) -> str:
         """
@@ -37,57 +77,152 @@ class ContextBuilder:
         """
         parts = []
         
-        # Core identity
-        parts.append(self._get_identity())
+        stable = self.prompt_layout == "stable"
+
+        # Core identity (the legacy layout embeds the current minute, so it is keyed on it)
+        now = None if stable else time.strftime("%Y-%m-%d %H:%M")
+        parts.append(self._segment("identity", lambda: self._get_identity(include_time=not stable), key=now))
         
         # Bootstrap files
-        bootstrap = self._load_bootstrap_files()
+        bootstrap = self._segment(
+            "bootstrap", self._load_bootstrap_files,
+            paths=lambda: [self.workspace / f for f in self.BOOTSTRAP_FILES],
+        )
         if bootstrap:
             parts.append(bootstrap)
         
-        # Memory context
-        memory = self.memory.get_memory_context()
+        # Memory context (moved to the runtime block in the stable layout)
+        memory = "" if stable else self._memory_section()
         if memory:
-            parts.append(f"# Memory\n\n{memory}")
+            parts.append(memory)
         
         # Skills - progressive loading
         # 1. Always-loaded skills: include full content
-        always_skills = self.skills.get_always_skills()
+        always_skills = self._segment(
+            "always_skills", self._build_always_skills_section, paths=self.skills.source_paths,
+        )
         if always_skills:
-            always_content = self.skills.load_skills_for_context(always_skills)
-            if always_content:
-                parts.append(f"# Active Skills\n\n{always_content}")
+            parts.append(always_skills)
         
         # 2. Available skills: only show summary (agent uses read_file to load)
-        skills_summary = self.skills.build_skills_summary()
+        skills_summary = self._segment(
+            "skills_summary", self._build_skills_summary_section, paths=self.skills.source_paths,
+        )
         if skills_summary:
-            parts.append(f"""# Skills
+            parts.append(skills_summary)
+
+        return "\n\n---\n\n".join(parts)
+
+    def _memory_section(self) -> str:
+        return self._segment(
+            "memory", self._build_memory_section,
+            paths=lambda: [self.memory.memory_file],
+        )
+
+    def _build_memory_section(self) -> str:
+        memory = self.memory.get_memory_context()
+        return f"# Memory\n\n{memory}" if memory else ""
+
+    def _build_always_skills_section(self) -> str:
+        always_skills = self.skills.get_always_skills()
+        if not always_skills:
+            return ""
+        always_content = self.skills.load_skills_for_context(always_skills)
+        return f"# Active Skills\n\n{always_content}" if always_content else ""
+
+    def _build_skills_summary_section(self) -> str:
+        skills_summary = self.skills.build_skills_summary()
+        if not skills_summary:
+            return ""
+        return f"""# Skills
 
 The following skills extend your capabilities. To use a skill, read its SKILL.md file using the read_file tool.
 Skills with available="false" need dependencies installed first - you can try installing them with apt/brew.
 
-{skills_summary}""")
+{skills_summary}"""
+
+    def _segment(
+        self,
+        name: str,
+        build: Callable[[], str],
+        paths: Callable[[], list[Path]] | None = None,
+        key: Hashable = None,
+    ) -> str:
+        """
+        Return a cached prompt segment, rebuilding it only when its sources changed.
         
-        return "\n\n---\n\n".join(parts)
+        Args:
+            name: Segment name (also the counter key).
+            build: Produces the segment text.
+            paths: Lists the files the segment is built from; their mtime and size
+                form the fingerprint.
+            key: Extra value that invalidates the segment when it changes.
+
+        Returns:
+            Segment text.
+        """
+        stats = self._stats.setdefault(name, SegmentStats())
+        now = time.monotonic()
+        seg = self._segments.get(name)
+        if seg is not None and seg.key == key:
+            if (now - seg.checked_at < self.REVALIDATE_INTERVAL
+                    or self._fingerprint(seg.paths) == seg.fingerprint):
+                seg.checked_at = now
+                stats.hits += 1
+                return seg.text
+
+        source_paths = paths() if paths else []
+        # Fingerprint before reading so a write during the build triggers another rebuild
+        fingerprint = self._fingerprint(source_paths)
+        text = build()
+        self._segments[name] = _Segment(text, key, source_paths, fingerprint, now)
+        stats.rebuilds += 1
+        logger.debug("System prompt segment '{}' rebuilt", name)
+        return text
+
+    @staticmethod
+    def _fingerprint(paths: list[Path]) -> tuple:
+        """Stat-based fingerprint; missing files are part of it so creation is detected."""
+        result = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+                result.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                result.append(None)
+        return tuple(result)
+
+    def invalidate(self, name: str | None = None) -> None:
+        """Drop one cached segment, or all of them, forcing a rebuild on next use."""
+        if name is None:
+            self._segments.clear()
+        else:
+            self._segments.pop(name, None)
+
+    @property
+    def cache_stats(self) -> dict[str, SegmentStats]:
+        """Hit and rebuild counters per system prompt segment."""
+        return dict(self._stats)
     
-    def _get_identity(self) -> str:
-        """Get the core identity section."""
+    @staticmethod
+    def _current_time() -> str:
         from datetime import datetime
-        import time as _time
         now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
-        tz = _time.strftime("%Z") or "UTC"
+        tz = time.strftime("%Z") or "UTC"
+        return f"{now} ({tz})"
+
+    def _get_identity(self, include_time: bool = True) -> str:
+        """Get the core identity section."""
         workspace_path = str(self.workspace.expanduser().resolve())
         system = platform.system()
         runtime = f"{'macOS' if system == 'Darwin' else system} {platform.machine()}, Python {platform.python_version()}"
+        current_time = f"## Current Time\n{self._current_time()}\n\n" if include_time else ""
         
         return f"""# nanobot 🐈
 
 You are nanobot, a helpful AI assistant. 
 
-## Current Time
-{now} ({tz})
-
-## Runtime
+{current_time}## Runtime
 {runtime}
 
 ## Workspace
@@ -144,19 +279,33 @@ To recall past events, grep {workspace_path}/memory/HISTORY.md"""
 
         # System prompt
         system_prompt = self.build_system_prompt(skill_names)
-        if channel and chat_id:
+        if self.prompt_layout == "legacy" and channel and chat_id:
             system_prompt += f"\n\n## Current Session\nChannel: {channel}\nChat ID: {chat_id}"
         messages.append({"role": "system", "content": system_prompt})
 
         # History
         messages.extend(history)
 
-        # Current message (with optional image attachments)
+        # Current message (with optional image attachments); the stable layout
+        # prepends the volatile facts so everything before it stays cacheable
+        if self.prompt_layout == "stable":
+            current_message = f"{self._build_runtime_context(channel, chat_id)}\n\n{current_message}"
         user_content = self._build_user_content(current_message, media)
         messages.append({"role": "user", "content": user_content})
 
         return messages
 
+    def _build_runtime_context(self, channel: str | None, chat_id: str | None) -> str:
+        """Volatile facts sent with the current message in the stable layout."""
+        lines = ["[Runtime Context — metadata, not part of the user's message]",
+                 f"Current Time: {self._current_time()}"]
+        if channel and chat_id:
+            lines += [f"Channel: {channel}", f"Chat ID: {chat_id}"]
+        memory = self._memory_section()
+        if memory:
+            lines += ["", memory]
+        return "\n".join(lines) + "\n[/Runtime Context]"
+
     def _build_user_content(self, text: str, media: list[str] | None) -> str | list[dict[str, Any]]:
         """Build user message content with optional base64-encoded images."""
         if not media:
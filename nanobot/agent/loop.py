@@ -5,6 +5,9 @@ from __future__ import annotations
 import asyncio
 import json
 import re
+import time
+import uuid
+from collections import deque
 from contextlib import AsyncExitStack
 from pathlib import Path
 from typing import TYPE_CHECKING, Awaitable, Callable
@@ -14,23 +17,116 @@ from loguru import logger
 from nanobot.agent.context import ContextBuilder
 from nanobot.agent.memory import MemoryStore
 from nanobot.agent.subagent import SubagentManager
+from nanobot.agent.timing import TurnMetrics, current_timer, phase
 from nanobot.agent.tools.cron import CronTool
 from nanobot.agent.tools.filesystem import EditFileTool, ListDirTool, ReadFileTool, WriteFileTool
 from nanobot.agent.tools.message import MessageTool
+from nanobot.agent.tools.offload import ReadToolResultTool, ToolResultStore
 from nanobot.agent.tools.registry import ToolRegistry
 from nanobot.agent.tools.shell import ExecTool
 from nanobot.agent.tools.spawn import SpawnTool
 from nanobot.agent.tools.web import WebFetchTool, WebSearchTool
 from nanobot.bus.events import InboundMessage, OutboundMessage
-from nanobot.bus.queue import MessageBus
+from nanobot.bus.queue import BusClosedError, MessageBus
+from nanobot.bus.scheduler import lane_of
 from nanobot.providers.base import LLMProvider
 from nanobot.session.manager import Session, SessionManager
 
 if TYPE_CHECKING:
-    from nanobot.config.schema import ExecToolConfig
+    from nanobot.config.schema import ExecToolConfig, ToolOffloadConfig
     from nanobot.cron.service import CronService
 
 
+class _TurnStream:
+    """
+    Forwards the visible text of one turn's LLM calls to the bus as it arrives.
+
+    Every LLM call is its own segment with a distinct ``_stream_id`` so channels
+    can render each one as a separate, progressively edited message.
+    ``<think>`` blocks are withheld, including partially received tags.
+    """
+
+    _THINK_OPEN = "<think>"
+    _THINK_CLOSE = "</think>"
+
+    def __init__(self, bus: MessageBus, channel: str, chat_id: str, metadata: dict):
+        self._bus = bus
+        self._channel = channel
+        self._chat_id = chat_id
+        self._metadata = metadata
+        self._segment_id: str | None = None
+        self._pending = ""  # Received text not yet classified as visible or thinking
+        self._in_think = False
+        self._sent = 0
+        self.final_id: str | None = None  # Segment the final response should replace
+
+    def begin(self) -> None:
+        """Start a new segment for the next LLM call."""
+        self._segment_id = uuid.uuid4().hex[:12]
+        self._pending = ""
+        self._in_think = False
+        self._sent = 0
+
+    @property
+    def streamed(self) -> bool:
+        """True once the current segment has published visible text."""
+        return self._sent > 0
+
+    async def feed(self, delta: str) -> None:
+        visible = self._visible(delta)
+        if not self._sent:
+            visible = visible.lstrip()
+        if visible:
+            await self._publish(visible)
+            self._sent += len(visible)
+
+    async def end(self) -> None:
+        """Close a segment that will not be followed by a final response."""
+        if self.streamed:
+            await self._publish("", _stream_end=True)
+
+    def finish(self) -> None:
+        """Mark the current segment as the one carrying the final response."""
+        self.final_id = self._segment_id if self.streamed else None
+
+    async def _publish(self, content: str, **extra) -> None:
+        meta = dict(self._metadata)
+        meta.update(_stream=True, _stream_id=self._segment_id, **extra)
+        await self._bus.publish_outbound(OutboundMessage(
+            channel=self._channel, chat_id=self._chat_id, content=content, metadata=meta,
+        ))
+
+    def _visible(self, delta: str) -> str:
+        """Visible text completed by a delta; only an unfinished tag is carried over."""
+        self._pending += delta
+        out = []
+        while self._pending:
+            if self._in_think:
+                end = self._pending.find(self._THINK_CLOSE)
+                if end < 0:
+                    self._pending = self._pending[-(len(self._THINK_CLOSE) - 1):]
+                    break
+                self._pending = self._pending[end + len(self._THINK_CLOSE):]
+                self._in_think = False
+                continue
+            start = self._pending.find(self._THINK_OPEN)
+            if start >= 0:
+                out.append(self._pending[:start])
+                self._pending = self._pending[start + len(self._THINK_OPEN):]
+                self._in_think = True
+                continue
+            # Hold back a trailing fragment that may still become "<think>"
+            keep = 0
+            for n in range(min(len(self._pending), len(self._THINK_OPEN) - 1), 0, -1):
+                if self._THINK_OPEN.startswith(self._pending[-n:]):
+                    keep = n
+                    break
+            out.append(self._pending[:len(self._pending) - keep])
+            self._pending = self._pending[len(self._pending) - keep:]
+            break
+        return "".join(out)
+
+
 class AgentLoop:
     """
     The agent loop is the core processing engine.
@@ -41,8 +137,22 @@ class AgentLoop:
     3. Calls the LLM
     4. Executes tool calls
     5. Sends responses back
+
+    Messages are sharded by session: turns of the same session run strictly
+    in order, while different sessions run concurrently up to
+    ``max_concurrent_turns``.
+
+    Each turn runs as its own task and can be cancelled by ``/stop``, by a
+    newer message of the same session (``turn_policy="supersede"``) or via
+    ``cancel_request`` (e.g. when a relay client disconnects).
+
+    Inbound messages are acked on the bus only once their turn has finished
+    or was cancelled on purpose (``/stop``, supersede, ``cancel_request``), so
+    a durable bus replays turns interrupted by a crash or a shutdown.
     """
 
+    _CANCELLED_REPLY = "(Stopped before finishing this request.)"
+
     def __init__(
         self,
         bus: MessageBus,
@@ -59,8 +169,17 @@ class AgentLoop:
         restrict_to_workspace: bool = False,
         session_manager: SessionManager | None = None,
         mcp_servers: dict | None = None,
+        max_concurrent_turns: int = 4,
+        max_parallel_tools: int = 4,
+        stream: bool = False,
+        prompt_layout: str = "legacy",
+        context_window_tokens: int = 0,
+        history_reserve_tokens: int = 8000,
+        offload_config: ToolOffloadConfig | None = None,
+        turn_policy: str = "queue",
+        metrics_path: Path | None = None,
     ):
-        from nanobot.config.schema import ExecToolConfig
+        from nanobot.config.schema import ExecToolConfig, ToolOffloadConfig
         self.bus = bus
         self.provider = provider
         self.workspace = workspace
@@ -71,12 +190,24 @@ class AgentLoop:
         self.memory_window = memory_window
         self.brave_api_key = brave_api_key
         self.exec_config = exec_config or ExecToolConfig()
+        self.offload_config = offload_config or ToolOffloadConfig()
         self.cron_service = cron_service
         self.restrict_to_workspace = restrict_to_workspace
-
-        self.context = ContextBuilder(workspace)
+        self.max_concurrent_turns = max(1, max_concurrent_turns)
+        self.max_parallel_tools = max(1, max_parallel_tools)
+        self.stream = stream
+        self.turn_policy = turn_policy
+        # Token budget for session history: what is left of the context window after
+        # the completion, system prompt and tool definitions. 0 disables the budget.
+        self.history_token_budget: int | None = None
+        if context_window_tokens > 0:
+            self.history_token_budget = max(0, context_window_tokens - max_tokens - history_reserve_tokens)
+
+        self.context = ContextBuilder(workspace, prompt_layout=prompt_layout)
         self.sessions = session_manager or SessionManager(workspace)
-        self.tools = ToolRegistry()
+        self.tool_results = ToolResultStore(self.offload_config.threshold, self.offload_config.preview_chars)
+        self.tools = ToolRegistry(result_store=self.tool_results)
+        self.metrics = TurnMetrics(metrics_path)
         self.subagents = SubagentManager(
             provider=provider,
             workspace=workspace,
@@ -87,14 +218,24 @@ class AgentLoop:
             brave_api_key=brave_api_key,
             exec_config=self.exec_config,
             restrict_to_workspace=restrict_to_workspace,
+            max_parallel_tools=self.max_parallel_tools,
+            offload_config=self.offload_config,
         )
 
         self._running = False
+        self._run_task: asyncio.Task | None = None
         self._mcp_servers = mcp_servers or {}
         self._mcp_stack: AsyncExitStack | None = None
         self._mcp_connected = False
         self._mcp_connecting = False
         self._consolidating: set[str] = set()  # Session keys with consolidation in progress
+        self._session_queues: dict[str, deque[InboundMessage]] = {}  # Pending messages per session
+        self._session_workers: dict[str, asyncio.Task] = {}  # One worker per busy session
+        self._active_turns: dict[str, tuple[InboundMessage, asyncio.Task]] = {}  # Running turn per session
+        self._dismissed: set[asyncio.Task] = set()  # Turns cancelled by cancel_turn rather than shutdown
+        self._submitted: dict[str, asyncio.Future[str]] = {}  # Callers of submit() awaiting a reply
+        self._parked = 0  # Messages waiting behind a running turn of their session
+        self._capacity_changed = asyncio.Event()
         self._register_default_tools()
 
     def _register_default_tools(self) -> None:
@@ -109,6 +250,7 @@ class AgentLoop:
         ))
         self.tools.register(WebSearchTool(api_key=self.brave_api_key))
         self.tools.register(WebFetchTool())
+        self.tools.register(ReadToolResultTool(self.tool_results))
         self.tools.register(MessageTool(send_callback=self.bus.publish_outbound))
         self.tools.register(SpawnTool(manager=self.subagents))
         if self.cron_service:
@@ -143,7 +285,13 @@ class AgentLoop:
         message_id: str | None = None,
         request_id: str | None = None,
     ) -> None:
-        """Update context for all tools that need routing info."""
+        """Update the per-turn context of all tools that need routing info.
+
+        Tool context lives in context variables, so it only affects the
+        asyncio task processing the current turn. Also starts a fresh store
+        for offloaded tool results.
+        """
+        self.tool_results.start_turn()
         if message_tool := self.tools.get("message"):
             if isinstance(message_tool, MessageTool):
                 message_tool.set_context(channel, chat_id, message_id, request_id)
@@ -177,28 +325,50 @@ class AgentLoop:
         self,
         initial_messages: list[dict],
         on_progress: Callable[[str], Awaitable[None]] | None = None,
+        stream: _TurnStream | None = None,
     ) -> tuple[str | None, list[str]]:
         """Run the agent iteration loop. Returns (final_content, tools_used)."""
         messages = initial_messages
         iteration = 0
         final_content = None
         tools_used: list[str] = []
+        prompt_tokens = cached_tokens = 0
 
         while iteration < self.max_iterations:
             iteration += 1
 
-            response = await self.provider.chat(
-                messages=messages,
-                tools=self.tools.get_definitions(),
-                model=self.model,
-                temperature=self.temperature,
-                max_tokens=self.max_tokens,
-            )
+            started = time.perf_counter()
+            if stream:
+                stream.begin()
+                response = await self.provider.chat_stream(
+                    messages=messages,
+                    tools=self.tools.get_definitions(),
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    on_delta=stream.feed,
+                )
+            else:
+                response = await self.provider.chat(
+                    messages=messages,
+                    tools=self.tools.get_definitions(),
+                    model=self.model,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                )
+
+            if timer := current_timer():
+                timer.add_llm_call((time.perf_counter() - started) * 1000, response.usage)
+            prompt_tokens += response.usage.get("prompt_tokens", 0)
+            cached_tokens += response.usage.get("cached_tokens", 0)
 
             if response.has_tool_calls:
+                streamed = stream is not None and stream.streamed
+                if streamed:
+                    await stream.end()
                 if on_progress:
                     clean = self._strip_think(response.content)
-                    if clean:
+                    if clean and not streamed:
                         await on_progress(clean)
                     await on_progress(self._tool_hint(response.tool_calls))
 
@@ -222,45 +392,247 @@ class AgentLoop:
                     tools_used.append(tool_call.name)
                     args_str = json.dumps(tool_call.arguments, ensure_ascii=False)
                     logger.info("Tool call: {}({})", tool_call.name, args_str[:200])
-                    result = await self.tools.execute(tool_call.name, tool_call.arguments)
+                finished: dict[int, str] = {}
+                try:
+                    results = await self.tools.execute_batch(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls],
+                        max_concurrency=self.max_parallel_tools,
+                        on_result=finished.__setitem__,
+                    )
+                except asyncio.CancelledError:
+                    self._keep_finished_calls(messages, response.tool_calls, finished)
+                    raise
+                for tool_call, result in zip(response.tool_calls, results):
                     messages = self.context.add_tool_result(
                         messages, tool_call.id, tool_call.name, result
                     )
             else:
                 final_content = self._strip_think(response.content)
+                if stream:
+                    stream.finish()
                 break
 
+        if prompt_tokens:
+            logger.info("Prompt cache: {}/{} prompt tokens cached ({:.0%}) over {} LLM calls",
+                        cached_tokens, prompt_tokens, cached_tokens / prompt_tokens, iteration)
         return final_content, tools_used
 
+    def _keep_finished_calls(self, messages: list[dict], tool_calls: list, finished: dict[int, str]) -> None:
+        """Trim the last tool-call message of a cancelled batch to the calls that finished, with their results."""
+        assistant = messages[-1]
+        done = [i for i in range(len(tool_calls)) if i in finished]
+        kept = [assistant["tool_calls"][i] for i in done]
+        if kept:
+            assistant["tool_calls"] = kept
+        elif assistant.get("content"):
+            del assistant["tool_calls"]
+        else:
+            messages.pop()
+        for i in done:
+            self.context.add_tool_result(messages, tool_calls[i].id, tool_calls[i].name, finished[i])
+
     async def run(self) -> None:
-        """Run the agent loop, processing messages from the bus."""
+        """Run the agent loop, dispatching messages from the bus to session workers."""
         self._running = True
         await self._connect_mcp()
-        logger.info("Agent loop started")
+        logger.info("Agent loop started (max {} concurrent turns)", self.max_concurrent_turns)
 
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_inbound(),
-                    timeout=1.0
-                )
+        self._run_task = asyncio.current_task()
+        try:
+            async for msg in self.bus.inbound_stream():
+                await self._dispatch(msg)
+                # Leave the backlog on the bus while every turn slot is busy
+                await self._wait_for_capacity()
+        except asyncio.CancelledError:
+            if self._running:
+                raise
+            asyncio.current_task().uncancel()  # Cancelled by stop()
+        finally:
+            self._run_task = None
+            workers = list(self._session_workers.values())
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    def _has_capacity(self) -> bool:
+        """True while fewer than max_concurrent_turns sessions run and few messages are parked."""
+        return (len(self._session_workers) < self.max_concurrent_turns
+                and self._parked < self.max_concurrent_turns)
+
+    async def _wait_for_capacity(self) -> None:
+        while not self._has_capacity():
+            self._capacity_changed.clear()
+            await self._capacity_changed.wait()
+
+    @staticmethod
+    def _dispatch_key(msg: InboundMessage) -> str:
+        """Session key used for ordering; system messages follow their origin session."""
+        if msg.channel == "system":
+            return msg.chat_id if ":" in msg.chat_id else f"cli:{msg.chat_id}"
+        return msg.session_key
+
+    async def _dispatch(self, msg: InboundMessage) -> None:
+        """Queue a message behind its session, starting a worker if the session is idle."""
+        key = self._dispatch_key(msg)
+        command = msg.content.strip().lower() if msg.channel != "system" else ""
+        if command == "/stop":
+            # Handled here rather than queued, or it would wait for the turn it should stop
+            dropped = self._drop_queued(key)
+            stopped = self.cancel_turn(key, reason="/stop")
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel, chat_id=msg.chat_id,
+                content="⏹ Stopped." if stopped or dropped else "Nothing to stop.",
+                metadata=msg.metadata or {},
+            ))
+            self.bus.ack(msg)
+            return
+        submit_id = msg.metadata.get("_submit_id")
+        if submit_id and submit_id not in self._submitted:
+            # Replayed by a durable bus after a restart: nobody waits for the answer
+            logger.warning("Dropping submitted turn for {}: its caller is gone", key)
+            self.bus.ack(msg)
+            return
+        if self.turn_policy == "supersede" and command and not command.startswith("/"):
+            self._drop_queued(key)
+            self.cancel_turn(key, reason="superseded by a newer message")
+
+        self._session_queues.setdefault(key, deque()).append(msg)
+        if key in self._session_workers:
+            self._parked += 1  # Waits for the running turn of the same session
+        else:
+            self._session_workers[key] = asyncio.create_task(self._session_worker(key))
+
+    def _drop_queued(self, key: str) -> int:
+        """Discard messages waiting behind the running turn of a session."""
+        queue = self._session_queues.get(key)
+        if not queue or key not in self._session_workers:
+            return 0
+        dropped = len(queue)
+        for msg in queue:
+            self.bus.ack(msg)
+        queue.clear()
+        self._parked -= dropped
+        self._capacity_changed.set()
+        return dropped
+
+    def cancel_turn(self, key: str, reason: str = "cancelled") -> bool:
+        """
+        Cancel the running turn of a session.
+
+        Args:
+            key: Session key (as used for dispatching).
+            reason: Logged reason.
+
+        Returns:
+            True if a running turn was cancelled.
+        """
+        active = self._active_turns.get(key)
+        if not active or active[1].done():
+            return False
+        logger.info("Cancelling turn of {} ({})", key, reason)
+        self._dismissed.add(active[1])
+        active[1].cancel()
+        return True
+
+    def cancel_request(self, request_id: str) -> bool:
+        """Cancel the turn or queued message carrying the given request_id metadata."""
+        for key, (msg, _) in list(self._active_turns.items()):
+            if msg.metadata.get("request_id") == request_id:
+                return self.cancel_turn(key, reason=f"request {request_id} abandoned")
+        for key, queue in self._session_queues.items():
+            for msg in list(queue):
+                if msg.metadata.get("request_id") == request_id:
+                    queue.remove(msg)
+                    self.bus.ack(msg)
+                    self._parked -= 1
+                    self._capacity_changed.set()
+                    return True
+        return False
+
+    async def _session_worker(self, key: str) -> None:
+        """Process queued messages of one session in order, then exit."""
+        queue = self._session_queues[key]
+        try:
+            await self._run_turn(key, queue.popleft())
+            while queue:
+                self._parked -= 1
+                self._capacity_changed.set()
+                await self._run_turn(key, queue.popleft())
+        finally:
+            self._parked -= len(queue)
+            self._session_workers.pop(key, None)
+            self._session_queues.pop(key, None)
+            self._capacity_changed.set()
+
+    async def _run_turn(self, key: str, msg: InboundMessage) -> None:
+        """Run one turn as its own task so it can be cancelled without stopping the worker."""
+        task = asyncio.create_task(self._handle_inbound(msg))
+        self._active_turns[key] = (msg, task)
+        try:
+            await asyncio.wait({task})
+        except asyncio.CancelledError:
+            task.cancel()  # The worker itself is shutting down
+            raise
+        finally:
+            self._active_turns.pop(key, None)
+
+    async def _handle_inbound(self, msg: InboundMessage) -> None:
+        """Process one bus message and publish its response."""
+        timer = self.metrics.start(
+            msg.channel, self._dispatch_key(msg), received_at=msg.timestamp, lane=lane_of(msg),
+        )
+        submit_id = msg.metadata.get("_submit_id")
+        waiter = self._submitted.get(submit_id) if submit_id else None
+        status = "ok"
+        handled = True
+        try:
+            with self.sessions.pinned(self._dispatch_key(msg)):
+                response = await self._process_message(msg)
+            if submit_id:
+                # Answered to the submit() caller, not to the channel
+                if waiter and not waiter.done():
+                    waiter.set_result(response.content if response else "")
+                return
+            with timer.phase("publish"):
+                if response is not None:
+                    await self.bus.publish_outbound(response)
+                elif msg.channel == "cli":
+                    await self.bus.publish_outbound(OutboundMessage(
+                        channel=msg.channel, chat_id=msg.chat_id, content="", metadata=msg.metadata or {},
+                    ))
+        except asyncio.CancelledError:
+            status = "cancelled"
+            # Left unacked when cancelled by a shutdown, so a durable bus replays it
+            handled = asyncio.current_task() in self._dismissed
+            if waiter and not waiter.done():
+                waiter.set_exception(RuntimeError("Turn was cancelled"))
+            if msg.metadata.get("request_id"):
+                # Let a waiting requester (e.g. the relay) know no answer is coming
                 try:
-                    response = await self._process_message(msg)
-                    if response is not None:
-                        await self.bus.publish_outbound(response)
-                    elif msg.channel == "cli":
-                        await self.bus.publish_outbound(OutboundMessage(
-                            channel=msg.channel, chat_id=msg.chat_id, content="", metadata=msg.metadata or {},
-                        ))
-                except Exception as e:
-                    logger.error("Error processing message: {}", e)
                     await self.bus.publish_outbound(OutboundMessage(
-                        channel=msg.channel,
-                        chat_id=msg.chat_id,
-                        content=f"Sorry, I encountered an error: {str(e)}"
+                        channel=msg.channel, chat_id=msg.chat_id, content="",
+                        metadata={**msg.metadata, "_cancelled": True},
                     ))
-            except asyncio.TimeoutError:
-                continue
+                except BusClosedError:
+                    pass  # Shutting down: the requester goes away with the bus
+            raise
+        except Exception as e:
+            status = "error"
+            logger.error("Error processing message: {}", e)
+            if submit_id:
+                if waiter and not waiter.done():
+                    waiter.set_exception(e)
+                return
+            await self.bus.publish_outbound(OutboundMessage(
+                channel=msg.channel,
+                chat_id=msg.chat_id,
+                content=f"Sorry, I encountered an error: {str(e)}"
+            ))
+        finally:
+            self._dismissed.discard(asyncio.current_task())
+            self.metrics.finish(timer, status)
+            if handled:
+                self.bus.ack(msg)
 
     async def close_mcp(self) -> None:
         """Close MCP connections."""
@@ -271,9 +643,17 @@ class AgentLoop:
                 pass  # MCP SDK cancel scope cleanup is noisy but harmless
             self._mcp_stack = None
 
+    async def close(self) -> None:
+        """Close MCP connections and write queued session saves and turn metrics."""
+        await self.close_mcp()
+        await asyncio.to_thread(self.sessions.close)
+        await asyncio.to_thread(self.metrics.close)
+
     def stop(self) -> None:
-        """Stop the agent loop."""
+        """Stop the agent loop; run() returns without waiting for another message."""
         self._running = False
+        if self._run_task and not self._run_task.done():
+            self._run_task.cancel()
         logger.info("Agent loop stopping")
 
     async def _process_message(
@@ -289,21 +669,23 @@ class AgentLoop:
                                 else ("cli", msg.chat_id))
             logger.info("Processing system message from {}", msg.sender_id)
             key = f"{channel}:{chat_id}"
-            session = self.sessions.get_or_create(key)
+            session = await self.sessions.get_or_create_async(key)
             self._set_tool_context(
                 channel,
                 chat_id,
                 msg.metadata.get("message_id"),
                 msg.metadata.get("request_id"),
             )
-            messages = self.context.build_messages(
-                history=session.get_history(max_messages=self.memory_window),
-                current_message=msg.content, channel=channel, chat_id=chat_id,
-            )
+            with phase("context_build"):
+                messages = self.context.build_messages(
+                    history=session.get_history(max_messages=self.memory_window, max_tokens=self.history_token_budget),
+                    current_message=msg.content, channel=channel, chat_id=chat_id,
+                )
             final_content, _ = await self._run_agent_loop(messages)
             session.add_message("user", f"[System: {msg.sender_id}] {msg.content}")
             session.add_message("assistant", final_content or "Background task completed.")
-            self.sessions.save(session)
+            with phase("session_save"):
+                self.sessions.save(session)
             return OutboundMessage(channel=channel, chat_id=chat_id,
                                   content=final_content or "Background task completed.")
 
@@ -311,7 +693,7 @@ class AgentLoop:
         logger.info("Processing message from {}:{}: {}", msg.channel, msg.sender_id, preview)
 
         key = session_key or msg.session_key
-        session = self.sessions.get_or_create(key)
+        session = await self.sessions.get_or_create_async(key)
 
         # Slash commands
         cmd = msg.content.strip().lower()
@@ -331,7 +713,7 @@ class AgentLoop:
                                   content="New session started. Memory consolidation in progress.")
         if cmd == "/help":
             return OutboundMessage(channel=msg.channel, chat_id=msg.chat_id,
-                                  content="🐈 nanobot commands:\n/new — Start a new conversation\n/help — Show available commands")
+                                  content="🐈 nanobot commands:\n/new — Start a new conversation\n/stop — Stop the current task\n/help — Show available commands")
 
         if len(session.messages) > self.memory_window and session.key not in self._consolidating:
             self._consolidating.add(session.key)
@@ -354,12 +736,13 @@ class AgentLoop:
             if isinstance(message_tool, MessageTool):
                 message_tool.start_turn()
 
-        initial_messages = self.context.build_messages(
-            history=session.get_history(max_messages=self.memory_window),
-            current_message=msg.content,
-            media=msg.media if msg.media else None,
-            channel=msg.channel, chat_id=msg.chat_id,
-        )
+        with phase("context_build"):
+            initial_messages = self.context.build_messages(
+                history=session.get_history(max_messages=self.memory_window, max_tokens=self.history_token_budget),
+                current_message=msg.content,
+                media=msg.media if msg.media else None,
+                channel=msg.channel, chat_id=msg.chat_id,
+            )
 
         async def _bus_progress(content: str) -> None:
             meta = dict(msg.metadata or {})
@@ -368,9 +751,25 @@ class AgentLoop:
                 channel=msg.channel, chat_id=msg.chat_id, content=content, metadata=meta,
             ))
 
-        final_content, tools_used = await self._run_agent_loop(
-            initial_messages, on_progress=on_progress or _bus_progress,
-        )
+        # Direct callers (CLI, cron) consume the returned text, so only bus turns stream
+        stream = None
+        if self.stream and on_progress is None and "_submit_id" not in msg.metadata:
+            stream = _TurnStream(self.bus, msg.channel, msg.chat_id, msg.metadata or {})
+
+        turn_start = len(initial_messages)
+        try:
+            final_content, tools_used = await self._run_agent_loop(
+                initial_messages, on_progress=on_progress or _bus_progress, stream=stream,
+            )
+        except asyncio.CancelledError:
+            # Keep the request and the tool work done so far so a follow-up can build on it
+            session.add_message("user", msg.content)
+            for m in initial_messages[turn_start:]:
+                extra = {k: m[k] for k in ("tool_calls", "tool_call_id", "name") if k in m}
+                session.add_message(m["role"], m.get("content"), **extra)
+            session.add_message("assistant", self._CANCELLED_REPLY)
+            self.sessions.save(session)
+            raise
 
         if final_content is None:
             final_content = "I've completed processing but have no response to give."
@@ -381,23 +780,62 @@ class AgentLoop:
         session.add_message("user", msg.content)
         session.add_message("assistant", final_content,
                             tools_used=tools_used if tools_used else None)
-        self.sessions.save(session)
+        with phase("session_save"):
+            self.sessions.save(session)
 
         if message_tool := self.tools.get("message"):
-            if isinstance(message_tool, MessageTool) and message_tool._sent_in_turn:
+            if isinstance(message_tool, MessageTool) and message_tool.sent_in_turn:
                 return None
 
+        metadata = msg.metadata or {}
+        if stream and stream.final_id:
+            metadata = {**metadata, "_stream_id": stream.final_id}
         return OutboundMessage(
             channel=msg.channel, chat_id=msg.chat_id, content=final_content,
-            metadata=msg.metadata or {},
+            metadata=metadata,
         )
 
     async def _consolidate_memory(self, session, archive_all: bool = False) -> None:
         """Delegate to MemoryStore.consolidate()."""
-        await MemoryStore(self.workspace).consolidate(
-            session, self.provider, self.model,
-            archive_all=archive_all, memory_window=self.memory_window,
-        )
+        # Pinned so last_consolidated is not lost with an evicted copy before the next save
+        with self.sessions.pinned(session.key):
+            await MemoryStore(self.workspace, writer=self.sessions.writer).consolidate(
+                session, self.provider, self.model,
+                archive_all=archive_all, memory_window=self.memory_window,
+            )
+        self.context.invalidate("memory")
+
+    async def submit(
+        self,
+        content: str,
+        session_key: str = "cli:direct",
+        channel: str = "cli",
+        chat_id: str = "direct",
+        lane: str = "background",
+    ) -> str:
+        """
+        Run a message through the bus and wait for the response.
+
+        Unlike ``process_direct``, the turn is queued in the given bus lane and
+        takes a turn slot like channel messages do, so scheduled work (cron,
+        heartbeat) cannot crowd out interactive turns. Requires ``run()``.
+
+        A submitted turn that a durable bus replays after a restart has no
+        caller left to answer and is dropped; its scheduler submits the work
+        again when it is next due.
+        """
+        submit_id = uuid.uuid4().hex
+        fut: asyncio.Future[str] = asyncio.get_running_loop().create_future()
+        self._submitted[submit_id] = fut
+        try:
+            await self.bus.publish_inbound(InboundMessage(
+                channel=channel, sender_id="user", chat_id=chat_id, content=content,
+                metadata={"_lane": lane, "_submit_id": submit_id},
+                session_key_override=session_key,
+            ))
+            return await fut
+        finally:
+            self._submitted.pop(submit_id, None)
 
     async def process_direct(
         self,
@@ -410,5 +848,15 @@ class AgentLoop:
         """Process a message directly (for CLI or cron usage)."""
         await self._connect_mcp()
         msg = InboundMessage(channel=channel, sender_id="user", chat_id=chat_id, content=content)
-        response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
+        timer = self.metrics.start(channel, session_key)
+        status = "error"
+        try:
+            with self.sessions.pinned(session_key):
+                response = await self._process_message(msg, session_key=session_key, on_progress=on_progress)
+            status = "ok"
+        except asyncio.CancelledError:
+            status = "cancelled"
+            raise
+        finally:
+            self.metrics.finish(timer, status)
         return response.content if response else ""
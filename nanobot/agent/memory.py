@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import os
+import threading
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from difflib import SequenceMatcher
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from loguru import logger
 
 from nanobot.utils.helpers import ensure_dir
+from nanobot.utils.writebehind import WriteBehind
 
 if TYPE_CHECKING:
     from nanobot.providers.base import LLMProvider
@@ -29,26 +37,173 @@ _SAVE_MEMORY_TOOL = [
                         "description": "A paragraph (2-5 sentences) summarizing key events/decisions/topics. "
                         "Start with [YYYY-MM-DD HH:MM]. Include detail useful for grep search.",
                     },
-                    "memory_update": {
-                        "type": "string",
-                        "description": "Full updated long-term memory as markdown. Include all existing "
-                        "facts plus new ones. Return unchanged if nothing new.",
+                    "memory_ops": {
+                        "type": "array",
+                        "description": "Changes to long-term memory: add new facts, update facts that changed, "
+                        "delete facts that are wrong or obsolete. Never repeat unchanged facts; "
+                        "empty if nothing changed.",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "op": {"type": "string", "enum": ["add", "update", "delete"]},
+                                "key": {
+                                    "type": "string",
+                                    "description": "Key of the fact to update or delete, e.g. m12. Omit for add.",
+                                },
+                                "section": {
+                                    "type": "string",
+                                    "description": "Section heading for add (or to move a fact on update), "
+                                    "e.g. User Information, Preferences, Important Notes.",
+                                },
+                                "text": {"type": "string", "description": "The fact, for add and update."},
+                            },
+                            "required": ["op"],
+                        },
                     },
                 },
-                "required": ["history_entry", "memory_update"],
+                "required": ["history_entry", "memory_ops"],
             },
         },
     }
 ]
 
+DEFAULT_SECTION = "Important Notes"
+_TITLE = "# Long-term Memory"
+_FENCES = ("```", "~~~")
+_SAME_FACT = 0.5  # Similarity at which a hand-edited fact keeps its key
+_apply_lock = threading.Lock()  # Consolidations of different sessions patch the same facts
+
+
+@dataclass
+class MemoryFact:
+    """One long-term memory entry; consolidation patches address it by key."""
+
+    key: str
+    section: str
+    text: str
+    updated_at: str = field(default_factory=lambda: datetime.now().isoformat(timespec="seconds"))
+    raw: bool = False  # A block kept as written (table, code, prose), rendered without a bullet
+
+
+def _sha(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _bullet(text: str) -> str:
+    return f"- {text}".replace("\n", "\n  ")
+
+
+def _is_placeholder(fact: MemoryFact) -> bool:
+    """A template line in parentheses, e.g. "(Things to remember)"."""
+    return fact.raw and "\n" not in fact.text and fact.text.startswith("(") and fact.text.endswith(")")
+
+
+def _fence_after(line: str, fence: str | None) -> str | None:
+    """The code fence open after ``line``, given the one open before it."""
+    stripped = line.strip()
+    if fence is not None:
+        return None if stripped.startswith(fence) else fence
+    return stripped[:3] if stripped.startswith(_FENCES) else None
+
+
+def _split(lines: list[str], at) -> list[list[str]]:
+    """Split lines where ``at(line)`` holds, never inside a code fence; the matching lines are passed on."""
+    parts: list[list[str]] = [[]]
+    fence = None
+    for line in lines:
+        if fence is None and at(line) and parts[-1]:
+            parts.append([])
+        parts[-1].append(line)
+        fence = _fence_after(line, fence)
+    return parts
+
+
+def _bullet_text(lines: list[str]) -> str | None:
+    """Text of a ``- `` bullet (continuation lines dedented), if rendering it gives the same lines back."""
+    if not lines[0].startswith("- ") or not all(line.startswith("  ") for line in lines[1:]):
+        return None
+    text = "\n".join([lines[0][2:], *(line[2:] for line in lines[1:])])
+    return text if text.strip() and _bullet(text) == "\n".join(lines) else None
+
+
+def _section_entries(lines: list[str]) -> list[tuple[str, bool]]:
+    """
+    (text, raw) entries of a section's lines, one per block between blank
+    lines. A block that is a list of ``- `` bullets gives one entry per
+    bullet, as long as every bullet renders back the same; otherwise the
+    block is one raw entry.
+    """
+    entries: list[tuple[str, bool]] = []
+    for block in _split(lines, lambda line: not line.strip()):
+        while block and not block[0].strip():
+            block.pop(0)
+        while block and not block[-1].strip():
+            block.pop()
+        if not block:
+            continue
+        bullets = [_bullet_text(item) for item in _split(block, lambda line: line.startswith("- "))]
+        if all(text is not None for text in bullets):
+            entries.extend((text, False) for text in bullets)
+        else:
+            entries.append(("\n".join(block), True))
+    return entries
+
+
+def parse_memory_markdown(text: str) -> tuple[str, list[tuple[str, str, bool]]]:
+    """
+    Split MEMORY.md into its preamble (everything before the first ``##``
+    section except the title) and (section, text, raw) entries, one per block.
+
+    A top-level ``- `` bullet, with its indented continuation lines and
+    nested lists, is a fact whose text drops the bullet. Any other block
+    (tables, code fences, prose, numbered lists, placeholders) is kept
+    exactly as written with ``raw`` set, and so is a list with a bullet that
+    would not render back the same, so reading and re-rendering never
+    reformats it.
+    """
+    preamble: list[str] = []
+    sections: list[tuple[str, list[str]]] = []
+    fence: str | None = None
+    titled = False
+    for line in text.splitlines():
+        if fence is None and line.startswith("## "):
+            sections.append((line[3:].strip(), []))
+            continue
+        fence = _fence_after(line, fence)
+        if sections:
+            sections[-1][1].append(line)
+        elif not titled and line.startswith("# "):
+            titled = True  # Rendered from _TITLE
+        else:
+            preamble.append(line)
+
+    entries = []
+    for section, lines in sections:
+        entries.extend((section or DEFAULT_SECTION, *entry) for entry in _section_entries(lines))
+    return "\n".join(preamble).strip("\n"), entries
+
 
 class MemoryStore:
-    """Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log)."""
+    """
+    Two-layer memory: MEMORY.md (long-term facts) + HISTORY.md (grep-searchable log).
 
-    def __init__(self, workspace: Path):
+    Long-term facts are kept as keyed entries in ``facts.json`` and MEMORY.md
+    is rendered from them. Consolidation asks the LLM only for add/update/
+    delete operations on those keys, so its output does not grow with the
+    memory. MEMORY.md can still be edited by hand or by the agent: when it no
+    longer matches what was last rendered, the facts are re-read from it
+    before the next patch. Unchanged entries keep their keys, and so do
+    edited ones (matched by similarity within their section), so an
+    operation on a key the LLM saw before the edit still hits its fact.
+    Blocks that are not plain bullets are kept verbatim as ``raw`` facts.
+    """
+
+    def __init__(self, workspace: Path, writer: WriteBehind | None = None):
         self.memory_dir = ensure_dir(workspace / "memory")
         self.memory_file = self.memory_dir / "MEMORY.md"
         self.history_file = self.memory_dir / "HISTORY.md"
+        self.facts_file = self.memory_dir / "facts.json"
+        self.writer = writer  # Consolidation writes go through it instead of blocking the event loop
 
     def read_long_term(self) -> str:
         if self.memory_file.exists():
@@ -62,6 +217,161 @@ class MemoryStore:
         with open(self.history_file, "a", encoding="utf-8") as f:
             f.write(entry.rstrip() + "\n\n")
 
+    def load_facts(self) -> tuple[list[MemoryFact], dict[str, Any]]:
+        """
+        Current facts and the store state (preamble, next key, rendered hash),
+        re-read from MEMORY.md if it was edited since it was last rendered.
+        """
+        state: dict[str, Any] = {"preamble": "", "next_id": 1, "rendered": None, "facts": []}
+        if self.facts_file.exists():
+            state.update(json.loads(self.facts_file.read_text(encoding="utf-8")))
+        facts = [MemoryFact(**f) for f in state.pop("facts")]
+        markdown = self.read_long_term()
+        if _sha(markdown) != state["rendered"]:
+            facts = self._import_markdown(markdown, facts, state)
+        return facts, state
+
+    def _import_markdown(
+        self, markdown: str, facts: list[MemoryFact], state: dict[str, Any],
+    ) -> list[MemoryFact]:
+        preamble, parsed = parse_memory_markdown(markdown)
+        known: dict[tuple[str, str], list[MemoryFact]] = {}
+        for fact in facts:
+            known.setdefault((fact.section, fact.text), []).append(fact)
+        imported: list[MemoryFact | None] = []
+        for section, text, raw in parsed:
+            same = known.get((section, text))
+            fact = same.pop(0) if same else None
+            if fact is not None:
+                fact.raw = raw
+            imported.append(fact)
+
+        # An edited entry keeps the key of the most similar fact left in its section
+        left = [f for same in known.values() for f in same]
+        for i, (section, text, raw) in enumerate(parsed):
+            if imported[i] is not None:
+                continue
+            scored = [(SequenceMatcher(None, f.text, text).ratio(), f) for f in left if f.section == section]
+            score, fact = max(scored, key=lambda s: s[0], default=(0.0, None))
+            if fact is not None and score >= _SAME_FACT:
+                left.remove(fact)
+                fact.text, fact.raw = text, raw
+                fact.updated_at = datetime.now().isoformat(timespec="seconds")
+            else:
+                fact = MemoryFact(key=f"m{state['next_id']}", section=section, text=text, raw=raw)
+                state["next_id"] += 1
+            imported[i] = fact
+        state["preamble"] = preamble
+        logger.debug("Memory: read {} facts from edited MEMORY.md", len(imported))
+        return imported
+
+    def apply_ops(self, ops: list[dict[str, Any]]) -> int:
+        """Apply add/update/delete operations to the facts and re-render MEMORY.md; returns the changes made."""
+        with _apply_lock:
+            facts, state = self.load_facts()
+            by_key = {f.key: f for f in facts}
+            changed = 0
+            for op in ops:
+                kind, key = op.get("op"), op.get("key")
+                text = str(op.get("text") or "").strip()
+                section = str(op.get("section") or "").strip()
+                fact = by_key.get(key) if key else None
+                if kind == "delete":
+                    if fact is not None:
+                        facts.remove(by_key.pop(key))
+                        changed += 1
+                    continue
+                if kind == "update" and fact is not None:
+                    if (text and text != fact.text) or (section and section != fact.section):
+                        fact.text = text or fact.text
+                        fact.section = section or fact.section
+                        fact.updated_at = datetime.now().isoformat(timespec="seconds")
+                        changed += 1
+                    continue
+                if kind not in ("add", "update") or not text:
+                    logger.warning("Memory: ignoring invalid operation {}", op)
+                    continue
+                # An add, or an update of an unknown key (kept as a new fact rather than lost)
+                section = section or (fact.section if fact else DEFAULT_SECTION)
+                if any(f.text == text and f.section == section for f in facts):
+                    continue
+                fact = MemoryFact(key=f"m{state['next_id']}", section=section, text=text)
+                state["next_id"] += 1
+                self._insert(facts, fact)
+                by_key[fact.key] = fact
+                changed += 1
+            if changed or state["rendered"] != _sha(self.read_long_term()):
+                self._save(facts, state)
+            return changed
+
+    @staticmethod
+    def _insert(facts: list[MemoryFact], fact: MemoryFact) -> None:
+        """
+        Add a fact after the last bullet of its section, else in place of
+        the section's template placeholder (so it lands before a footer),
+        else at the end of the section. A new section goes at the end.
+        """
+        placeholders = [i for i, f in enumerate(facts) if f.section == fact.section and _is_placeholder(f)]
+        for i in reversed(placeholders):
+            del facts[i]
+        in_section = [i for i, f in enumerate(facts) if f.section == fact.section]
+        bullets = [i for i in in_section if not facts[i].raw]
+        if bullets:
+            facts.insert(bullets[-1] + 1, fact)
+        elif placeholders:
+            facts.insert(placeholders[0], fact)
+        elif in_section:
+            facts.insert(in_section[-1] + 1, fact)
+        else:
+            facts.append(fact)
+
+    def _save(self, facts: list[MemoryFact], state: dict[str, Any]) -> None:
+        markdown = self.render(facts, state["preamble"])
+        state = {**state, "rendered": _sha(markdown), "facts": [asdict(f) for f in facts]}
+        tmp = self.facts_file.with_name(self.facts_file.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.facts_file)
+        self.write_long_term(markdown)
+
+    @staticmethod
+    def render(facts: list[MemoryFact], preamble: str = "", keys: bool = False) -> str:
+        """
+        MEMORY.md for a list of facts, grouped by section in first-seen order
+        (with keys for the LLM). Consecutive bullets form one list; raw facts
+        are written as-is, as blocks of their own.
+        """
+        sections: dict[str, list[MemoryFact]] = {}
+        for fact in facts:
+            sections.setdefault(fact.section, []).append(fact)
+        parts = [_TITLE]
+        if preamble:
+            parts.append(preamble)
+        for section, entries in sections.items():
+            blocks: list[str] = []
+            bullets: list[str] = []
+            for fact in entries:
+                label = f"[{fact.key}]" if keys else ""
+                if not fact.raw:
+                    bullets.append(_bullet(f"{label} {fact.text}" if label else fact.text))
+                    continue
+                if bullets:
+                    blocks.append("\n".join(bullets))
+                    bullets = []
+                blocks.append(f"{label}\n{fact.text}" if label else fact.text)
+            if bullets:
+                blocks.append("\n".join(bullets))
+            parts.append("\n\n".join([f"## {section}", *blocks]))
+        return "\n\n".join(parts) + "\n"
+
+    async def _write(self, key: str | None, fn) -> Any:
+        """Run a file write off the event loop and wait until it has landed."""
+        if self.writer:
+            return await asyncio.wrap_future(self.writer.submit(key and ("memory", key), fn))
+        return await asyncio.to_thread(fn)
+
     def get_memory_context(self) -> str:
         long_term = self.read_long_term()
         return f"## Long-term Memory\n{long_term}" if long_term else ""
@@ -98,10 +408,11 @@ class MemoryStore:
             tools = f" [tools: {', '.join(m['tools_used'])}]" if m.get("tools_used") else ""
             lines.append(f"[{m.get('timestamp', '?')[:16]}] {m['role'].upper()}{tools}: {m['content']}")
 
-        current_memory = self.read_long_term()
+        facts, _ = await asyncio.to_thread(self.load_facts)
+        current_memory = self.render(facts, keys=True) if facts else ""
         prompt = f"""Process this conversation and call the save_memory tool with your consolidation.
 
-## Current Long-term Memory
+## Current Long-term Memory (fact keys in brackets)
 {current_memory or "(empty)"}
 
 ## Conversation to Process
@@ -125,12 +436,17 @@ class MemoryStore:
             if entry := args.get("history_entry"):
                 if not isinstance(entry, str):
                     entry = json.dumps(entry, ensure_ascii=False)
-                self.append_history(entry)
-            if update := args.get("memory_update"):
-                if not isinstance(update, str):
-                    update = json.dumps(update, ensure_ascii=False)
-                if update != current_memory:
-                    self.write_long_term(update)
+                await self._write(None, lambda: self.append_history(entry))
+            ops = args.get("memory_ops") or []
+            if isinstance(ops, str):
+                ops = json.loads(ops)
+            if isinstance(ops, dict):
+                ops = [ops]
+            ops = [op for op in ops if isinstance(op, dict)]
+            if ops:
+                # Unkeyed: each patch is applied in order, never replaced by a later one
+                changed = await self._write(None, lambda: self.apply_ops(ops))
+                logger.info("Memory consolidation: {} of {} memory operations applied", changed, len(ops))
 
             session.last_consolidated = 0 if archive_all else len(session.messages) - keep_count
             logger.info("Memory consolidation done: {} messages, last_consolidated={}", len(session.messages), session.last_consolidated)
@@ -56,6 +56,27 @@ class SkillsLoader:
             return [s for s in skills if self._check_requirements(self._get_skill_meta(s["name"]))]
         return skills
     
+    def source_paths(self) -> list[Path]:
+        """
+        List the paths whose changes can alter the skill listing or content.
+
+        Includes the skill roots, every skill directory and its SKILL.md (even
+        if missing), so a stat of each path detects added, removed or edited skills.
+
+        Returns:
+            Paths to fingerprint for cache invalidation.
+        """
+        paths: list[Path] = []
+        for root in (self.workspace_skills, self.builtin_skills):
+            if not root:
+                continue
+            paths.append(root)
+            if root.is_dir():
+                for skill_dir in sorted(root.iterdir()):
+                    if skill_dir.is_dir():
+                        paths.extend((skill_dir, skill_dir / "SKILL.md"))
+        return paths
+
     def load_skill(self, name: str) -> str | None:
         """
         Load a skill by name.
@@ -0,0 +1,207 @@
+"""Per-turn latency instrumentation."""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator
+
+from loguru import logger
+
+from nanobot.utils.histogram import LatencyHistogram
+from nanobot.utils.writebehind import WriteBehind
+
+# Phases in pipeline order; "llm" is the sum of its calls, "tool" the wall time of tool batches
+PHASES = ("queue_wait", "context_build", "llm", "tool", "session_save", "publish")
+
+_current: ContextVar["TurnTimer | None"] = ContextVar("turn_timer", default=None)
+
+
+@dataclass
+class TurnTimer:
+    """Timing record of one agent turn."""
+
+    channel: str
+    session_key: str
+    lane: str | None = None
+    queue_wait_ms: float = 0.0
+    started: float = field(default_factory=time.perf_counter)
+    phases: dict[str, float] = field(default_factory=dict)
+    llm_calls: list[dict[str, Any]] = field(default_factory=list)
+    tools: list[dict[str, Any]] = field(default_factory=list)
+    finished: bool = False
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Add the duration of the block to a phase."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - start) * 1000)
+
+    def add(self, name: str, ms: float) -> None:
+        if not self.finished:
+            self.phases[name] = self.phases.get(name, 0.0) + ms
+
+    def add_llm_call(self, ms: float, usage: dict[str, int]) -> None:
+        """Record one provider call with its token usage."""
+        if self.finished:
+            return
+        self.add("llm", ms)
+        self.llm_calls.append({"ms": round(ms, 2), **usage})
+
+    def add_tool(self, name: str, ms: float) -> None:
+        """Record one tool execution (the "tool" phase is timed per batch, as calls may overlap)."""
+        if self.finished:
+            return
+        self.tools.append({"name": name, "ms": round(ms, 2)})
+
+    def to_record(self, status: str) -> dict[str, Any]:
+        total = (time.perf_counter() - self.started) * 1000 + self.queue_wait_ms
+        phases = {"queue_wait": self.queue_wait_ms, **self.phases}
+        return {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "channel": self.channel,
+            "session": self.session_key,
+            "lane": self.lane,
+            "status": status,
+            "total_ms": round(total, 2),
+            "phases": {k: round(v, 2) for k, v in phases.items()},
+            "llm_calls": self.llm_calls,
+            "tools": self.tools,
+        }
+
+
+def current_timer() -> TurnTimer | None:
+    """Timer of the turn running in the current task, if any."""
+    timer = _current.get()
+    return timer if timer is not None and not timer.finished else None
+
+
+def detach() -> None:
+    """Stop attributing work of the current task to the turn that spawned it."""
+    _current.set(None)
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """Time a block into the current turn's phase; a no-op outside a timed turn."""
+    timer = current_timer()
+    if timer is None:
+        yield
+        return
+    with timer.phase(name):
+        yield
+
+
+class TurnMetrics:
+    """
+    Collects turn timers, appends them as JSONL records and keeps histograms.
+
+    Records are written on a background thread, batched about once a second.
+    Once the file reaches ``max_bytes`` it is rotated to ``<name>.1``,
+    replacing the previous rotation.
+
+    Histograms are keyed by ("phase", name), ("channel", name), ("lane", name)
+    and ("tool", name); channel histograms track end-to-end turn latency,
+    lane histograms the queue wait of bus turns.
+    """
+
+    def __init__(self, path: Path | None = None, max_bytes: int = 10 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.histograms: dict[tuple[str, str], LatencyHistogram] = {}
+        self._pending: list[str] = []  # Records not yet written
+        self._lock = threading.Lock()
+        self._writer: WriteBehind | None = None
+
+    def start(
+        self,
+        channel: str,
+        session_key: str,
+        received_at: datetime | None = None,
+        lane: str | None = None,
+    ) -> TurnTimer:
+        """Start timing a turn in the current task."""
+        wait = 0.0
+        if received_at is not None:
+            wait = max(0.0, (datetime.now() - received_at).total_seconds() * 1000)
+        timer = TurnTimer(channel=channel, session_key=session_key, lane=lane, queue_wait_ms=wait)
+        _current.set(timer)
+        return timer
+
+    def finish(self, timer: TurnTimer, status: str = "ok") -> dict[str, Any]:
+        """Close a turn, record it and return its record."""
+        record = timer.to_record(status)
+        timer.finished = True
+        if _current.get() is timer:
+            _current.set(None)
+        self.observe(record)
+        if self.path:
+            with self._lock:
+                self._pending.append(json.dumps(record, ensure_ascii=False) + "\n")
+            if self._writer is None:
+                self._writer = WriteBehind(window_ms=1000, name="metrics-writer")
+            self._writer.submit("turns", self._write_pending)
+        return record
+
+    def _write_pending(self) -> None:
+        with self._lock:
+            lines, self._pending = self._pending, []
+        if not lines:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.max_bytes and self.path.exists() and self.path.stat().st_size >= self.max_bytes:
+                os.replace(self.path, self.rotated_path(self.path))
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(lines)
+        except OSError as e:
+            logger.warning("Failed to write turn metrics: {}", e)
+
+    def close(self) -> None:
+        """Write the records still queued and stop the writer thread."""
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+
+    @staticmethod
+    def rotated_path(path: Path) -> Path:
+        return path.with_name(path.name + ".1")
+
+    def observe(self, record: dict[str, Any]) -> None:
+        """Add one turn record to the histograms."""
+        for name, ms in record.get("phases", {}).items():
+            self._hist("phase", name).add(ms)
+        self._hist("channel", record.get("channel", "?")).add(record.get("total_ms", 0.0))
+        if record.get("lane"):
+            self._hist("lane", record["lane"]).add(record.get("phases", {}).get("queue_wait", 0.0))
+        for call in record.get("tools", []):
+            self._hist("tool", call["name"]).add(call["ms"])
+
+    def _hist(self, kind: str, name: str) -> LatencyHistogram:
+        return self.histograms.setdefault((kind, name), LatencyHistogram())
+
+    @classmethod
+    def load(cls, path: Path, since: datetime | None = None) -> "TurnMetrics":
+        """Aggregate the records of a JSONL file and its rotation, optionally only those after ``since``."""
+        metrics = cls()
+        for file in (cls.rotated_path(path), path):
+            if not file.exists():
+                continue
+            with open(file, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if since and datetime.fromisoformat(record.get("ts", "1970-01-01")) < since:
+                        continue
+                    metrics.observe(record)
+        return metrics
@@ -39,6 +39,15 @@ class Tool(ABC):
         """JSON Schema for tool parameters."""
         pass
     
+    @property
+    def concurrency_safe(self) -> bool:
+        """
+        Whether calls to this tool may run concurrently with other safe calls.
+
+        Only read-only tools without side effects should return True.
+        """
+        return False
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> str:
         """
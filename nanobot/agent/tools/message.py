@@ -1,11 +1,24 @@
 """Message tool for sending messages to users."""
 
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
 from typing import Any, Awaitable, Callable
 
 from nanobot.agent.tools.base import Tool
 from nanobot.bus.events import OutboundMessage
 
 
+@dataclass
+class _MessageContext:
+    """Routing info and send tracking for the turn currently being processed."""
+
+    channel: str = ""
+    chat_id: str = ""
+    message_id: str | None = None
+    request_id: str | None = None
+    sent: bool = False
+
+
 class MessageTool(Tool):
     """Tool to send messages to users on chat channels."""
 
@@ -18,11 +31,20 @@ class MessageTool(Tool):
         default_request_id: str | None = None,
     ):
         self._send_callback = send_callback
-        self._default_channel = default_channel
-        self._default_chat_id = default_chat_id
-        self._default_message_id = default_message_id
-        self._default_request_id = default_request_id
-        self._sent_in_turn: bool = False
+        self._defaults = _MessageContext(
+            default_channel, default_chat_id, default_message_id, default_request_id,
+        )
+        # Context is per asyncio task, so concurrent turns never see each other's routing.
+        self._context: ContextVar[_MessageContext | None] = ContextVar(
+            f"message_tool_context_{id(self)}", default=None,
+        )
+
+    def _current(self) -> _MessageContext:
+        ctx = self._context.get()
+        if ctx is None:
+            ctx = replace(self._defaults)
+            self._context.set(ctx)
+        return ctx
 
     def set_context(
         self,
@@ -31,11 +53,8 @@ class MessageTool(Tool):
         message_id: str | None = None,
         request_id: str | None = None,
     ) -> None:
-        """Set the current message context."""
-        self._default_channel = channel
-        self._default_chat_id = chat_id
-        self._default_message_id = message_id
-        self._default_request_id = request_id
+        """Set the message context for the current turn."""
+        self._context.set(_MessageContext(channel, chat_id, message_id, request_id))
 
     def set_send_callback(self, callback: Callable[[OutboundMessage], Awaitable[None]]) -> None:
         """Set the callback for sending messages."""
@@ -43,7 +62,13 @@ class MessageTool(Tool):
 
     def start_turn(self) -> None:
         """Reset per-turn send tracking."""
-        self._sent_in_turn = False
+        self._context.set(replace(self._context.get() or self._defaults, sent=False))
+
+    @property
+    def sent_in_turn(self) -> bool:
+        """Whether the message tool already delivered something during the current turn."""
+        ctx = self._context.get()
+        return ctx.sent if ctx else False
 
     @property
     def name(self) -> str:
@@ -89,10 +114,11 @@ class MessageTool(Tool):
         media: list[str] | None = None,
         **kwargs: Any
     ) -> str:
-        channel = channel or self._default_channel
-        chat_id = chat_id or self._default_chat_id
-        message_id = message_id or self._default_message_id
-        request_id = request_id or self._default_request_id
+        ctx = self._current()
+        channel = channel or ctx.channel
+        chat_id = chat_id or ctx.chat_id
+        message_id = message_id or ctx.message_id
+        request_id = request_id or ctx.request_id
 
         if not channel or not chat_id:
             return "Error: No target channel/chat specified"
@@ -113,7 +139,7 @@ class MessageTool(Tool):
 
         try:
             await self._send_callback(msg)
-            self._sent_in_turn = True
+            ctx.sent = True
             media_info = f" with {len(media)} attachments" if media else ""
             return f"Message sent to {channel}:{chat_id}{media_info}"
         except Exception as e:
@@ -0,0 +1,152 @@
+"""Offloading of large tool results with on-demand retrieval."""
+
+from contextvars import ContextVar
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+
+
+class ToolResultStore:
+    """
+    Per-turn store for tool results too large to keep inline.
+
+    Oversized results are replaced in the conversation by a head/tail preview
+    and a handle; the full text stays here until the next turn starts and can
+    be paged or searched with the ``read_tool_result`` tool. Blobs live in a
+    context variable, so concurrent turns never see each other's results.
+    """
+
+    def __init__(self, threshold: int = 8000, preview_chars: int = 2000):
+        if threshold > 0 and not 0 <= preview_chars < threshold:
+            # A preview as long as the result would store it without shortening the conversation
+            raise ValueError(f"preview_chars ({preview_chars}) must be below threshold ({threshold})")
+        self.threshold = threshold
+        self.preview_chars = preview_chars
+        self._blobs: ContextVar[dict[str, str] | None] = ContextVar(
+            f"tool_results_{id(self)}", default=None,
+        )
+
+    def start_turn(self) -> None:
+        """Begin a new turn with an empty store."""
+        self._blobs.set({})
+
+    def get(self, handle: str) -> str | None:
+        """Get a stored result of the current turn."""
+        blobs = self._blobs.get()
+        return blobs.get(handle) if blobs is not None else None
+
+    def offload(self, tool_name: str, result: str) -> str:
+        """
+        Store an oversized result and return its preview, or the result unchanged.
+
+        Args:
+            tool_name: Name of the tool that produced the result.
+            result: Full tool result.
+
+        Returns:
+            Text to place in the conversation.
+        """
+        blobs = self._blobs.get()
+        if blobs is None or self.threshold <= 0 or len(result) <= self.threshold:
+            return result
+
+        handle = f"{tool_name}-{len(blobs) + 1}"
+        blobs[handle] = result
+        half = self.preview_chars // 2
+        omitted = len(result) - 2 * half
+        return (
+            f"[Result of {tool_name} is {len(result)} chars ({result.count(chr(10)) + 1} lines) "
+            f"and was stored as '{handle}'. Only the head and tail are shown; use read_tool_result "
+            f"with this handle to read more by offset or to search it.]\n"
+            f"{result[:half]}\n"
+            f"... ({omitted} chars omitted) ...\n"
+            f"{result[-half:]}"
+        )
+
+
+class ReadToolResultTool(Tool):
+    """Tool to page through or search a stored tool result."""
+
+    MAX_LIMIT = 4000
+    MAX_MATCHES = 20
+
+    def __init__(self, store: ToolResultStore):
+        self._store = store
+
+    @property
+    def name(self) -> str:
+        return "read_tool_result"
+
+    @property
+    def description(self) -> str:
+        return (
+            "Read a large tool result that was stored instead of shown in full. "
+            "Give an offset/limit (in characters) to page through it, or a search "
+            "string to list matching lines with their offsets."
+        )
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {
+            "type": "object",
+            "properties": {
+                "handle": {
+                    "type": "string",
+                    "description": "Handle from the stored result notice"
+                },
+                "offset": {
+                    "type": "integer",
+                    "description": "Character offset to start reading from",
+                    "minimum": 0
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": f"Number of characters to read (max {self.MAX_LIMIT})",
+                    "minimum": 1
+                },
+                "search": {
+                    "type": "string",
+                    "description": "Case-insensitive text to search for instead of paging"
+                }
+            },
+            "required": ["handle"]
+        }
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return True
+
+    async def execute(
+        self,
+        handle: str,
+        offset: int = 0,
+        limit: int = MAX_LIMIT,
+        search: str | None = None,
+        **kwargs: Any,
+    ) -> str:
+        text = self._store.get(handle)
+        if text is None:
+            return f"Error: No stored result '{handle}' in this turn"
+
+        if search:
+            return self._search(text, search)
+
+        limit = min(limit, self.MAX_LIMIT)
+        chunk = text[offset:offset + limit]
+        end = offset + len(chunk)
+        more = f"; continue with offset={end}" if end < len(text) else ""
+        return f"[{handle}: chars {offset}-{end} of {len(text)}{more}]\n{chunk}"
+
+    def _search(self, text: str, query: str) -> str:
+        needle = query.lower()
+        matches = []
+        pos = 0
+        for line in text.splitlines(keepends=True):
+            if needle in line.lower():
+                matches.append(f"offset {pos}: {line.rstrip()[:300]}")
+                if len(matches) >= self.MAX_MATCHES:
+                    break
+            pos += len(line)
+        if not matches:
+            return f"No lines matching '{query}'"
+        return "\n".join(matches)
@@ -1,19 +1,27 @@
 """Tool registry for dynamic tool management."""
 
-from typing import Any
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, Callable
 
+from nanobot.agent.timing import current_timer, phase
 from nanobot.agent.tools.base import Tool
 
+if TYPE_CHECKING:
+    from nanobot.agent.tools.offload import ToolResultStore
+
 
 class ToolRegistry:
     """
     Registry for agent tools.
     
-    Allows dynamic registration and execution of tools.
+    Allows dynamic registration and execution of tools. With a result store,
+    oversized results are offloaded and replaced by a preview.
     """
     
-    def __init__(self):
+    def __init__(self, result_store: "ToolResultStore | None" = None):
         self._tools: dict[str, Tool] = {}
+        self.result_store = result_store
     
     def register(self, tool: Tool) -> None:
         """Register a tool."""
@@ -57,10 +65,68 @@ class ToolRegistry:
             errors = tool.validate_params(params)
             if errors:
                 return f"Error: Invalid parameters for tool '{name}': " + "; ".join(errors)
-            return await tool.execute(**params)
+            started = time.perf_counter()
+            try:
+                result = await tool.execute(**params)
+            finally:
+                if timer := current_timer():
+                    timer.add_tool(name, (time.perf_counter() - started) * 1000)
+            if self.result_store and name != "read_tool_result":
+                result = self.result_store.offload(name, result)
+            return result
         except Exception as e:
             return f"Error executing {name}: {str(e)}"
     
+    def is_concurrency_safe(self, name: str) -> bool:
+        """Check if a tool can run concurrently with other safe calls."""
+        tool = self._tools.get(name)
+        return bool(tool and tool.concurrency_safe)
+
+    async def execute_batch(
+        self,
+        calls: list[tuple[str, dict[str, Any]]],
+        max_concurrency: int = 4,
+        on_result: Callable[[int, str], None] | None = None,
+    ) -> list[str]:
+        """
+        Execute several tool calls, running adjacent concurrency-safe calls together.
+
+        Side-effecting calls act as barriers: they run alone, after every call
+        before them has finished, so the observable order is preserved.
+
+        Args:
+            calls: (name, params) pairs in the order the model emitted them.
+            max_concurrency: Maximum number of calls in flight at once.
+            on_result: Called with (index, result) as each call finishes, so a
+                caller that is cancelled mid-batch knows which calls completed.
+
+        Returns:
+            Results in the same order as ``calls``.
+        """
+        results: list[str] = [""] * len(calls)
+        limit = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _run(index: int) -> None:
+            name, params = calls[index]
+            async with limit:
+                results[index] = await self.execute(name, params)
+            if on_result:
+                on_result(index, results[index])
+
+        i = 0
+        with phase("tool"):
+            while i < len(calls):
+                if not self.is_concurrency_safe(calls[i][0]):
+                    await _run(i)
+                    i += 1
+                    continue
+                j = i
+                while j < len(calls) and self.is_concurrency_safe(calls[j][0]):
+                    j += 1
+                await asyncio.gather(*(_run(k) for k in range(i, j)))
+                i = j
+        return results
+
     @property
     def tool_names(self) -> list[str]:
         """Get list of registered tool names."""
@@ -48,6 +48,7 @@ class WebSearchTool(Tool):
     
     name = "web_search"
     description = "Search the web. Returns titles, URLs, and snippets."
+    concurrency_safe = True
     parameters = {
         "type": "object",
         "properties": {
@@ -95,6 +96,7 @@ class WebFetchTool(Tool):
     
     name = "web_fetch"
     description = "Fetch URL and extract readable content (HTML → markdown/text)."
+    concurrency_safe = True
     parameters = {
         "type": "object",
         "properties": {
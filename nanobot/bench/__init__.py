@@ -0,0 +1,11 @@
+"""Benchmarks that run the agent against a scripted provider."""
+
+from nanobot.bench.agent import (
+    BenchResult,
+    LoadChannel,
+    baseline_mismatch,
+    compare_to_baseline,
+    run_agent_bench,
+)
+
+__all__ = ["BenchResult", "LoadChannel", "baseline_mismatch", "compare_to_baseline", "run_agent_bench"]
@@ -0,0 +1,262 @@
+"""Agent loop benchmark driven by a scripted provider and a synthetic channel."""
+
+import asyncio
+import hashlib
+import json
+import os
+import platform
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.providers.scripted_provider import ScriptedProvider
+from nanobot.utils.histogram import LatencyHistogram
+
+
+class LoadChannel(BaseChannel):
+    """
+    Synthetic channel that runs N concurrent chats through the message bus.
+
+    Every chat sends its next message as soon as the reply to the previous
+    one arrives (closed loop), so throughput reflects how well the agent
+    overlaps turns of different sessions.
+    """
+
+    name = "bench"
+
+    def __init__(self, bus: MessageBus, chats: int, messages_per_chat: int):
+        super().__init__(None, bus)
+        self.chats = chats
+        self.messages_per_chat = messages_per_chat
+        self.latency = LatencyHistogram()
+        self._replies: dict[str, asyncio.Future[OutboundMessage]] = {}
+
+    async def start(self) -> None:
+        """Run all chats to completion."""
+        self._running = True
+        await asyncio.gather(*(self._chat(str(i)) for i in range(self.chats)))
+        self._running = False
+
+    async def stop(self) -> None:
+        self._running = False
+
+    async def _chat(self, chat_id: str) -> None:
+        for n in range(self.messages_per_chat):
+            reply = asyncio.get_running_loop().create_future()
+            self._replies[chat_id] = reply
+            started = time.perf_counter()
+            await self._handle_message(sender_id="bench", chat_id=chat_id, content=f"message {n}")
+            await reply
+            self.latency.add((time.perf_counter() - started) * 1000)
+
+    async def send(self, msg: OutboundMessage) -> None:
+        if msg.metadata.get("_progress") or msg.metadata.get("_stream"):
+            return
+        reply = self._replies.pop(msg.chat_id, None)
+        if reply and not reply.done():
+            reply.set_result(msg)
+
+
+@dataclass
+class BenchResult:
+    """Summary of one agent benchmark run."""
+
+    params: dict[str, Any]
+    messages: int
+    duration_s: float
+    messages_per_sec: float
+    latency_ms: dict[str, float]
+    loop_lag_ms: dict[str, float]
+    peak_rss_mb: float | None
+    phases_p50_ms: dict[str, float] = field(default_factory=dict)
+    host: dict[str, Any] = field(default_factory=dict)  # See host_info()
+    calibration_ms: float = 0.0  # See calibrate()
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _summary(hist: LatencyHistogram) -> dict[str, float]:
+    return {
+        "p50": round(hist.percentile(50), 2),
+        "p95": round(hist.percentile(95), 2),
+        "p99": round(hist.percentile(99), 2),
+        "max": round(hist.max, 2),
+    }
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    import sys
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def host_info() -> dict[str, Any]:
+    """What a run's numbers depend on; baselines from another host are not compared."""
+    return {
+        "system": platform.system(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def calibrate(rounds: int = 3) -> float:
+    """
+    Time a fixed CPU-bound workload (JSON and hashing, as in a turn), best of
+    ``rounds``, in ms. Comparing it with the baseline's tells how much slower
+    the host currently is (other load, power saving) than when it was recorded.
+    """
+    payload = [{"role": "user", "content": "x" * 200, "n": i} for i in range(200)]
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(50):
+            hashlib.sha256(json.dumps(json.loads(json.dumps(payload))).encode()).digest()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return round(best, 2)
+
+
+async def _watch_loop_lag(hist: LatencyHistogram, interval: float = 0.01) -> None:
+    """Measure how late the event loop wakes a sleeping task."""
+    while True:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        hist.add(max(0.0, (time.perf_counter() - started - interval) * 1000))
+
+
+async def run_agent_bench(
+    chats: int = 50,
+    messages_per_chat: int = 5,
+    latency_ms: float = 50.0,
+    jitter_ms: float = 0.0,
+    max_concurrent_turns: int = 16,
+    script_path: Path | None = None,
+    seed: int = 0,
+) -> BenchResult:
+    """
+    Push ``chats`` concurrent conversations through a fresh AgentLoop.
+
+    Args:
+        chats: Number of concurrent chats (sessions).
+        messages_per_chat: Messages each chat sends, one after the other.
+        latency_ms: Simulated latency of every LLM call.
+        jitter_ms: Extra random latency (uniform, seeded) per LLM call.
+        max_concurrent_turns: Passed to AgentLoop.
+        script_path: Optional JSONL/YAML trace file for the scripted provider.
+        seed: Seed for the latency jitter.
+
+    Returns:
+        The benchmark summary.
+    """
+    options = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "seed": seed}
+    provider = (ScriptedProvider.from_file(script_path, **options) if script_path
+                else ScriptedProvider(**options))
+    params = {
+        "chats": chats,
+        "messages_per_chat": messages_per_chat,
+        "latency_ms": latency_ms,
+        "jitter_ms": jitter_ms,
+        "max_concurrent_turns": max_concurrent_turns,
+        "script": str(script_path) if script_path else "default",
+    }
+
+    calibration = calibrate()
+    with tempfile.TemporaryDirectory(prefix="nanobot-bench-") as tmp:
+        bus = MessageBus()
+        agent = AgentLoop(
+            bus=bus,
+            provider=provider,
+            workspace=Path(tmp),
+            memory_window=10_000,  # Keep memory consolidation out of the measurement
+            max_concurrent_turns=max_concurrent_turns,
+        )
+        channel = LoadChannel(bus, chats, messages_per_chat)
+
+        async def _deliver() -> None:
+            async for msg in bus.outbound_stream():
+                await channel.send(msg)
+
+        lag = LatencyHistogram()
+        background = [
+            asyncio.create_task(agent.run()),
+            asyncio.create_task(_deliver()),
+            asyncio.create_task(_watch_loop_lag(lag)),
+        ]
+        started = time.perf_counter()
+        try:
+            await channel.start()
+        finally:
+            duration = time.perf_counter() - started
+            agent.stop()
+            for task in background:
+                task.cancel()
+            await asyncio.gather(*background, return_exceptions=True)
+
+    messages = chats * messages_per_chat
+    return BenchResult(
+        params=params,
+        messages=messages,
+        duration_s=round(duration, 3),
+        messages_per_sec=round(messages / duration, 2) if duration else 0.0,
+        latency_ms=_summary(channel.latency),
+        loop_lag_ms=_summary(lag),
+        peak_rss_mb=_peak_rss_mb(),
+        phases_p50_ms={
+            name: round(h.percentile(50), 2)
+            for (kind, name), h in agent.metrics.histograms.items() if kind == "phase"
+        },
+        host=host_info(),
+        calibration_ms=calibration,
+    )
+
+
+def baseline_mismatch(result: BenchResult, baseline: dict[str, Any]) -> str | None:
+    """Why a baseline cannot be compared with a run (None if it can)."""
+    if baseline.get("params") != result.params:
+        return "it was recorded with different parameters"
+    if baseline.get("host") != result.host:
+        return "it was recorded on a different host or Python version"
+    return None
+
+
+def compare_to_baseline(result: BenchResult, baseline: dict[str, Any], tolerance: float = 0.25) -> list[str]:
+    """
+    Compare a run against a baseline recorded on the same host (see
+    ``baseline_mismatch``).
+
+    Throughput may not drop, and p95 turn latency and p99 event-loop lag may
+    not rise, by more than ``tolerance`` (loop lag also gets 5 ms of slack,
+    as it is noisy at the sub-millisecond level). When the calibration
+    workload ran slower than at baseline time, the limits are relaxed by the
+    same factor, so a busy host is not reported as a regression.
+
+    Returns:
+        Descriptions of the regressions found (empty if none).
+    """
+    slowdown = 1.0
+    if result.calibration_ms and baseline.get("calibration_ms"):
+        slowdown = max(1.0, result.calibration_ms / baseline["calibration_ms"])
+    problems = []
+    base_rate = baseline.get("messages_per_sec", 0)
+    if result.messages_per_sec < base_rate * (1 - tolerance) / slowdown:
+        problems.append(f"throughput {result.messages_per_sec} msg/s < baseline {base_rate} msg/s")
+    base_p95 = baseline.get("latency_ms", {}).get("p95", 0)
+    if base_p95 and result.latency_ms["p95"] > base_p95 * (1 + tolerance) * slowdown:
+        problems.append(f"p95 latency {result.latency_ms['p95']} ms > baseline {base_p95} ms")
+    base_lag = baseline.get("loop_lag_ms", {}).get("p99", 0)
+    if result.loop_lag_ms["p99"] > base_lag * (1 + tolerance) * slowdown + 5:
+        problems.append(f"p99 loop lag {result.loop_lag_ms['p99']} ms > baseline {base_lag} ms")
+    return problems
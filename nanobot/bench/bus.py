@@ -0,0 +1,70 @@
+"""Message bus backend benchmark."""
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.utils.histogram import LatencyHistogram
+
+
+async def run_bus_bench(
+    backend: str = "memory",
+    messages: int = 10_000,
+    producers: int = 16,
+    sync: str = "full",
+) -> dict[str, Any]:
+    """
+    Publish ``messages`` inbound messages from concurrent producers while one
+    consumer takes and acks them.
+
+    Args:
+        backend: "memory" or "sqlite".
+        messages: Total number of messages.
+        producers: Number of concurrent publishing tasks.
+        sync: SQLite synchronous mode for the sqlite backend.
+
+    Returns:
+        Throughput and publish latency summary.
+    """
+    with tempfile.TemporaryDirectory(prefix="nanobot-bench-bus-") as tmp:
+        if backend == "sqlite":
+            from nanobot.bus.durable import DurableMessageBus
+            bus: MessageBus = DurableMessageBus(Path(tmp) / "queue.db", sync=sync)
+        else:
+            bus = MessageBus()
+
+        publish = LatencyHistogram()
+
+        async def _produce(worker: int, count: int) -> None:
+            for n in range(count):
+                started = time.perf_counter()
+                await bus.publish_inbound(InboundMessage(
+                    channel="bench", sender_id="bench", chat_id=str(worker), content=f"message {n}",
+                ))
+                publish.add((time.perf_counter() - started) * 1000)
+
+        async def _consume() -> None:
+            for _ in range(messages):
+                bus.ack(await bus.consume_inbound())
+
+        per_producer, extra = divmod(messages, producers)
+        started = time.perf_counter()
+        await asyncio.gather(
+            _consume(),
+            *(_produce(i, per_producer + (1 if i < extra else 0)) for i in range(producers)),
+        )
+        await bus.close()
+        duration = time.perf_counter() - started
+
+    return {
+        "backend": backend if backend == "memory" else f"{backend} ({sync})",
+        "messages": messages,
+        "duration_s": round(duration, 3),
+        "messages_per_sec": round(messages / duration, 1) if duration else 0.0,
+        "publish_p50_ms": round(publish.percentile(50), 3),
+        "publish_p99_ms": round(publish.percentile(99), 3),
+    }
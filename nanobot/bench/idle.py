@@ -0,0 +1,82 @@
+"""Idle cost of bus consumers: CPU time, wakeups and shutdown latency."""
+
+import asyncio
+import time
+from typing import Any
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+
+
+async def run_idle_bench(
+    mode: str = "stream",
+    consumers: int = 3,
+    seconds: float = 5.0,
+    poll_interval: float = 1.0,
+) -> dict[str, Any]:
+    """
+    Leave ``consumers`` outbound consumers idle on an empty bus, then deliver
+    one message to each and shut them down.
+
+    Args:
+        mode: "stream" (``outbound_stream()``, woken by messages and close) or
+            "poll" (``wait_for(consume_outbound(), poll_interval)`` in a loop
+            that checks a running flag, as consumers did before).
+        consumers: Number of concurrent consumers.
+        seconds: How long the bus stays idle.
+        poll_interval: Timeout of the polling loop.
+
+    Returns:
+        CPU time and wakeups while idle, delivery latency after the idle
+        period and time for all consumers to stop.
+    """
+    bus = MessageBus()
+    running = True
+    wakeups = 0
+    delivered: list[float] = []
+
+    async def _poll() -> None:
+        nonlocal wakeups
+        while running:
+            try:
+                msg = await asyncio.wait_for(bus.consume_outbound(), timeout=poll_interval)
+            except asyncio.TimeoutError:
+                wakeups += 1
+                continue
+            delivered.append(time.perf_counter() - msg.metadata["sent_at"])
+
+    async def _stream() -> None:
+        async for msg in bus.outbound_stream():
+            delivered.append(time.perf_counter() - msg.metadata["sent_at"])
+
+    consume = _stream if mode == "stream" else _poll
+    tasks = [asyncio.create_task(consume()) for _ in range(consumers)]
+    await asyncio.sleep(0)  # Let every consumer block on the bus
+
+    cpu_started = time.thread_time()  # Event loop thread only
+    await asyncio.sleep(seconds)
+    cpu_ms = (time.thread_time() - cpu_started) * 1000
+
+    for i in range(consumers):
+        await bus.publish_outbound(OutboundMessage(
+            channel="bench", chat_id=str(i), content="", metadata={"sent_at": time.perf_counter()},
+        ))
+    while len(delivered) < consumers:
+        await asyncio.sleep(0)
+
+    stop_started = time.perf_counter()
+    running = False  # Polling consumers notice on their next timeout
+    if mode == "stream":
+        await bus.close()
+    await asyncio.gather(*tasks)
+    stop_ms = (time.perf_counter() - stop_started) * 1000
+
+    return {
+        "mode": mode,
+        "consumers": consumers,
+        "idle_s": seconds,
+        "cpu_ms_per_s": round(cpu_ms / seconds, 3),
+        "wakeups_per_s": round(wakeups / seconds, 2),
+        "deliver_max_ms": round(max(delivered) * 1000, 3),
+        "shutdown_ms": round(stop_ms, 1),
+    }
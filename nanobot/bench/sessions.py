@@ -0,0 +1,98 @@
+"""Session storage benchmark: disk size, full loads and tail reads per backend."""
+
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from nanobot.session.binary import MsgpackSessionStore
+from nanobot.session.manager import Session
+from nanobot.session.store import JsonlSessionStore, SessionStore, SqliteSessionStore
+
+
+def _make_session(messages: int, size: int) -> Session:
+    session = Session(key="bench:session")
+    started = datetime(2025, 1, 1)
+    for i in range(messages):
+        role = "user" if i % 2 == 0 else "assistant"
+        extra = {"tools_used": ["read_file", "exec"]} if role == "assistant" and i % 10 == 1 else {}
+        session.messages.append({
+            "role": role,
+            "content": f"{i} " + "lorem ipsum dolor sit amet " * (size // 27 + 1),
+            "timestamp": (started + timedelta(seconds=30 * i)).isoformat(),
+            **extra,
+        })
+    return session
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _disk_bytes(root: Path) -> int:
+    return sum(p.stat().st_size for p in root.rglob("*") if p.is_file())
+
+
+def run_session_bench(
+    messages: int = 5000,
+    size: int = 400,
+    tail: int = 50,
+    repeat: int = 5,
+) -> list[dict[str, Any]]:
+    """
+    Store one session of ``messages`` messages in each backend and time it.
+
+    Args:
+        messages: Messages in the session.
+        size: Approximate characters per message.
+        tail: Messages read by ``get_history`` (the agent's memory window).
+        repeat: Runs per measurement; the best is reported.
+
+    Returns:
+        Per backend: bytes on disk, full load, tail read and the time to
+        save two more messages (one turn), in milliseconds.
+    """
+    session = _make_session(messages, size)
+    results = []
+    backends: dict[str, type] = {
+        "jsonl": JsonlSessionStore,
+        "msgpack": MsgpackSessionStore,
+        "sqlite": SqliteSessionStore,
+    }
+    for name, cls in backends.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            store: SessionStore = cls(root / "sessions.db") if name == "sqlite" else cls(root)
+            session._persisted = 0
+            store.save(session)
+            store.compact(session)  # Fold the WAL into the database before measuring size
+
+            loaded = store.load(session.key)
+            if loaded is None or len(loaded.messages) != messages:
+                count = "nothing" if loaded is None else f"{len(loaded.messages)} messages"
+                raise RuntimeError(f"{name} store loaded {count} of a {messages}-message session")
+            load_ms = _best_ms(lambda: store.load(session.key), repeat)
+            tail_ms = _best_ms(lambda: store.get_history(session.key, tail), repeat * 4)
+            disk = _disk_bytes(root)
+
+            def _turn() -> None:
+                loaded.add_message("user", "one more question")
+                loaded.add_message("assistant", "one more answer")
+                store.save(loaded)
+            append_ms = _best_ms(_turn, repeat)
+
+            store.close()
+            results.append({
+                "backend": name,
+                "bytes": disk,
+                "load_ms": load_ms,
+                "tail_ms": tail_ms,
+                "append_ms": append_ms,
+            })
+    return results
@@ -0,0 +1,179 @@
+"""Admission control for inbound messages entering the bus."""
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from nanobot.bus.events import InboundMessage
+
+_MAX_BUCKETS = 4096
+_BUCKET_IDLE_S = 600.0
+_RATE_SAMPLES = 64  # Busy dequeue intervals the drain rate is measured over
+_RATE_WINDOW_S = 30.0  # ... covering at most this much busy time
+
+
+@dataclass
+class Rejection:
+    """Why a message was not admitted and when the sender may try again."""
+    reason: str  # "queue_full" | "rate_limited" | "deadline"
+    retry_after: float  # Seconds
+    notify: bool = True  # False when this sender was told recently
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated: float = field(default_factory=time.monotonic)
+
+
+class AdmissionController:
+    """
+    Decides at the front door whether an inbound message may enter the bus.
+
+    Three checks, each disabled by a zero setting:
+
+    - ``max_queue_depth``: reject while this many messages wait on the bus.
+    - ``sender_rate_per_minute`` / ``sender_burst``: token bucket per
+      channel and sender.
+    - ``max_estimated_wait_s`` (or the caller's own deadline): reject when the
+      backlog would take longer than that to drain. The drain rate is
+      sampled on dequeue (``observe_dequeue``), over busy time only.
+
+    Only messages from channels and the relay go through admission; the
+    agent's own follow-ups (subagent results, cron, heartbeat) are never shed.
+    """
+
+    def __init__(
+        self,
+        max_queue_depth: int = 0,
+        sender_rate_per_minute: float = 0.0,
+        sender_burst: int = 5,
+        max_estimated_wait_s: float = 0.0,
+        busy_message: str = "",
+    ):
+        self.max_queue_depth = max_queue_depth
+        self.sender_rate = sender_rate_per_minute / 60
+        self.sender_burst = max(1, sender_burst)
+        self.max_estimated_wait_s = max_estimated_wait_s
+        self.busy_message = busy_message
+        self.admitted = 0
+        self.rejected: dict[str, int] = {}
+        self._buckets: dict[str, _Bucket] = {}
+        self._notified: dict[str, float] = {}  # Sender -> when they were last told to wait
+        self._intervals: deque[float] = deque()  # Seconds between dequeues of a busy queue
+        self._busy_time = 0.0  # Sum of the intervals
+        self._busy_since: float | None = None  # Last dequeue, if it left messages waiting
+
+    def observe_dequeue(self, depth: int) -> None:
+        """
+        Record a dequeue that left ``depth`` messages waiting.
+
+        The time since the previous dequeue counts toward the drain rate only
+        when that dequeue left messages waiting, i.e. the queue was busy all
+        along; idle gaps never lower the estimate. The rate covers the last
+        ``_RATE_SAMPLES`` intervals and at most ``_RATE_WINDOW_S`` of busy
+        time, so it follows changes in load.
+        """
+        now = time.monotonic()
+        if self._busy_since is not None:
+            interval = now - self._busy_since
+            self._intervals.append(interval)
+            self._busy_time += interval
+            while len(self._intervals) > 1 and (
+                len(self._intervals) > _RATE_SAMPLES or self._busy_time > _RATE_WINDOW_S
+            ):
+                self._busy_time -= self._intervals.popleft()
+        self._busy_since = now if depth > 0 else None
+
+    @property
+    def drain_rate(self) -> float | None:
+        """Messages dequeued per second while messages were waiting (None until measured)."""
+        if not self._intervals or self._busy_time <= 0:
+            return None
+        return len(self._intervals) / self._busy_time
+
+    def estimated_wait(self, depth: int) -> float:
+        """Seconds until a message queued now would be dequeued (0 while unknown)."""
+        rate = self.drain_rate
+        if not depth or not rate:
+            return 0.0
+        return depth / rate
+
+    def check(
+        self,
+        msg: InboundMessage,
+        depth: int,
+        deadline_s: float | None = None,
+    ) -> Rejection | None:
+        """
+        Admit or reject a message.
+
+        Args:
+            msg: The message about to be published.
+            depth: Messages currently waiting on the bus.
+            deadline_s: Seconds the caller is willing to wait, if it has a deadline.
+
+        Returns:
+            None if admitted, else the rejection.
+        """
+        wait = self.estimated_wait(depth)
+        rejection = None
+
+        if self.max_queue_depth and depth >= self.max_queue_depth:
+            rejection = Rejection("queue_full", self._retry_after(wait))
+        else:
+            limit = min(x for x in (deadline_s, self.max_estimated_wait_s or None, float("inf")) if x)
+            if wait > limit:
+                rejection = Rejection("deadline", self._retry_after(wait - limit))
+            elif self.sender_rate:
+                refill = self._take_token(f"{msg.channel}:{msg.sender_id}")
+                if refill:
+                    rejection = Rejection("rate_limited", self._retry_after(refill))
+
+        if rejection is None:
+            self.admitted += 1
+            return None
+        self.rejected[rejection.reason] = self.rejected.get(rejection.reason, 0) + 1
+        rejection.notify = self._should_notify(f"{msg.channel}:{msg.sender_id}", rejection.retry_after)
+        return rejection
+
+    @staticmethod
+    def _retry_after(seconds: float) -> float:
+        return min(60.0, max(1.0, seconds))
+
+    def _take_token(self, key: str) -> float:
+        """Take a token from the sender's bucket; returns 0 or the seconds until one refills."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= _MAX_BUCKETS:
+                self._prune(now)
+            bucket = self._buckets[key] = _Bucket(tokens=self.sender_burst, updated=now)
+        bucket.tokens = min(self.sender_burst, bucket.tokens + (now - bucket.updated) * self.sender_rate)
+        bucket.updated = now
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return 0.0
+        return (1 - bucket.tokens) / self.sender_rate
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, b in self._buckets.items() if now - b.updated > _BUCKET_IDLE_S]:
+            del self._buckets[key]
+            self._notified.pop(key, None)
+
+    def _should_notify(self, key: str, retry_after: float) -> bool:
+        """Tell a sender to wait at most once per retry period."""
+        now = time.monotonic()
+        if now - self._notified.get(key, float("-inf")) < retry_after:
+            return False
+        if len(self._notified) >= _MAX_BUCKETS:
+            self._notified.clear()
+        self._notified[key] = now
+        return True
+
+    def stats(self) -> dict[str, object]:
+        return {
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "drain_rate": round(self.drain_rate or 0.0, 2),
+        }
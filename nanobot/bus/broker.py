@@ -0,0 +1,268 @@
+"""Local bus broker linking channel front-ends and agent worker processes."""
+
+import asyncio
+import os
+import zlib
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.bus.wire import decode_message, encode_message, read_frame, write_frame
+
+HELLO_TIMEOUT = 10.0
+DEFAULT_PREFETCH = 8  # Unacked inbound messages per worker that did not say how many it takes
+
+
+def affinity_key(msg: InboundMessage) -> str:
+    """Key that pins a message to one worker: its session (system messages carry it in chat_id)."""
+    if msg.channel == "system":
+        return msg.chat_id
+    return msg.session_key
+
+
+@dataclass
+class _Peer:
+    """One connected front-end or worker."""
+    name: str
+    role: str
+    writer: asyncio.StreamWriter
+    channels: set[str] = field(default_factory=set)
+    inflight: dict[int, InboundMessage | OutboundMessage] = field(default_factory=dict)
+    delivered: int = 0
+    prefetch: int = 0  # Most unacked messages the peer is sent at once (0 = no limit)
+    backlog: deque[InboundMessage] = field(default_factory=deque)  # Routed here, waiting for a credit
+
+    @property
+    def has_credit(self) -> bool:
+        return not self.prefetch or len(self.inflight) < self.prefetch
+
+    @property
+    def idle(self) -> bool:
+        """Can take the next message of the scheduler right away."""
+        return self.has_credit and not self.backlog
+
+
+class BusBroker:
+    """
+    Unix-socket broker for running channels and agent workers in separate processes.
+
+    Front-ends (processes running channels) publish inbound messages and
+    receive outbound ones; workers (processes running an AgentLoop) receive
+    inbound messages and publish replies. The broker keeps both queues in a
+    regular MessageBus, so lane scheduling and the sqlite backend's
+    durability apply unchanged.
+
+    Inbound messages are routed to workers by rendezvous hashing of their
+    session key: a session always lands on the same worker while the set of
+    workers is stable, and only the sessions of a worker that leaves or joins
+    move. Outbound messages go to a front-end serving their channel.
+    Messages stay unacknowledged in the broker until the receiving peer acks
+    them; a peer that disconnects has its unacked messages requeued.
+
+    Workers are sent at most ``prefetch`` unacked messages each (they
+    announce it in their hello). The next inbound message is taken from the
+    scheduler only once some worker has room for it, so lane and tenant
+    fairness decide the order work is handed out instead of everything
+    being pushed to the workers as it arrives. A message whose worker is
+    full waits in that worker's backlog (at most ``prefetch`` of them) and
+    is sent on its next ack.
+    """
+
+    def __init__(self, path: Path, bus: MessageBus | None = None):
+        self.path = path
+        self.bus = bus or MessageBus()
+        self._workers: dict[str, _Peer] = {}
+        self._frontends: dict[str, _Peer] = {}
+        self._changed = asyncio.Event()  # Peers joined or left, or a worker got a credit back
+        self._next_id = 0
+        self._server: asyncio.AbstractServer | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._publishing: set[asyncio.Task] = set()
+        self._connections: set[asyncio.Task] = set()
+
+    async def start(self) -> None:
+        """Listen on the socket and start routing."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.unlink(missing_ok=True)  # Stale socket of a previous run
+        self._server = await asyncio.start_unix_server(self._serve, path=str(self.path))
+        os.chmod(self.path, 0o600)
+        self._tasks = [
+            asyncio.create_task(self._route_inbound()),
+            asyncio.create_task(self._route_outbound()),
+        ]
+        logger.info("Bus broker listening on {}", self.path)
+
+    async def stop(self) -> None:
+        """Stop routing, disconnect all peers and close the bus."""
+        if self._server:
+            self._server.close()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for peer in [*self._workers.values(), *self._frontends.values()]:
+            peer.writer.close()
+        # Closed connections see EOF, requeue their inflight messages and return
+        await asyncio.gather(*self._connections, return_exceptions=True)
+        await self.bus.close()
+        self.path.unlink(missing_ok=True)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "workers": {p.name: {"inflight": len(p.inflight), "delivered": p.delivered,
+                                 "prefetch": p.prefetch, "backlog": len(p.backlog)}
+                        for p in self._workers.values()},
+            "frontends": {p.name: {"inflight": len(p.inflight), "delivered": p.delivered}
+                          for p in self._frontends.values()},
+            "inbound_queued": self.bus.inbound_size,
+            "outbound_queued": self.bus.outbound_size,
+        }
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            await self._handle_peer(reader, writer)
+        finally:
+            self._connections.discard(task)
+
+    async def _handle_peer(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            hello = await asyncio.wait_for(read_frame(reader), timeout=HELLO_TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, ValueError):
+            writer.close()
+            return
+        role = hello.get("role")
+        if hello.get("op") != "hello" or role not in ("worker", "frontend"):
+            logger.warning("Bus broker: rejecting connection with bad hello {}", hello)
+            writer.close()
+            return
+
+        peers = self._workers if role == "worker" else self._frontends
+        name = str(hello.get("name") or f"{role}-{id(writer)}")
+        if name in peers:
+            logger.warning("Bus broker: {} {} reconnected, dropping the old connection", role, name)
+            peers[name].writer.close()
+        peer = _Peer(name=name, role=role, writer=writer, channels=set(hello.get("channels") or []))
+        if role == "worker":
+            peer.prefetch = max(1, int(hello.get("prefetch") or DEFAULT_PREFETCH))
+        peers[name] = peer
+        self._changed.set()
+        logger.info("Bus broker: {} {} connected", role, name)
+
+        try:
+            while True:
+                frame = await read_frame(reader)
+                op = frame.get("op")
+                if op == "publish":
+                    task = asyncio.create_task(self._publish(peer, frame))
+                    self._publishing.add(task)
+                    task.add_done_callback(self._publishing.discard)
+                elif op in ("ack", "nack"):
+                    msg = peer.inflight.pop(frame.get("id"), None)
+                    if msg is not None:
+                        (self.bus.ack if op == "ack" else self.bus.nack)(msg)
+                        await self._refill(peer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except ValueError as e:
+            logger.error("Bus broker: bad frame from {}: {}", name, e)
+        finally:
+            if peers.get(name) is peer:
+                del peers[name]
+            self._release(peer)
+            self._changed.set()
+            writer.close()
+            logger.info("Bus broker: {} {} disconnected", role, name)
+
+    async def _publish(self, peer: _Peer, frame: dict[str, Any]) -> None:
+        seq = frame.get("seq")
+        try:
+            queue = frame["queue"]
+            msg = decode_message(queue, frame["msg"])
+            if queue == "inbound":
+                await self.bus.publish_inbound(msg)
+            else:
+                await self.bus.publish_outbound(msg)
+            reply = {"op": "published", "seq": seq}
+        except Exception as e:
+            logger.error("Bus broker: publish from {} failed: {}", peer.name, e)
+            reply = {"op": "error", "seq": seq, "error": str(e)}
+        if not peer.writer.is_closing():
+            write_frame(peer.writer, reply)
+
+    def _release(self, peer: _Peer) -> None:
+        """Requeue what a departed peer received but never acked, and its backlog."""
+        if peer.inflight:
+            logger.warning("Bus broker: requeueing {} messages of {}", len(peer.inflight), peer.name)
+        for msg in [*peer.inflight.values(), *peer.backlog]:
+            self.bus.nack(msg)
+        peer.inflight.clear()
+        peer.backlog.clear()
+
+    async def _refill(self, peer: _Peer) -> None:
+        """Spend a credit a worker got back on its backlog, or hand it to the router."""
+        if peer.backlog and peer.has_credit:
+            await self._deliver(peer, "inbound", peer.backlog.popleft())
+        self._changed.set()
+
+    def _worker_for(self, msg: InboundMessage) -> _Peer | None:
+        if not self._workers:
+            return None
+        key = affinity_key(msg)
+        name = max(self._workers, key=lambda n: zlib.crc32(f"{n}\0{key}".encode()))
+        return self._workers[name]
+
+    def _frontend_for(self, msg: OutboundMessage) -> _Peer | None:
+        peers = list(self._frontends.values())
+        serving = [p for p in peers if msg.channel in p.channels]
+        return (serving or peers or [None])[0]
+
+    async def _wait_for(self, check: Callable[[], Any]) -> Any:
+        """Wait until ``check`` returns something truthy after a peer or credit change."""
+        while not (result := check()):
+            self._changed.clear()
+            await self._changed.wait()
+        return result
+
+    async def _route_inbound(self) -> None:
+        async for msg in self.bus.inbound_stream():
+            while True:
+                peer = await self._wait_for(lambda: self._worker_for(msg))
+                if peer.idle:
+                    await self._deliver(peer, "inbound", msg)
+                    break
+                if len(peer.backlog) < peer.prefetch:
+                    peer.backlog.append(msg)
+                    break
+                # Its worker is full: wait for a credit (or for the worker to leave, moving the session)
+                await self._wait_for(lambda: self._worker_for(msg) is not peer or len(peer.backlog) < peer.prefetch)
+            # Leave the rest to the scheduler until a worker can take one
+            await self._wait_for(lambda: any(p.idle for p in self._workers.values()))
+
+    async def _route_outbound(self) -> None:
+        async for msg in self.bus.outbound_stream():
+            peer = await self._wait_for(lambda: self._frontend_for(msg))
+            await self._deliver(peer, "outbound", msg)
+
+    async def _deliver(self, peer: _Peer, queue: str, msg: InboundMessage | OutboundMessage) -> None:
+        if peer.writer.is_closing():
+            self.bus.nack(msg)
+            return
+        self._next_id += 1
+        delivery_id = self._next_id
+        peer.inflight[delivery_id] = msg
+        try:
+            write_frame(peer.writer, {
+                "op": "deliver", "queue": queue, "id": delivery_id, "msg": encode_message(msg),
+            })
+            await peer.writer.drain()
+            peer.delivered += 1
+        except (ConnectionError, RuntimeError):
+            # The peer is gone; _serve requeues its inflight messages, this one included
+            if peer.inflight.pop(delivery_id, None) is not None:
+                self.bus.nack(msg)
@@ -0,0 +1,198 @@
+"""Durable message bus backed by a SQLite write-ahead log."""
+
+import asyncio
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import BusClosedError, MessageBus
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    queue TEXT NOT NULL,
+    body TEXT NOT NULL
+)
+"""
+
+
+def _encode(msg: InboundMessage | OutboundMessage) -> str:
+    data = dict(msg.__dict__)
+    if isinstance(msg, InboundMessage):
+        data["timestamp"] = msg.timestamp.isoformat()
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+
+def _decode(queue: str, body: str) -> InboundMessage | OutboundMessage:
+    data = json.loads(body)
+    if queue == "inbound":
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return InboundMessage(**data)
+    return OutboundMessage(**data)
+
+
+class DurableMessageBus(MessageBus):
+    """
+    Message bus whose queues survive restarts and crashes.
+
+    Every published message is written to SQLite (WAL mode) before it is
+    queued in memory, and deleted once a consumer acks it. Transient outbound
+    events (``_progress`` notes and ``_stream`` deltas) are only queued in memory. Messages still in
+    the database at startup (queued, or consumed but never acked) are replayed
+    in their original order.
+
+    Writes use group commit: publishers append to a pending batch and wait
+    while a single flusher commits everything queued since its last commit in
+    one transaction, so concurrent publishers share one fsync. Acks are
+    batched the same way without making the consumer wait. After
+    ``compact_every`` acks the WAL is checkpointed and free pages are
+    returned to the filesystem.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sync: str = "full",
+        compact_every: int = 10_000,
+        lane_weights: dict[str, int] | None = None,
+        fair_key: str = "tenant_id",
+        tenant_weights: dict[str, int] | None = None,
+    ):
+        super().__init__(lane_weights, fair_key, tenant_weights)
+        self.path = path
+        self.compact_every = compact_every
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA auto_vacuum=INCREMENTAL")  # Only effective on a new file
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={'NORMAL' if sync == 'normal' else 'FULL'}")
+        self._db.execute(_SCHEMA)
+
+        self._ids: dict[int, tuple[int, InboundMessage | OutboundMessage]] = {}  # id(msg) -> (row, msg)
+        self._writes: list[tuple[int, str, str, asyncio.Future[None]]] = []
+        self._acks: list[int] = []
+        self._acked_since_compact = 0
+        self._wakeup: asyncio.Event | None = None
+        self._flusher: asyncio.Task | None = None
+        self._db_closed = False
+        self.replayed = self._replay()
+
+    def _replay(self) -> int:
+        rows = self._db.execute("SELECT id, queue, body FROM messages ORDER BY id").fetchall()
+        for row, queue, body in rows:
+            try:
+                msg = _decode(queue, body)
+            except (ValueError, TypeError, KeyError) as e:
+                logger.warning("Dropping unreadable bus message {}: {}", row, e)
+                self._db.execute("DELETE FROM messages WHERE id = ?", (row,))
+                continue
+            self._ids[id(msg)] = (row, msg)
+            (self.inbound if queue == "inbound" else self.outbound).put_nowait(msg)
+        self._next_id = (rows[-1][0] + 1) if rows else 1
+        if rows:
+            logger.info("Replaying {} unacknowledged bus messages from {}", len(rows), self.path)
+        return len(rows)
+
+    async def publish_inbound(self, msg: InboundMessage) -> None:
+        await self._persist("inbound", msg)
+        await super().publish_inbound(msg)
+
+    async def publish_outbound(self, msg: OutboundMessage) -> None:
+        # Progress notes and stream deltas are stale after a restart and too many to commit each
+        if not (msg.metadata.get("_progress") or msg.metadata.get("_stream")):
+            await self._persist("outbound", msg)
+        await super().publish_outbound(msg)
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        entry = self._ids.pop(id(msg), None)
+        if entry is None:
+            return
+        self._acks.append(entry[0])
+        self._wake()
+
+    async def _persist(self, queue: str, msg: InboundMessage | OutboundMessage) -> None:
+        if self._closed:
+            raise BusClosedError("Message bus is closed")
+        row = self._next_id
+        self._next_id += 1
+        fut = asyncio.get_running_loop().create_future()
+        self._writes.append((row, queue, _encode(msg), fut))
+        self._wake()
+        await fut
+        self._ids[id(msg)] = (row, msg)
+
+    def _wake(self) -> None:
+        if self._db_closed:
+            return
+        if self._flusher is None or self._flusher.done():
+            self._wakeup = asyncio.Event()
+            self._flusher = asyncio.create_task(self._flush_loop())
+        self._wakeup.set()
+
+    async def _flush_loop(self) -> None:
+        while not self._db_closed:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self._flush()
+
+    async def _flush(self) -> None:
+        writes, self._writes = self._writes, []
+        acks, self._acks = self._acks, []
+        if not writes and not acks:
+            return
+        try:
+            await asyncio.to_thread(self._commit, [w[:3] for w in writes], acks)
+        except Exception as e:
+            logger.error("Durable bus commit failed: {}", e)
+            self._acks[:0] = acks
+            for *_, fut in writes:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for *_, fut in writes:
+            if not fut.done():
+                fut.set_result(None)
+        self._acked_since_compact += len(acks)
+        if self._acked_since_compact >= self.compact_every:
+            self._acked_since_compact = 0
+            await asyncio.to_thread(self.compact)
+
+    def _commit(self, writes: list[tuple[int, str, str]], acks: list[int]) -> None:
+        self._db.execute("BEGIN")
+        try:
+            self._db.executemany("INSERT INTO messages (id, queue, body) VALUES (?, ?, ?)", writes)
+            self._db.executemany("DELETE FROM messages WHERE id = ?", [(row,) for row in acks])
+            self._db.execute("COMMIT")
+        except Exception:
+            self._db.execute("ROLLBACK")
+            raise
+
+    def compact(self) -> None:
+        """Checkpoint and truncate the WAL and release free pages of the database."""
+        self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._db.execute("PRAGMA incremental_vacuum")
+
+    @property
+    def pending(self) -> int:
+        """Messages stored in the log and not yet acknowledged."""
+        return len(self._ids)
+
+    async def close(self) -> None:
+        """
+        Close the bus, commit outstanding writes and acks, compact the log and
+        close it. Messages acked after this are delivered again on restart.
+        """
+        if self._db_closed:
+            return
+        await super().close()
+        self._db_closed = True
+        if self._flusher and not self._flusher.done():
+            self._wakeup.set()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await self._flush()
+        self.compact()
+        self._db.close()
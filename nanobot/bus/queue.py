@@ -1,8 +1,19 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
+from collections.abc import AsyncIterator
+from typing import Any
 
+from nanobot.bus.admission import AdmissionController, Rejection
 from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.scheduler import FairScheduler
+
+# Queued behind the last outbound message when the bus closes
+_CLOSED: Any = object()
+
+
+class BusClosedError(Exception):
+    """Raised when publishing to, or consuming from a drained, closed bus."""
 
 
 class MessageBus:
@@ -10,28 +21,100 @@ class MessageBus:
     Async message bus that decouples chat channels from the agent core.
 
     Channels push messages to the inbound queue, and the agent processes
-    them and pushes responses to the outbound queue.
+    them and pushes responses to the outbound queue. The inbound queue is a
+    FairScheduler: messages are served by priority lane (``_lane`` metadata),
+    then fairly across tenants and chats rather than in arrival order.
+
+    Consumers iterate ``inbound_stream()`` / ``outbound_stream()`` and sleep
+    until a message arrives. ``close()`` stops new publishes and wakes every
+    consumer; streams end once the messages queued before closing are drained.
     """
 
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        lane_weights: dict[str, int] | None = None,
+        fair_key: str = "tenant_id",
+        tenant_weights: dict[str, int] | None = None,
+    ):
+        self.inbound = FairScheduler(lane_weights, fair_key, tenant_weights)
         self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+        self.admission: AdmissionController | None = None
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def admit(self, msg: InboundMessage, deadline_s: float | None = None) -> Rejection | None:
+        """Admission check for a message from outside; None if it may be published."""
+        if self.admission is None:
+            return None
+        return self.admission.check(msg, self.inbound_size, deadline_s)
 
     async def publish_inbound(self, msg: InboundMessage) -> None:
         """Publish a message from a channel to the agent."""
+        if self._closed:
+            raise BusClosedError("Message bus is closed")
         await self.inbound.put(msg)
 
     async def consume_inbound(self) -> InboundMessage:
-        """Consume the next inbound message (blocks until available)."""
-        return await self.inbound.get()
+        """Consume the next inbound message (blocks until available; BusClosedError once drained)."""
+        msg = await self.inbound.get()
+        if msg is None:
+            raise BusClosedError("Message bus is closed")
+        if self.admission is not None:
+            self.admission.observe_dequeue(self.inbound_size)
+        return msg
 
     async def publish_outbound(self, msg: OutboundMessage) -> None:
         """Publish a response from the agent to channels."""
+        if self._closed:
+            raise BusClosedError("Message bus is closed")
         await self.outbound.put(msg)
 
     async def consume_outbound(self) -> OutboundMessage:
-        """Consume the next outbound message (blocks until available)."""
-        return await self.outbound.get()
+        """Consume the next outbound message (blocks until available; BusClosedError once drained)."""
+        msg = await self.outbound.get()
+        if msg is _CLOSED:
+            self.outbound.put_nowait(_CLOSED)  # Leave it for the other consumers
+            raise BusClosedError("Message bus is closed")
+        return msg
+
+    async def inbound_stream(self) -> AsyncIterator[InboundMessage]:
+        """Yield inbound messages until the bus is closed and drained."""
+        while True:
+            try:
+                yield await self.consume_inbound()
+            except BusClosedError:
+                return
+
+    async def outbound_stream(self) -> AsyncIterator[OutboundMessage]:
+        """Yield outbound messages until the bus is closed and drained."""
+        while True:
+            try:
+                yield await self.consume_outbound()
+            except BusClosedError:
+                return
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Mark a consumed message as fully handled (no-op for the in-memory bus)."""
+
+    def nack(self, msg: InboundMessage | OutboundMessage) -> None:
+        """Return a consumed message to its queue so it is delivered again."""
+        queue = self.inbound if isinstance(msg, InboundMessage) else self.outbound
+        queue.put_nowait(msg)
+
+    async def close(self) -> None:
+        """Stop accepting messages and wake all consumers so their streams can end."""
+        if self._closed:
+            return
+        self._closed = True
+        self.inbound.close()
+        self.outbound.put_nowait(_CLOSED)
+
+    def lane_stats(self) -> dict[str, dict[str, Any]]:
+        """Per-lane depth and queue wait metrics of the inbound queue."""
+        return self.inbound.stats()
 
     @property
     def inbound_size(self) -> int:
@@ -41,4 +124,4 @@ class MessageBus:
     @property
     def outbound_size(self) -> int:
         """Number of pending outbound messages."""
-        return self.outbound.qsize()
+        return self.outbound.qsize() - (1 if self._closed else 0)
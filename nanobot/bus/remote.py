@@ -0,0 +1,178 @@
+"""Message bus client of the local bus broker."""
+
+import asyncio
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import BusClosedError, MessageBus
+from nanobot.bus.wire import decode_message, encode_message, read_frame, write_frame
+
+
+class RemoteMessageBus(MessageBus):
+    """
+    Message bus of one process attached to a BusBroker over a Unix socket.
+
+    A ``worker`` consumes inbound messages and a ``frontend`` consumes
+    outbound ones. Messages the broker delivers land in the local queues and
+    are consumed as usual; acks and nacks go back to the broker. Publishing
+    to the other queue goes through the broker and returns once the broker
+    has queued (and, with the sqlite backend, stored) the message. Publishing
+    to the consumed queue stays local: a worker's own follow-up messages
+    (subagent results, cron and heartbeat turns) belong to sessions it owns.
+
+    A worker announces ``prefetch``, the most unacked messages the broker
+    sends it at once; the rest stay in the broker's scheduler until it acks.
+
+    The client reconnects when the broker goes away. Delivery is
+    at-least-once: messages unacked when a connection drops are delivered
+    again and may be handled twice.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        role: str,
+        name: str,
+        channels: list[str] | None = None,
+        reconnect_delay: float = 1.0,
+        lane_weights: dict[str, int] | None = None,
+        fair_key: str = "tenant_id",
+        tenant_weights: dict[str, int] | None = None,
+        prefetch: int = 0,
+    ):
+        if role not in ("worker", "frontend"):
+            raise ValueError(f"Unknown bus role: {role}")
+        super().__init__(lane_weights, fair_key, tenant_weights)
+        self.path = path
+        self.role = role
+        self.name = name
+        self.channels = channels or []
+        self.reconnect_delay = reconnect_delay
+        self.prefetch = prefetch  # 0 = the broker's default
+        self._delivery_ids: dict[int, int] = {}  # id(msg) -> broker delivery id
+        self._pending: dict[int, asyncio.Future[None]] = {}  # Publishes awaiting the broker
+        self._seq = 0
+        self._writer: asyncio.StreamWriter | None = None
+        self._connected = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    async def connect(self, timeout: float | None = None) -> None:
+        """Start the connection loop and wait for the first connection."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        await asyncio.wait_for(self._connected.wait(), timeout)
+
+    async def _run(self) -> None:
+        warned = False
+        while not self._closed:
+            try:
+                reader, writer = await asyncio.open_unix_connection(str(self.path))
+            except OSError as e:
+                if not warned:
+                    logger.warning("Bus broker at {} unavailable ({}), retrying", self.path, e)
+                    warned = True
+                await asyncio.sleep(self.reconnect_delay)
+                continue
+
+            warned = False
+            write_frame(writer, {
+                "op": "hello", "role": self.role, "name": self.name,
+                "channels": self.channels, "prefetch": self.prefetch,
+            })
+            self._writer = writer
+            self._connected.set()
+            logger.info("Connected to bus broker at {} as {} {}", self.path, self.role, self.name)
+            try:
+                while True:
+                    self._on_frame(await read_frame(reader))
+            except (asyncio.IncompleteReadError, ConnectionError, ValueError) as e:
+                if not self._closed:
+                    logger.warning("Lost connection to bus broker: {}", e or "closed")
+            finally:
+                self._connected.clear()
+                self._writer = None
+                writer.close()
+                # The broker requeues whatever we had not acked
+                self._delivery_ids.clear()
+                for fut in self._pending.values():
+                    if not fut.done():
+                        fut.set_exception(ConnectionError("Bus broker connection lost"))
+                self._pending.clear()
+            if not self._closed:
+                await asyncio.sleep(self.reconnect_delay)
+
+    def _on_frame(self, frame: dict[str, Any]) -> None:
+        op = frame.get("op")
+        if op == "deliver":
+            msg = decode_message(frame["queue"], frame["msg"])
+            self._delivery_ids[id(msg)] = frame["id"]
+            if frame["queue"] == "inbound":
+                self.inbound.put_nowait(msg)
+            else:
+                self.outbound.put_nowait(msg)
+        elif op in ("published", "error"):
+            fut = self._pending.pop(frame.get("seq"), None)
+            if fut and not fut.done():
+                if op == "published":
+                    fut.set_result(None)
+                else:
+                    fut.set_exception(RuntimeError(f"Bus broker rejected message: {frame.get('error')}"))
+
+    async def _send(self, queue: str, msg: InboundMessage | OutboundMessage) -> None:
+        while True:
+            if self._closed:
+                raise BusClosedError("Message bus is closed")
+            await self._connected.wait()
+            self._seq += 1
+            fut = asyncio.get_running_loop().create_future()
+            self._pending[self._seq] = fut
+            write_frame(self._writer, {
+                "op": "publish", "seq": self._seq, "queue": queue, "msg": encode_message(msg),
+            })
+            try:
+                await self._writer.drain()
+                await fut
+                return
+            except ConnectionError:
+                continue  # Not confirmed before the connection dropped: publish again
+
+    async def publish_inbound(self, msg: InboundMessage) -> None:
+        if self.role == "worker":
+            await super().publish_inbound(msg)
+        else:
+            await self._send("inbound", msg)
+
+    async def publish_outbound(self, msg: OutboundMessage) -> None:
+        if self.role == "frontend":
+            await super().publish_outbound(msg)
+        else:
+            await self._send("outbound", msg)
+
+    def _reply(self, op: str, msg: InboundMessage | OutboundMessage) -> bool:
+        delivery_id = self._delivery_ids.pop(id(msg), None)
+        if delivery_id is None:
+            return False
+        if self._writer and not self._writer.is_closing():
+            write_frame(self._writer, {"op": op, "id": delivery_id})
+        return True
+
+    def ack(self, msg: InboundMessage | OutboundMessage) -> None:
+        self._reply("ack", msg)
+
+    def nack(self, msg: InboundMessage | OutboundMessage) -> None:
+        if not self._reply("nack", msg):
+            super().nack(msg)
+
+    async def close(self) -> None:
+        """Close the bus and disconnect from the broker."""
+        if self._closed:
+            return
+        await super().close()
+        if self._writer:
+            self._writer.close()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
@@ -0,0 +1,186 @@
+"""Priority lanes with weighted fair queueing for inbound messages."""
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+from nanobot.bus.events import InboundMessage
+from nanobot.utils.histogram import LatencyHistogram
+
+# Default lane weights: share of dequeues each lane gets while all are backlogged
+DEFAULT_LANE_WEIGHTS = {"interactive": 8, "system": 4, "background": 1}
+
+_STRIDE_BASE = 1 << 20
+
+
+def lane_of(msg: InboundMessage) -> str:
+    """Lane of a message: explicit ``_lane`` metadata, else system or interactive."""
+    lane = msg.metadata.get("_lane")
+    if lane:
+        return str(lane)
+    return "system" if msg.channel == "system" else "interactive"
+
+
+@dataclass
+class _Flow:
+    """FIFO of one chat, as (enqueued_at, message) pairs."""
+    items: deque[tuple[float, InboundMessage]] = field(default_factory=deque)
+
+
+@dataclass
+class _Tenant:
+    """Chats of one tenant, served round robin."""
+    flows: dict[str, _Flow] = field(default_factory=dict)
+    order: deque[str] = field(default_factory=deque)
+    deficit: int = 0  # Remaining dequeues in the current deficit round robin round
+
+
+@dataclass
+class _Lane:
+    """One priority class: tenants served by weighted deficit round robin."""
+    weight: int
+    tenants: dict[str, _Tenant] = field(default_factory=dict)
+    order: deque[str] = field(default_factory=deque)
+    depth: int = 0
+    pass_value: int = 0  # Stride scheduling virtual time
+    dequeued: int = 0
+    wait: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+    @property
+    def stride(self) -> int:
+        return _STRIDE_BASE // max(1, self.weight)
+
+
+class FairScheduler:
+    """
+    Inbound queue that schedules across priority lanes, tenants and chats.
+
+    Lanes (e.g. interactive, system, background) share dequeues by stride
+    scheduling in proportion to their weights, so background work keeps
+    moving without delaying human replies behind a burst. Within a lane,
+    tenants (``fair_key`` metadata, e.g. a Teams ``tenant_id``) are served by
+    weighted deficit round robin and chats within a tenant round robin, so no
+    single noisy chat or tenant starves the others. Messages of one chat stay
+    in order.
+
+    Implements the subset of the ``asyncio.Queue`` interface the bus uses.
+    After ``close()``, ``get()`` drains what is queued and then returns None.
+    """
+
+    def __init__(
+        self,
+        lane_weights: dict[str, int] | None = None,
+        fair_key: str = "tenant_id",
+        tenant_weights: dict[str, int] | None = None,
+    ):
+        weights = lane_weights or DEFAULT_LANE_WEIGHTS
+        self.fair_key = fair_key
+        self.tenant_weights = tenant_weights or {}
+        self._lanes: dict[str, _Lane] = {name: _Lane(weight=w) for name, w in weights.items()}
+        self._size = 0
+        self._vtime = 0  # Pass value of the lane served last
+        self._not_empty = asyncio.Event()
+        self._closed = False
+
+    def qsize(self) -> int:
+        return self._size
+
+    @property
+    def dequeued(self) -> int:
+        """Messages dequeued so far across all lanes."""
+        return sum(lane.dequeued for lane in self._lanes.values())
+
+    def empty(self) -> bool:
+        return self._size == 0
+
+    async def put(self, msg: InboundMessage) -> None:
+        self.put_nowait(msg)
+
+    def put_nowait(self, msg: InboundMessage) -> None:
+        name = lane_of(msg)
+        lane = self._lanes.get(name)
+        if lane is None:
+            lane = self._lanes[name] = _Lane(weight=1)
+        if lane.depth == 0:
+            # An idle lane rejoins one stride after the current virtual time
+            # instead of cashing in the turns it did not use while empty
+            lane.pass_value = max(lane.pass_value, self._vtime + lane.stride)
+
+        tenant_id = str(msg.metadata.get(self.fair_key) or "")
+        tenant = lane.tenants.get(tenant_id)
+        if tenant is None:
+            tenant = lane.tenants[tenant_id] = _Tenant()
+            lane.order.append(tenant_id)
+        flow_key = msg.session_key
+        flow = tenant.flows.get(flow_key)
+        if flow is None:
+            flow = tenant.flows[flow_key] = _Flow()
+            tenant.order.append(flow_key)
+        flow.items.append((time.monotonic(), msg))
+
+        lane.depth += 1
+        self._size += 1
+        self._not_empty.set()
+
+    async def get(self) -> InboundMessage | None:
+        while not self._size:
+            if self._closed:
+                return None
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self.get_nowait()
+
+    def close(self) -> None:
+        """Wake every waiting consumer; ``get()`` returns None once drained."""
+        self._closed = True
+        self._not_empty.set()
+
+    def get_nowait(self) -> InboundMessage:
+        if not self._size:
+            raise asyncio.QueueEmpty
+        lane = min((c for c in self._lanes.values() if c.depth), key=lambda c: c.pass_value)
+        self._vtime = lane.pass_value
+        lane.pass_value += lane.stride
+
+        # Deficit round robin over tenants: each visit grants `weight` dequeues
+        tenant_id = lane.order[0]
+        tenant = lane.tenants[tenant_id]
+        if tenant.deficit <= 0:
+            tenant.deficit = max(1, self.tenant_weights.get(tenant_id, 1))
+
+        flow_key = tenant.order[0]
+        flow = tenant.flows[flow_key]
+        enqueued_at, msg = flow.items.popleft()
+        tenant.order.rotate(-1)
+        if not flow.items:
+            del tenant.flows[flow_key]
+            tenant.order.remove(flow_key)
+
+        tenant.deficit -= 1
+        if not tenant.flows:
+            del lane.tenants[tenant_id]
+            lane.order.popleft()
+        elif tenant.deficit <= 0:
+            lane.order.rotate(-1)
+
+        lane.depth -= 1
+        lane.dequeued += 1
+        lane.wait.add((time.monotonic() - enqueued_at) * 1000)
+        self._size -= 1
+        return msg
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-lane depth, dequeue count and queue wait percentiles (ms)."""
+        return {
+            name: {
+                "weight": lane.weight,
+                "depth": lane.depth,
+                "dequeued": lane.dequeued,
+                "wait_p50_ms": round(lane.wait.percentile(50), 2),
+                "wait_p95_ms": round(lane.wait.percentile(95), 2),
+                "wait_max_ms": round(lane.wait.max, 2),
+            }
+            for name, lane in self._lanes.items()
+        }
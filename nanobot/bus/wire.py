@@ -0,0 +1,43 @@
+"""Wire format of the multi-process bus: length-prefixed msgpack frames."""
+
+import asyncio
+import struct
+from datetime import datetime
+from typing import Any
+
+import msgpack
+
+from nanobot.bus.events import InboundMessage, OutboundMessage
+
+_HEADER = struct.Struct("!I")
+MAX_FRAME = 64 * 1024 * 1024
+
+
+def encode_message(msg: InboundMessage | OutboundMessage) -> dict[str, Any]:
+    """Message as a msgpack-friendly dict."""
+    data = dict(msg.__dict__)
+    if isinstance(msg, InboundMessage):
+        data["timestamp"] = msg.timestamp.isoformat()
+    return data
+
+
+def decode_message(queue: str, data: dict[str, Any]) -> InboundMessage | OutboundMessage:
+    """Rebuild a message of the given queue ("inbound" or "outbound")."""
+    if queue == "inbound":
+        data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+        return InboundMessage(**data)
+    return OutboundMessage(**data)
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict[str, Any]:
+    """Read one frame; raises asyncio.IncompleteReadError when the peer disconnects."""
+    (size,) = _HEADER.unpack(await reader.readexactly(_HEADER.size))
+    if size > MAX_FRAME:
+        raise ValueError(f"Bus frame of {size} bytes exceeds the limit")
+    return msgpack.unpackb(await reader.readexactly(size), raw=False)
+
+
+def write_frame(writer: asyncio.StreamWriter, frame: dict[str, Any]) -> None:
+    """Queue one frame on the writer (callers drain when they need backpressure)."""
+    body = msgpack.packb(frame, use_bin_type=True, default=str)
+    writer.write(_HEADER.pack(len(body)) + body)
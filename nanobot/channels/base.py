@@ -1,12 +1,26 @@
 """Base channel interface for chat platforms."""
 
+import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from typing import Any
 
 from loguru import logger
 
 from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.channels.coalesce import InboundCoalescer
+
+
+@dataclass
+class _StreamState:
+    """Progress of one streamed response segment on a channel."""
+    chat_id: str
+    text: str = ""
+    handle: Any = None  # Platform id of the message being edited
+    rendered: str = ""  # Text last pushed to the platform
+    last_edit: float = 0.0
+    last_delta: float = 0.0
 
 
 class BaseChannel(ABC):
@@ -19,6 +33,17 @@ class BaseChannel(ABC):
     
     name: str = "base"
     
+    # Channels that can edit a sent message render streamed responses in place;
+    # all others ignore deltas and deliver the final message as usual.
+    supports_streaming: bool = False
+    stream_edit_interval: float = 1.0  # Minimum seconds between edits of one message
+    # A stream neither ended nor finished by a final message (e.g. its turn was
+    # cancelled) is forgotten this long after its last delta
+    stream_ttl: float = 600.0
+
+    # Channels that buffer bursts themselves opt out of the generic coalescer
+    coalesce_inbound: bool = True
+
     def __init__(self, config: Any, bus: MessageBus):
         """
         Initialize the channel.
@@ -30,6 +55,8 @@ class BaseChannel(ABC):
         self.config = config
         self.bus = bus
         self._running = False
+        self._streams: dict[str, _StreamState] = {}
+        self.coalescer: InboundCoalescer | None = None  # Set by ChannelManager when enabled
     
     @abstractmethod
     async def start(self) -> None:
@@ -58,6 +85,92 @@ class BaseChannel(ABC):
         """
         pass
     
+    async def send_delta(self, msg: OutboundMessage) -> None:
+        """
+        Render an incremental text delta of a streamed response.
+
+        The first delta posts a draft message, later ones edit it at most once
+        per ``stream_edit_interval``. A delta flagged ``_stream_end`` flushes and
+        closes the segment; otherwise the final message replaces the draft
+        (see ``_finish_stream``).
+
+        Args:
+            msg: Delta message carrying ``_stream`` and ``_stream_id`` metadata.
+        """
+        stream_id = msg.metadata.get("_stream_id")
+        if not self.supports_streaming or not stream_id:
+            return
+        now = time.monotonic()
+        state = self._streams.get(stream_id)
+        if state is None:
+            self._expire_streams(now)
+            state = self._streams[stream_id] = _StreamState(chat_id=msg.chat_id)
+        state.last_delta = now
+        state.text += msg.content
+        ended = bool(msg.metadata.get("_stream_end"))
+        if ended:
+            self._streams.pop(stream_id, None)
+        elif now - state.last_edit < self.stream_edit_interval:
+            return
+
+        text = state.text.strip()
+        if not text or text == state.rendered:
+            return
+        try:
+            if state.handle is None:
+                state.handle = await self._stream_start(state.chat_id, text, msg.metadata)
+            else:
+                await self._stream_edit(state.chat_id, state.handle, text, msg.metadata)
+            state.rendered = text
+        except Exception as e:
+            logger.warning("Failed to render streamed message on {}: {}", self.name, e)
+        state.last_edit = time.monotonic()
+
+    def _expire_streams(self, now: float) -> None:
+        """Forget streams that got no delta for ``stream_ttl`` seconds."""
+        stale = [sid for sid, state in self._streams.items() if now - state.last_delta > self.stream_ttl]
+        for stream_id in stale:
+            del self._streams[stream_id]
+        if stale:
+            logger.debug("Dropped {} abandoned streams on {}", len(stale), self.name)
+
+    async def _finish_stream(self, msg: OutboundMessage) -> bool:
+        """
+        Replace the streamed draft of a final response with its full content.
+
+        Returns:
+            True if the draft was updated and the text must not be sent again.
+        """
+        stream_id = msg.metadata.get("_stream_id")
+        state = self._streams.pop(stream_id, None) if stream_id else None
+        if state is None or state.handle is None:
+            return False
+        try:
+            await self._stream_edit(state.chat_id, state.handle, msg.content, msg.metadata, final=True)
+            return True
+        except Exception as e:
+            logger.warning("Failed to finalize streamed message on {}: {}", self.name, e)
+            return False
+
+    async def _stream_start(self, chat_id: str, text: str, metadata: dict[str, Any]) -> Any:
+        """
+        Post the first draft of a streamed message and return its platform id.
+
+        The default posts nothing and returns None, so no draft exists and
+        the final message is sent as usual.
+        """
+        return None
+
+    async def _stream_edit(
+        self,
+        chat_id: str,
+        handle: Any,
+        text: str,
+        metadata: dict[str, Any],
+        final: bool = False,
+    ) -> None:
+        """Replace the text of a streamed message; ``final`` applies full formatting."""
+
     def is_allowed(self, sender_id: str) -> bool:
         """
         Check if a sender is allowed to use this bot.
@@ -94,7 +207,9 @@ class BaseChannel(ABC):
         """
         Handle an incoming message from the chat platform.
         
-        This method checks permissions and forwards to the bus.
+        This method checks permissions and admission, then forwards to the
+        bus, through the coalescer when one is attached. A message that is not
+        admitted gets a short busy reply instead of a turn.
         
         Args:
             sender_id: The sender's identifier.
@@ -120,7 +235,22 @@ class BaseChannel(ABC):
             metadata=metadata or {}
         )
         
-        await self.bus.publish_inbound(msg)
+        rejection = self.bus.admit(msg)
+        if rejection:
+            logger.warning("Not admitting message from {} on {}: {}", sender_id, self.name, rejection.reason)
+            if rejection.notify and self.bus.admission.busy_message:
+                await self.bus.publish_outbound(OutboundMessage(
+                    channel=self.name,
+                    chat_id=str(chat_id),
+                    content=self.bus.admission.busy_message,
+                    metadata={"_busy": True, **(metadata or {})},
+                ))
+            return
+
+        if self.coalescer:
+            await self.coalescer.submit(msg)
+        else:
+            await self.bus.publish_inbound(msg)
     
     @property
     def is_running(self) -> bool:
@@ -0,0 +1,123 @@
+"""Merging of bursts of short inbound messages into one agent turn."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from nanobot.bus.events import InboundMessage
+
+
+@dataclass
+class _Burst:
+    """Messages of one sender in one session waiting to be merged."""
+    messages: list[InboundMessage] = field(default_factory=list)
+    first_at: float = field(default_factory=time.monotonic)
+    timer: asyncio.Task | None = None
+
+
+def merge_messages(messages: list[InboundMessage]) -> InboundMessage:
+    """Combine messages into one: texts joined by newlines, media concatenated, last metadata."""
+    if len(messages) == 1:
+        return messages[0]
+    last = messages[-1]
+    return InboundMessage(
+        channel=last.channel,
+        sender_id=last.sender_id,
+        chat_id=last.chat_id,
+        content="\n".join(m.content for m in messages if m.content),
+        timestamp=messages[0].timestamp,
+        media=[path for m in messages for path in m.media],
+        metadata={**last.metadata, "coalesced_count": len(messages)},
+        session_key_override=last.session_key_override,
+    )
+
+
+class InboundCoalescer:
+    """
+    Debounces inbound messages per session and sender before they reach the bus.
+
+    A message opens a burst; every further message of the same sender in the
+    same session within ``window_ms`` joins it and restarts the window. The
+    burst is published as one merged message when the window passes, when it
+    has waited ``max_wait_ms`` since its first message, or when it holds
+    ``max_messages``. A mention (``was_mentioned`` metadata) flushes the
+    burst at once including the mentioning message; a slash command flushes
+    what is pending and then goes through on its own.
+
+    ``on_merge`` is called with the messages folded into a merged one, for
+    callers that track individual messages (e.g. relay requests).
+    """
+
+    def __init__(
+        self,
+        publish: Callable[[InboundMessage], Awaitable[None]],
+        window_ms: int = 1500,
+        max_wait_ms: int = 5000,
+        max_messages: int = 10,
+        on_merge: Callable[[list[InboundMessage], InboundMessage], None] | None = None,
+    ):
+        self.publish = publish
+        self.window = window_ms / 1000
+        self.max_wait = max(window_ms, max_wait_ms) / 1000
+        self.max_messages = max(1, max_messages)
+        self.on_merge = on_merge
+        self.merged = 0  # Messages saved by merging
+        self._bursts: dict[tuple[str, str], _Burst] = {}
+
+    @staticmethod
+    def _key(msg: InboundMessage) -> tuple[str, str]:
+        return msg.session_key, msg.sender_id
+
+    async def submit(self, msg: InboundMessage) -> None:
+        """Buffer a message, publishing right away when it should not wait."""
+        key = self._key(msg)
+        if msg.content.strip().startswith("/"):
+            await self.flush(key)
+            await self.publish(msg)
+            return
+
+        burst = self._bursts.get(key)
+        if burst is None:
+            burst = self._bursts[key] = _Burst()
+        burst.messages.append(msg)
+        if msg.metadata.get("was_mentioned") or len(burst.messages) >= self.max_messages:
+            await self.flush(key)
+            return
+
+        if burst.timer:
+            burst.timer.cancel()
+        delay = min(self.window, burst.first_at + self.max_wait - time.monotonic())
+        burst.timer = asyncio.create_task(self._flush_after(key, burst, max(0.0, delay)))
+
+    async def _flush_after(self, key: tuple[str, str], burst: _Burst, delay: float) -> None:
+        await asyncio.sleep(delay)
+        if self._bursts.get(key) is burst:
+            burst.timer = None  # Do not cancel ourselves while publishing
+            await self.flush(key)
+
+    async def flush(self, key: tuple[str, str]) -> None:
+        """Publish the pending burst of a session and sender, if any."""
+        burst = self._bursts.pop(key, None)
+        if burst is None:
+            return
+        if burst.timer and burst.timer is not asyncio.current_task():
+            burst.timer.cancel()
+        merged = merge_messages(burst.messages)
+        if len(burst.messages) > 1:
+            self.merged += len(burst.messages) - 1
+            if self.on_merge:
+                self.on_merge(burst.messages, merged)
+        await self.publish(merged)
+
+    async def flush_all(self) -> None:
+        """Publish every pending burst (e.g. on shutdown)."""
+        for key in list(self._bursts):
+            await self.flush(key)
+
+    @property
+    def pending(self) -> int:
+        """Messages waiting in open bursts."""
+        return sum(len(b.messages) for b in self._bursts.values())
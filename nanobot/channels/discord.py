@@ -46,6 +46,7 @@ class DiscordChannel(BaseChannel):
     """Discord channel using Gateway websocket."""
 
     name = "discord"
+    supports_streaming = True
 
     def __init__(self, config: DiscordConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -55,6 +56,7 @@ class DiscordChannel(BaseChannel):
         self._heartbeat_task: asyncio.Task | None = None
         self._typing_tasks: dict[str, asyncio.Task] = {}
         self._http: httpx.AsyncClient | None = None
+        self._bot_user_id: str | None = None
 
     async def start(self) -> None:
         """Start the Discord gateway connection."""
@@ -106,7 +108,7 @@ class DiscordChannel(BaseChannel):
 
         try:
             chunks = _split_message(msg.content or "")
-            if not chunks:
+            if not chunks or await self._finish_stream(msg):
                 return
 
             for i, chunk in enumerate(chunks):
@@ -126,9 +128,15 @@ class DiscordChannel(BaseChannel):
         self, url: str, headers: dict[str, str], payload: dict[str, Any]
     ) -> bool:
         """Send a single Discord API payload with retry on rate-limit. Returns True on success."""
+        return await self._request("POST", url, headers, payload) is not None
+
+    async def _request(
+        self, method: str, url: str, headers: dict[str, str], payload: dict[str, Any]
+    ) -> httpx.Response | None:
+        """Issue a Discord API request with retry on rate-limit. Returns None on failure."""
         for attempt in range(3):
             try:
-                response = await self._http.post(url, headers=headers, json=payload)
+                response = await self._http.request(method, url, headers=headers, json=payload)
                 if response.status_code == 429:
                     data = response.json()
                     retry_after = float(data.get("retry_after", 1.0))
@@ -136,13 +144,37 @@ class DiscordChannel(BaseChannel):
                     await asyncio.sleep(retry_after)
                     continue
                 response.raise_for_status()
-                return True
+                return response
             except Exception as e:
                 if attempt == 2:
                     logger.error("Error sending Discord message: {}", e)
                 else:
                     await asyncio.sleep(1)
-        return False
+        return None
+
+    async def _stream_start(self, chat_id: str, text: str, metadata: dict[str, Any]) -> str:
+        await self._stop_typing(chat_id)
+        url = f"{DISCORD_API_BASE}/channels/{chat_id}/messages"
+        headers = {"Authorization": f"Bot {self.config.token}"}
+        response = await self._request("POST", url, headers, {"content": text[:MAX_MESSAGE_LEN]})
+        if response is None:
+            raise RuntimeError("Discord rejected the draft message")
+        return response.json()["id"]
+
+    async def _stream_edit(
+        self, chat_id: str, handle: str, text: str, metadata: dict[str, Any], final: bool = False,
+    ) -> None:
+        """Edit the draft; on the final edit, overflow beyond one message is posted separately."""
+        url = f"{DISCORD_API_BASE}/channels/{chat_id}/messages"
+        headers = {"Authorization": f"Bot {self.config.token}"}
+        chunks = _split_message(text) if final else [text[:MAX_MESSAGE_LEN]]
+        if not chunks:
+            return
+        if await self._request("PATCH", f"{url}/{handle}", headers, {"content": chunks[0]}) is None:
+            raise RuntimeError("Discord rejected the message edit")
+        for chunk in chunks[1:]:
+            if not await self._send_payload(url, headers, {"content": chunk}):
+                break
 
     async def _gateway_loop(self) -> None:
         """Main gateway loop: identify, heartbeat, dispatch events."""
@@ -170,6 +202,7 @@ class DiscordChannel(BaseChannel):
                 await self._start_heartbeat(interval_ms / 1000)
                 await self._identify()
             elif op == 0 and event_type == "READY":
+                self._bot_user_id = str(((payload or {}).get("user") or {}).get("id") or "") or None
                 logger.info("Discord gateway READY")
             elif op == 0 and event_type == "MESSAGE_CREATE":
                 await self._handle_message_create(payload)
@@ -259,7 +292,13 @@ class DiscordChannel(BaseChannel):
                 logger.warning("Failed to download Discord attachment: {}", e)
                 content_parts.append(f"[attachment: {filename} - download failed]")
 
-        reply_to = (payload.get("referenced_message") or {}).get("id")
+        referenced = payload.get("referenced_message") or {}
+        reply_to = referenced.get("id")
+        # Mentioning the bot or replying to it addresses it directly
+        was_mentioned = self._bot_user_id is not None and (
+            any(str(m.get("id")) == self._bot_user_id for m in payload.get("mentions") or [])
+            or str((referenced.get("author") or {}).get("id")) == self._bot_user_id
+        )
 
         await self._start_typing(channel_id)
 
@@ -272,6 +311,7 @@ class DiscordChannel(BaseChannel):
                 "message_id": str(payload.get("id", "")),
                 "guild_id": payload.get("guild_id"),
                 "reply_to": reply_to,
+                "was_mentioned": was_mentioned,
             },
         )
 
@@ -31,6 +31,8 @@ try:
         GetFileRequest,
         GetMessageResourceRequest,
         P2ImMessageReceiveV1,
+        PatchMessageRequest,
+        PatchMessageRequestBody,
     )
     FEISHU_AVAILABLE = True
 except ImportError:
@@ -240,6 +242,7 @@ class FeishuChannel(BaseChannel):
     """
     
     name = "feishu"
+    supports_streaming = True
     
     def __init__(self, config: FeishuConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -564,6 +567,10 @@ class FeishuChannel(BaseChannel):
 
     def _send_message_sync(self, receive_id_type: str, receive_id: str, msg_type: str, content: str) -> bool:
         """Send a single message (text/image/file/interactive) synchronously."""
+        return self._create_message_sync(receive_id_type, receive_id, msg_type, content) is not None
+
+    def _create_message_sync(self, receive_id_type: str, receive_id: str, msg_type: str, content: str) -> str | None:
+        """Send a single message synchronously and return its message_id, or None on failure."""
         try:
             request = CreateMessageRequest.builder() \
                 .receive_id_type(receive_id_type) \
@@ -580,13 +587,59 @@ class FeishuChannel(BaseChannel):
                     "Failed to send Feishu {} message: code={}, msg={}, log_id={}",
                     msg_type, response.code, response.msg, response.get_log_id()
                 )
-                return False
+                return None
             logger.debug("Feishu {} message sent to {}", msg_type, receive_id)
-            return True
+            return response.data.message_id
         except Exception as e:
             logger.error("Error sending Feishu {} message: {}", msg_type, e)
+            return None
+
+    def _patch_card_sync(self, message_id: str, content: str) -> bool:
+        """Replace the content of a sent interactive card synchronously."""
+        try:
+            request = PatchMessageRequest.builder() \
+                .message_id(message_id) \
+                .request_body(
+                    PatchMessageRequestBody.builder()
+                    .content(content)
+                    .build()
+                ).build()
+            response = self._client.im.v1.message.patch(request)
+            if not response.success():
+                logger.warning(
+                    "Failed to update Feishu card: code={}, msg={}, log_id={}",
+                    response.code, response.msg, response.get_log_id()
+                )
+                return False
+            return True
+        except Exception as e:
+            logger.warning("Error updating Feishu card: {}", e)
             return False
 
+    def _stream_card(self, text: str) -> str:
+        # update_multi makes the card editable after it has been sent
+        card = {"config": {"wide_screen_mode": True, "update_multi": True}, "elements": self._build_card_elements(text)}
+        return json.dumps(card, ensure_ascii=False)
+
+    async def _stream_start(self, chat_id: str, text: str, metadata: dict[str, Any]) -> str:
+        receive_id_type = "chat_id" if chat_id.startswith("oc_") else "open_id"
+        message_id = await asyncio.get_running_loop().run_in_executor(
+            None, self._create_message_sync,
+            receive_id_type, chat_id, "interactive", self._stream_card(text),
+        )
+        if not message_id:
+            raise RuntimeError("Feishu rejected the draft card")
+        return message_id
+
+    async def _stream_edit(
+        self, chat_id: str, handle: str, text: str, metadata: dict[str, Any], final: bool = False,
+    ) -> None:
+        ok = await asyncio.get_running_loop().run_in_executor(
+            None, self._patch_card_sync, handle, self._stream_card(text),
+        )
+        if not ok:
+            raise RuntimeError("Feishu rejected the card update")
+
     async def send(self, msg: OutboundMessage) -> None:
         """Send a message through Feishu, including media (images/files) if present."""
         if not self._client:
@@ -618,7 +671,7 @@ class FeishuChannel(BaseChannel):
                             receive_id_type, msg.chat_id, media_type, json.dumps({"file_key": key}, ensure_ascii=False),
                         )
 
-            if msg.content and msg.content.strip():
+            if msg.content and msg.content.strip() and not await self._finish_stream(msg):
                 card = {"config": {"wide_screen_mode": True}, "elements": self._build_card_elements(msg.content)}
                 await loop.run_in_executor(
                     None, self._send_message_sync,
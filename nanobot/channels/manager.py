@@ -10,6 +10,8 @@ from loguru import logger
 from nanobot.bus.events import OutboundMessage
 from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
+from nanobot.channels.coalesce import InboundCoalescer
+from nanobot.channels.outbox import ChannelOutbox
 from nanobot.config.schema import Config
 
 
@@ -20,16 +22,18 @@ class ChannelManager:
     Responsibilities:
     - Initialize enabled channels (Telegram, WhatsApp, etc.)
     - Start/stop channels
-    - Route outbound messages
+    - Route outbound messages to each channel's outbox (own queue and senders)
     """
     
     def __init__(self, config: Config, bus: MessageBus):
         self.config = config
         self.bus = bus
         self.channels: dict[str, BaseChannel] = {}
+        self.outboxes: dict[str, ChannelOutbox] = {}
         self._dispatch_task: asyncio.Task | None = None
         
         self._init_channels()
+        self._init_coalescers()
     
     def _init_channels(self) -> None:
         """Initialize channels based on config."""
@@ -150,7 +154,17 @@ class ChannelManager:
             logger.warning("No channels enabled")
             return
         
-        # Start outbound dispatcher
+        # Start outbound senders and dispatcher
+        settings = self.config.channels
+        for name, channel in self.channels.items():
+            outbox = ChannelOutbox(
+                channel, self.bus,
+                workers=settings.outbound_workers,
+                queue_size=settings.outbound_queue_size,
+                put_timeout=settings.outbound_put_timeout,
+            )
+            outbox.start()
+            self.outboxes[name] = outbox
         self._dispatch_task = asyncio.create_task(self._dispatch_outbound())
         
         # Start channels
@@ -162,6 +176,20 @@ class ChannelManager:
         # Wait for all to complete (they should run forever)
         await asyncio.gather(*tasks, return_exceptions=True)
     
+    def _init_coalescers(self) -> None:
+        """Attach an inbound coalescer to every channel when coalescing is enabled."""
+        cfg = self.config.channels
+        if cfg.coalesce_window_ms <= 0:
+            return
+        for channel in self.channels.values():
+            if channel.coalesce_inbound:
+                channel.coalescer = InboundCoalescer(
+                    self.bus.publish_inbound,
+                    window_ms=cfg.coalesce_window_ms,
+                    max_wait_ms=cfg.coalesce_max_wait_ms,
+                    max_messages=cfg.coalesce_max_messages,
+                )
+
     async def stop_all(self) -> None:
         """Stop all channels and the dispatcher."""
         logger.info("Stopping all channels...")
@@ -173,11 +201,15 @@ class ChannelManager:
                 await self._dispatch_task
             except asyncio.CancelledError:
                 pass
+        for outbox in self.outboxes.values():
+            await outbox.stop()
         
         # Stop all channels
         for name, channel in self.channels.items():
             try:
                 await channel.stop()
+                if channel.coalescer:
+                    await channel.coalescer.flush_all()
                 logger.info("Stopped {} channel", name)
             except Exception as e:
                 logger.error("Error stopping {}: {}", name, e)
@@ -186,26 +218,13 @@ class ChannelManager:
         """Dispatch outbound messages to the appropriate channel."""
         logger.info("Outbound dispatcher started")
         
-        while True:
-            try:
-                msg = await asyncio.wait_for(
-                    self.bus.consume_outbound(),
-                    timeout=1.0
-                )
-                
-                channel = self.channels.get(msg.channel)
-                if channel:
-                    try:
-                        await channel.send(msg)
-                    except Exception as e:
-                        logger.error("Error sending to {}: {}", msg.channel, e)
-                else:
-                    logger.warning("Unknown channel: {}", msg.channel)
-                    
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
+        async for msg in self.bus.outbound_stream():
+            outbox = self.outboxes.get(msg.channel)
+            if outbox:
+                outbox.offer(msg)
+            else:
+                logger.warning("Unknown channel: {}", msg.channel)
+                self.bus.ack(msg)
     
     def get_channel(self, name: str) -> BaseChannel | None:
         """Get a channel by name."""
@@ -216,7 +235,9 @@ class ChannelManager:
         return {
             name: {
                 "enabled": True,
-                "running": channel.is_running
+                "running": channel.is_running,
+                **({"outbound": self.outboxes[name].status()} if name in self.outboxes else {}),
+                **({"coalesced": channel.coalescer.merged} if channel.coalescer else {}),
             }
             for name, channel in self.channels.items()
         }
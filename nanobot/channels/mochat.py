@@ -216,6 +216,7 @@ class MochatChannel(BaseChannel):
     """Mochat channel using socket.io with fallback polling workers."""
 
     name = "mochat"
+    coalesce_inbound = False  # Panel messages are buffered by reply_delay_mode
 
     def __init__(self, config: MochatConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -0,0 +1,192 @@
+"""Per-channel outbound queues and sender workers."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.utils.histogram import LatencyHistogram
+
+
+@dataclass
+class OutboxStats:
+    """Delivery counters of one channel's outbox."""
+    sent: int = 0
+    failed: int = 0
+    dropped: int = 0  # Discarded because the queue stayed full
+    overflows: int = 0  # Times a message found its queue full (incoming or shard)
+    merged: int = 0  # Stream deltas folded into a delta of the same stream still queued
+    send_ms: LatencyHistogram = field(default_factory=LatencyHistogram)
+
+
+class ChannelOutbox:
+    """
+    Bounded outbound queue and sender pool of one channel.
+
+    Messages are sharded by chat_id over ``workers`` queues, each drained by
+    its own task: one chat's messages are sent in order while different chats
+    send concurrently. ``offer`` never blocks: a message goes into the
+    incoming queue of its shard, and that shard's own feeder task moves it
+    on, so a slow channel only delays itself and never the dispatcher
+    serving the other channels, and a backed-up shard never delays the
+    chats of the other shards.
+
+    A stream delta is appended to a delta of the same stream that is still
+    queued instead of being queued itself, so a slow chat gets fewer, larger
+    edits and no text is lost. When a shard is full, progress updates are
+    dropped straight away; other messages wait up to ``put_timeout`` seconds
+    for room (backpressure) before being dropped. Each shard and its
+    incoming queue hold ``queue_size / workers`` messages; a message offered
+    while its incoming queue is full is dropped, so a stalled channel holds
+    at most about twice ``queue_size`` messages.
+    """
+
+    def __init__(
+        self,
+        channel: BaseChannel,
+        bus: MessageBus,
+        workers: int = 4,
+        queue_size: int = 100,
+        put_timeout: float = 5.0,
+    ):
+        self.channel = channel
+        self.bus = bus
+        self.put_timeout = put_timeout
+        self.stats = OutboxStats()
+        shard_size = max(1, queue_size // max(1, workers))
+        self._shards: list[asyncio.Queue[OutboundMessage]] = [
+            asyncio.Queue(maxsize=shard_size) for _ in range(max(1, workers))
+        ]
+        # Offered messages waiting for room in their shard, one queue per shard
+        self._incoming: list[asyncio.Queue[OutboundMessage]] = [
+            asyncio.Queue(maxsize=shard_size) for _ in self._shards
+        ]
+        self._queued_deltas: dict[str, OutboundMessage] = {}  # Stream id -> its delta waiting to be sent
+        self._workers: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start a feeder task and a sender task per shard."""
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._work(shard)) for shard in self._shards]
+            self._workers += [
+                asyncio.create_task(self._feed(incoming, shard))
+                for incoming, shard in zip(self._incoming, self._shards)
+            ]
+
+    async def stop(self) -> None:
+        """Stop the sender tasks; messages still queued are not sent."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be sent."""
+        return sum(queue.qsize() for queue in (*self._incoming, *self._shards))
+
+    def offer(self, msg: OutboundMessage) -> None:
+        """Hand a message to the outbox without waiting; dropped if its shard is backed up."""
+        if self._merge_delta(msg):
+            return
+        try:
+            self._incoming[self._shard_index(msg)].put_nowait(msg)
+        except asyncio.QueueFull:
+            self.stats.overflows += 1
+            self._drop(msg)
+            return
+        self._queued(msg)
+
+    async def _feed(self, incoming: asyncio.Queue[OutboundMessage], shard: asyncio.Queue[OutboundMessage]) -> None:
+        while True:
+            await self._put(shard, await incoming.get())
+
+    def _shard_index(self, msg: OutboundMessage) -> int:
+        return zlib.crc32(msg.chat_id.encode()) % len(self._shards)
+
+    @staticmethod
+    def _stream_id(msg: OutboundMessage) -> str | None:
+        meta = msg.metadata or {}
+        return meta.get("_stream_id") if meta.get("_stream") else None
+
+    def _merge_delta(self, msg: OutboundMessage) -> bool:
+        """Append a stream delta to the queued delta of its stream, if there is one."""
+        stream_id = self._stream_id(msg)
+        queued = self._queued_deltas.get(stream_id) if stream_id else None
+        if queued is None:
+            return False
+        queued.content += msg.content
+        if msg.metadata.get("_stream_end"):
+            queued.metadata = {**queued.metadata, "_stream_end": True}
+        self.stats.merged += 1
+        self.bus.ack(msg)
+        return True
+
+    def _queued(self, msg: OutboundMessage) -> None:
+        if stream_id := self._stream_id(msg):
+            self._queued_deltas[stream_id] = msg
+
+    def _unqueued(self, msg: OutboundMessage) -> None:
+        stream_id = self._stream_id(msg)
+        if stream_id and self._queued_deltas.get(stream_id) is msg:
+            del self._queued_deltas[stream_id]  # Later deltas queue anew
+
+    def _drop(self, msg: OutboundMessage) -> None:
+        if not msg.metadata.get("_progress"):
+            logger.error("Outbound queue of {} is full, dropping message to {}", self.channel.name, msg.chat_id)
+        self.stats.dropped += 1
+        self.bus.ack(msg)
+
+    async def _put(self, shard: asyncio.Queue[OutboundMessage], msg: OutboundMessage) -> None:
+        """Move an offered message into its shard, applying the overflow policy."""
+        try:
+            shard.put_nowait(msg)
+            return
+        except asyncio.QueueFull:
+            self.stats.overflows += 1
+
+        if not msg.metadata.get("_progress"):
+            try:
+                await asyncio.wait_for(shard.put(msg), timeout=self.put_timeout)
+                return
+            except asyncio.TimeoutError:
+                pass
+        self._unqueued(msg)
+        self._drop(msg)
+
+    async def _work(self, shard: asyncio.Queue[OutboundMessage]) -> None:
+        while True:
+            msg = await shard.get()
+            self._unqueued(msg)
+            started = time.perf_counter()
+            try:
+                if msg.metadata.get("_stream"):
+                    await self.channel.send_delta(msg)
+                else:
+                    await self.channel.send(msg)
+                self.stats.sent += 1
+            except Exception as e:
+                self.stats.failed += 1
+                logger.error("Error sending to {}: {}", self.channel.name, e)
+            finally:
+                self.stats.send_ms.add((time.perf_counter() - started) * 1000)
+                self.bus.ack(msg)
+
+    def status(self) -> dict[str, Any]:
+        return {
+            "queued": self.depth,
+            "sent": self.stats.sent,
+            "failed": self.stats.failed,
+            "dropped": self.stats.dropped,
+            "overflows": self.stats.overflows,
+            "merged": self.stats.merged,
+            "send_p95_ms": round(self.stats.send_ms.percentile(95), 1),
+        }
@@ -22,6 +22,8 @@ class SlackChannel(BaseChannel):
     """Slack channel using Socket Mode."""
 
     name = "slack"
+    supports_streaming = True
+    stream_edit_interval = 1.5  # chat.update is rate limited to ~50 calls per minute
 
     def __init__(self, config: SlackConfig, bus: MessageBus):
         super().__init__(config, bus)
@@ -79,14 +81,9 @@ class SlackChannel(BaseChannel):
             logger.warning("Slack client not running")
             return
         try:
-            slack_meta = msg.metadata.get("slack", {}) if msg.metadata else {}
-            thread_ts = slack_meta.get("thread_ts")
-            channel_type = slack_meta.get("channel_type")
-            # Only reply in thread for channel/group messages; DMs don't use threads
-            use_thread = thread_ts and channel_type != "im"
-            thread_ts_param = thread_ts if use_thread else None
-
-            if msg.content:
+            thread_ts_param = self._thread_ts(msg.metadata)
+
+            if msg.content and not await self._finish_stream(msg):
                 await self._web_client.chat_postMessage(
                     channel=msg.chat_id,
                     text=self._to_mrkdwn(msg.content),
@@ -105,6 +102,28 @@ class SlackChannel(BaseChannel):
         except Exception as e:
             logger.error("Error sending Slack message: {}", e)
 
+    @staticmethod
+    def _thread_ts(metadata: dict[str, Any] | None) -> str | None:
+        """Thread to reply in; DMs don't use threads."""
+        slack_meta = metadata.get("slack", {}) if metadata else {}
+        thread_ts = slack_meta.get("thread_ts")
+        channel_type = slack_meta.get("channel_type")
+        # Only reply in thread for channel/group messages
+        return thread_ts if thread_ts and channel_type != "im" else None
+
+    async def _stream_start(self, chat_id: str, text: str, metadata: dict[str, Any]) -> str:
+        response = await self._web_client.chat_postMessage(
+            channel=chat_id,
+            text=self._to_mrkdwn(text),
+            thread_ts=self._thread_ts(metadata),
+        )
+        return response["ts"]
+
+    async def _stream_edit(
+        self, chat_id: str, handle: str, text: str, metadata: dict[str, Any], final: bool = False,
+    ) -> None:
+        await self._web_client.chat_update(channel=chat_id, ts=handle, text=self._to_mrkdwn(text))
+
     async def _on_socket_request(
         self,
         client: SocketModeClient,
@@ -163,6 +182,9 @@ class SlackChannel(BaseChannel):
         if channel_type != "im" and not self._should_respond_in_channel(event_type, text, chat_id):
             return
 
+        was_mentioned = event_type == "app_mention" or (
+            self._bot_user_id is not None and f"<@{self._bot_user_id}>" in text
+        )
         text = self._strip_bot_mention(text)
 
         thread_ts = event.get("thread_ts")
@@ -188,7 +210,8 @@ class SlackChannel(BaseChannel):
                     "event": event,
                     "thread_ts": thread_ts,
                     "channel_type": channel_type,
-                }
+                },
+                "was_mentioned": was_mentioned,
             },
         )
 
@@ -14,6 +14,8 @@ from nanobot.bus.queue import MessageBus
 from nanobot.channels.base import BaseChannel
 from nanobot.config.schema import TelegramConfig
 
+TELEGRAM_MAX_LEN = 4000  # Telegram allows 4096 characters per message
+
 
 def _markdown_to_telegram_html(text: str) -> str:
     """
@@ -78,7 +80,7 @@ def _markdown_to_telegram_html(text: str) -> str:
     return text
 
 
-def _split_message(content: str, max_len: int = 4000) -> list[str]:
+def _split_message(content: str, max_len: int = TELEGRAM_MAX_LEN) -> list[str]:
     """Split content into chunks within max_len, preferring line breaks."""
     if len(content) <= max_len:
         return [content]
@@ -106,11 +108,13 @@ class TelegramChannel(BaseChannel):
     """
     
     name = "telegram"
+    supports_streaming = True
     
     # Commands registered with Telegram's command menu
     BOT_COMMANDS = [
         BotCommand("start", "Start the bot"),
         BotCommand("new", "Start a new conversation"),
+        BotCommand("stop", "Stop the current task"),
         BotCommand("help", "Show available commands"),
     ]
     
@@ -126,6 +130,8 @@ class TelegramChannel(BaseChannel):
         self._app: Application | None = None
         self._chat_ids: dict[str, int] = {}  # Map sender_id to chat_id for replies
         self._typing_tasks: dict[str, asyncio.Task] = {}  # chat_id -> typing loop task
+        self._bot_id: int | None = None
+        self._bot_username: str | None = None
     
     async def start(self) -> None:
         """Start the Telegram bot with long polling."""
@@ -146,6 +152,7 @@ class TelegramChannel(BaseChannel):
         # Add command handlers
         self._app.add_handler(CommandHandler("start", self._on_start))
         self._app.add_handler(CommandHandler("new", self._forward_command))
+        self._app.add_handler(CommandHandler("stop", self._forward_command))
         self._app.add_handler(CommandHandler("help", self._on_help))
         
         # Add message handler for text, photos, voice, documents
@@ -165,6 +172,7 @@ class TelegramChannel(BaseChannel):
         
         # Get bot info and register command menu
         bot_info = await self._app.bot.get_me()
+        self._bot_id, self._bot_username = bot_info.id, bot_info.username
         logger.info("Telegram bot @{} connected", bot_info.username)
         
         try:
@@ -224,14 +232,7 @@ class TelegramChannel(BaseChannel):
             logger.error("Invalid chat_id: {}", msg.chat_id)
             return
 
-        reply_params = None
-        if self.config.reply_to_message:
-            reply_to_message_id = msg.metadata.get("message_id")
-            if reply_to_message_id:
-                reply_params = ReplyParameters(
-                    message_id=reply_to_message_id,
-                    allow_sending_without_reply=True
-                )
+        reply_params = self._reply_params(msg.metadata)
 
         # Send media files
         for media_path in (msg.media or []):
@@ -258,27 +259,77 @@ class TelegramChannel(BaseChannel):
                     reply_parameters=reply_params
                 )
 
-        # Send text content
+        # Send text content (a streamed draft is edited into the final text instead)
         if msg.content and msg.content != "[empty message]":
+            if await self._finish_stream(msg):
+                return
             for chunk in _split_message(msg.content):
-                try:
-                    html = _markdown_to_telegram_html(chunk)
-                    await self._app.bot.send_message(
-                        chat_id=chat_id, 
-                        text=html, 
-                        parse_mode="HTML",
-                        reply_parameters=reply_params
-                    )
-                except Exception as e:
-                    logger.warning("HTML parse failed, falling back to plain text: {}", e)
-                    try:
-                        await self._app.bot.send_message(
-                            chat_id=chat_id, 
-                            text=chunk,
-                            reply_parameters=reply_params
-                        )
-                    except Exception as e2:
-                        logger.error("Error sending Telegram message: {}", e2)
+                await self._send_chunk(chat_id, chunk, reply_params)
+
+    def _reply_params(self, metadata: dict) -> ReplyParameters | None:
+        """Build reply parameters when replying to the triggering message is enabled."""
+        if not self.config.reply_to_message:
+            return None
+        reply_to_message_id = metadata.get("message_id")
+        if not reply_to_message_id:
+            return None
+        return ReplyParameters(
+            message_id=reply_to_message_id,
+            allow_sending_without_reply=True
+        )
+
+    async def _send_chunk(self, chat_id: int, chunk: str, reply_params: ReplyParameters | None) -> None:
+        """Send one text chunk as HTML, falling back to plain text."""
+        try:
+            html = _markdown_to_telegram_html(chunk)
+            await self._app.bot.send_message(
+                chat_id=chat_id, 
+                text=html, 
+                parse_mode="HTML",
+                reply_parameters=reply_params
+            )
+        except Exception as e:
+            logger.warning("HTML parse failed, falling back to plain text: {}", e)
+            try:
+                await self._app.bot.send_message(
+                    chat_id=chat_id, 
+                    text=chunk,
+                    reply_parameters=reply_params
+                )
+            except Exception as e2:
+                logger.error("Error sending Telegram message: {}", e2)
+
+    async def _stream_start(self, chat_id: str, text: str, metadata: dict) -> int:
+        """Post the plain-text draft of a streamed reply."""
+        self._stop_typing(chat_id)
+        sent = await self._app.bot.send_message(
+            chat_id=int(chat_id),
+            text=text[:TELEGRAM_MAX_LEN],
+            reply_parameters=self._reply_params(metadata),
+        )
+        return sent.message_id
+
+    async def _stream_edit(
+        self, chat_id: str, handle: int, text: str, metadata: dict, final: bool = False,
+    ) -> None:
+        """Edit the draft; the final edit renders HTML and sends any overflow as new messages."""
+        if not final:
+            await self._app.bot.edit_message_text(
+                chat_id=int(chat_id), message_id=handle, text=text[:TELEGRAM_MAX_LEN],
+            )
+            return
+        first, *rest = _split_message(text) or [text]
+        try:
+            await self._app.bot.edit_message_text(
+                chat_id=int(chat_id), message_id=handle,
+                text=_markdown_to_telegram_html(first), parse_mode="HTML",
+            )
+        except Exception as e:
+            if "not modified" not in str(e):
+                logger.warning("HTML edit failed, falling back to plain text: {}", e)
+                await self._app.bot.edit_message_text(chat_id=int(chat_id), message_id=handle, text=first)
+        for chunk in rest:
+            await self._send_chunk(int(chat_id), chunk, None)
     
     async def _on_start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Handle /start command."""
@@ -299,6 +350,7 @@ class TelegramChannel(BaseChannel):
         await update.message.reply_text(
             "🐈 nanobot commands:\n"
             "/new — Start a new conversation\n"
+            "/stop — Stop the current task\n"
             "/help — Show available commands"
         )
 
@@ -308,6 +360,20 @@ class TelegramChannel(BaseChannel):
         sid = str(user.id)
         return f"{sid}|{user.username}" if user.username else sid
 
+    def _mentions_bot(self, message) -> bool:
+        """True when a message @-mentions the bot or replies to one of its messages."""
+        reply = message.reply_to_message
+        if reply and reply.from_user and reply.from_user.id == self._bot_id:
+            return True
+        username = (self._bot_username or "").lower()
+        for entities in (message.parse_entities(), message.parse_caption_entities()):
+            for entity, text in entities.items():
+                if entity.type == "mention" and username and text[1:].lower() == username:
+                    return True
+                if entity.type == "text_mention" and entity.user and entity.user.id == self._bot_id:
+                    return True
+        return False
+
     async def _forward_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Forward slash commands to the bus for unified handling in AgentLoop."""
         if not update.message or not update.effective_user:
@@ -412,7 +478,8 @@ class TelegramChannel(BaseChannel):
                 "user_id": user.id,
                 "username": user.username,
                 "first_name": user.first_name,
-                "is_group": message.chat.type != "private"
+                "is_group": message.chat.type != "private",
+                "was_mentioned": self._mentions_bot(message),
             }
         )
     
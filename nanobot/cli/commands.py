@@ -2,23 +2,22 @@
 
 import asyncio
 import os
-import signal
-from pathlib import Path
 import select
+import signal
 import sys
+from pathlib import Path
 
 import typer
-from rich.console import Console
-from rich.markdown import Markdown
-from rich.table import Table
-from rich.text import Text
-
 from prompt_toolkit import PromptSession
 from prompt_toolkit.formatted_text import HTML
 from prompt_toolkit.history import FileHistory
 from prompt_toolkit.patch_stdout import patch_stdout
+from rich.console import Console
+from rich.markdown import Markdown
+from rich.table import Table
+from rich.text import Text
 
-from nanobot import __version__, __logo__
+from nanobot import __logo__, __version__
 from nanobot.config.schema import Config
 
 app = typer.Typer(
@@ -281,9 +280,9 @@ This file stores important information that should persist across sessions.
 
 def _make_provider(config: Config):
     """Create the appropriate LLM provider from config."""
+    from nanobot.providers.custom_provider import CustomProvider
     from nanobot.providers.litellm_provider import LiteLLMProvider
     from nanobot.providers.openai_codex_provider import OpenAICodexProvider
-    from nanobot.providers.custom_provider import CustomProvider
 
     model = config.agents.defaults.model
     provider_name = config.get_provider_name(model)
@@ -322,32 +321,141 @@ def _make_provider(config: Config):
 # ============================================================================
 
 
-@app.command()
-def gateway(
-    port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
-):
-    """Start the nanobot gateway."""
-    from nanobot.config.loader import load_config, get_data_dir
-    from nanobot.bus.events import OutboundMessage
-    from nanobot.bus.queue import MessageBus
-    from nanobot.agent.loop import AgentLoop
-    from nanobot.channels.manager import ChannelManager
+def _bus_scheduling(config: Config) -> dict:
+    """Inbound scheduling options of config.bus, as MessageBus keyword arguments."""
+    return {
+        "lane_weights": config.bus.lanes,
+        "fair_key": config.bus.fair_key,
+        "tenant_weights": config.bus.tenant_weights,
+    }
+
+
+def _bus_socket(config: Config) -> Path:
+    """Unix socket of the bus broker."""
+    from nanobot.config.loader import get_data_dir
+    return Path(config.bus.socket).expanduser() if config.bus.socket else get_data_dir() / "bus" / "broker.sock"
+
+
+def _stop_on_signals() -> asyncio.Event:
+    """Event set on SIGINT or SIGTERM, for graceful shutdown of background processes."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    return stop
+
+
+def _make_bus(config: Config):
+    """Create the message bus selected by config.bus."""
+    from nanobot.bus.queue import MessageBus
+
+    scheduling = _bus_scheduling(config)
+    if config.bus.backend == "sqlite":
+        from nanobot.bus.durable import DurableMessageBus
+        from nanobot.config.loader import get_data_dir
+        path = Path(config.bus.path).expanduser() if config.bus.path else get_data_dir() / "bus" / "queue.db"
+        bus = DurableMessageBus(path, sync=config.bus.sync, **scheduling)
+    else:
+        bus = MessageBus(**scheduling)
+    bus.admission = _make_admission(config)
+    return bus
+
+
+def _make_admission(config: Config):
+    """Admission controller of config.bus.admission, or None when every limit is off."""
+    from nanobot.bus.admission import AdmissionController
+
+    cfg = config.bus.admission
+    if not (cfg.max_queue_depth or cfg.sender_rate_per_minute or cfg.max_estimated_wait_s):
+        return None
+    return AdmissionController(
+        max_queue_depth=cfg.max_queue_depth,
+        sender_rate_per_minute=cfg.sender_rate_per_minute,
+        sender_burst=cfg.sender_burst,
+        max_estimated_wait_s=cfg.max_estimated_wait_s,
+        busy_message=cfg.busy_message,
+    )
+
+
+def _metrics_path(config: Config) -> Path | None:
+    """Turn metrics JSONL file, or None when turn metrics are disabled."""
+    from nanobot.config.loader import get_data_dir
+    return get_data_dir() / "metrics" / "turns.jsonl" if config.agents.defaults.turn_metrics else None
+
+
+def _session_store_spec(config: Config, backend: str | None = None):
+    """Describe the session store of a backend (default: the configured one); "legacy" is ~/.nanobot/sessions."""
+    from nanobot.session.maintenance import StoreSpec
+
+    backend = backend or config.sessions.backend
+    sessions_dir = config.workspace_path / "sessions"
+    if backend == "sqlite":
+        path = Path(config.sessions.path).expanduser() if config.sessions.path else sessions_dir / "sessions.db"
+        return StoreSpec("sqlite", path)
+    if backend == "msgpack":
+        return StoreSpec("msgpack", sessions_dir)
+    if backend == "jsonl":
+        return StoreSpec("jsonl", sessions_dir)
+    if backend == "legacy":
+        return StoreSpec("jsonl", Path.home() / ".nanobot" / "sessions")
+    raise ValueError(f"Unknown session backend: {backend}")
+
+
+def _make_session_store(config: Config, backend: str | None = None):
+    """Create the session store of a backend (default: the configured one)."""
+    from dataclasses import replace
+
+    spec = _session_store_spec(config, backend)
+    if spec.backend == "jsonl" and backend != "legacy":
+        # Legacy sessions move into the workspace when first loaded (in bulk: sessions migrate --from legacy)
+        spec = replace(spec, legacy_dir=Path.home() / ".nanobot" / "sessions")
+    return spec.open()
+
+
+def _make_session_manager(config: Config):
+    """Create the session manager configured by config.sessions."""
+    from nanobot.session.archive import SessionArchive
     from nanobot.session.manager import SessionManager
+    from nanobot.utils.writebehind import WriteBehind
+
+    sessions = config.sessions
+    archive = None
+    if sessions.archive_after_days > 0:
+        archive = SessionArchive(config.workspace_path / "sessions" / "archive", codec=sessions.archive_codec)
+    return SessionManager(
+        config.workspace_path,
+        cache_max_sessions=sessions.cache_max_sessions,
+        cache_max_bytes=sessions.cache_max_mb * 1024 * 1024,
+        store=_make_session_store(config),
+        writer=WriteBehind(sessions.write_window_ms, name="session-writer") if sessions.write_behind else None,
+        archive=archive,
+    )
+
+
+def _make_session_archiver(config: Config, session_manager):
+    """Create the background archiver of idle sessions (not yet started)."""
+    from nanobot.session.archive import SessionArchiver
+
+    sessions = config.sessions
+    return SessionArchiver(
+        session_manager,
+        idle_days=sessions.archive_after_days,
+        consolidated_idle_days=sessions.archive_consolidated_after_days,
+        interval_s=sessions.archive_interval_hours * 60 * 60,
+    )
+
+
+def _make_agent_services(config: Config, bus):
+    """Create the agent loop with its cron and heartbeat services (not yet started)."""
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.events import OutboundMessage
+    from nanobot.config.loader import get_data_dir
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
-    
-    if verbose:
-        import logging
-        logging.basicConfig(level=logging.DEBUG)
-    
-    console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
-    
-    config = load_config()
-    bus = MessageBus()
+
     provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    session_manager = _make_session_manager(config)
     
     # Create cron service first (callback set after agent creation)
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
@@ -365,10 +473,19 @@ def gateway(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        offload_config=config.tools.offload,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
         mcp_servers=config.tools.mcp_servers,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        turn_policy=config.agents.defaults.turn_policy,
+        max_parallel_tools=config.agents.defaults.max_parallel_tools,
+        prompt_layout=config.agents.defaults.prompt_layout,
+        context_window_tokens=config.get_context_window(),
+        history_reserve_tokens=config.agents.defaults.history_reserve_tokens,
+        metrics_path=_metrics_path(config),
+        stream=config.agents.defaults.stream,
     )
     
     # Set cron callback (needs agent)
@@ -382,7 +499,7 @@ def gateway(
             ))
             return job.payload.message
 
-        response = await agent.process_direct(
+        response = await agent.submit(
             job.payload.message,
             session_key=f"cron:{job.id}",
             channel=job.payload.channel or "cli",
@@ -400,7 +517,7 @@ def gateway(
     # Create heartbeat service
     async def on_heartbeat(prompt: str) -> str:
         """Execute heartbeat through the agent."""
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        return await agent.submit(prompt, session_key="heartbeat")
     
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -408,6 +525,37 @@ def gateway(
         interval_s=30 * 60,  # 30 minutes
         enabled=True
     )
+    return agent, cron, heartbeat
+
+
+@app.command()
+def gateway(
+    port: int = typer.Option(18790, "--port", "-p", help="Gateway port"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
+    workers: int = typer.Option(
+        None, "--workers", "-w",
+        help="Agent worker processes behind a local bus broker (default: config bus.workers; 0 = one process)",
+    ),
+):
+    """Start the nanobot gateway."""
+    from nanobot.channels.manager import ChannelManager
+    from nanobot.config.loader import load_config
+
+    if verbose:
+        import logging
+        logging.basicConfig(level=logging.DEBUG)
+
+    console.print(f"{__logo__} Starting nanobot gateway on port {port}...")
+
+    config = load_config()
+    workers = config.bus.workers if workers is None else workers
+    if workers > 0:
+        _run_multiprocess_gateway(config, workers)
+        return
+
+    bus = _make_bus(config)
+    agent, cron, heartbeat = _make_agent_services(config, bus)
+    archiver = _make_session_archiver(config, agent.sessions)
     
     # Create channel manager
     channels = ChannelManager(config, bus)
@@ -427,6 +575,7 @@ def gateway(
         try:
             await cron.start()
             await heartbeat.start()
+            await archiver.start()
             await asyncio.gather(
                 agent.run(),
                 channels.start_all(),
@@ -434,15 +583,130 @@ def gateway(
         except KeyboardInterrupt:
             console.print("\nShutting down...")
         finally:
-            await agent.close_mcp()
+            archiver.stop()
+            await agent.close()
             heartbeat.stop()
             cron.stop()
             agent.stop()
             await channels.stop_all()
+            await bus.close()
     
     asyncio.run(run())
 
 
+def _run_multiprocess_gateway(config: Config, workers: int) -> None:
+    """Run the channels in this process, the agent in worker processes behind a bus broker."""
+    import subprocess
+
+    from nanobot.bus.remote import RemoteMessageBus
+    from nanobot.channels.manager import ChannelManager
+
+    socket_path = _bus_socket(config)
+    base = [sys.executable, "-m", "nanobot"]
+    procs = [subprocess.Popen([*base, "broker", "--socket", str(socket_path)])]
+    for i in range(workers):
+        # Cron jobs and the heartbeat run in the first worker only
+        args = [*base, "worker", "--socket", str(socket_path), "--name", f"worker-{i}"]
+        procs.append(subprocess.Popen(args + (["--cron"] if i == 0 else [])))
+
+    bus = RemoteMessageBus(socket_path, role="frontend", name="gateway", **_bus_scheduling(config))
+    bus.admission = _make_admission(config)  # Per-sender limits; the queue itself lives in the broker
+    channels = ChannelManager(config, bus)
+    bus.channels = channels.enabled_channels
+
+    if channels.enabled_channels:
+        console.print(f"[green]✓[/green] Channels enabled: {', '.join(channels.enabled_channels)}")
+    else:
+        console.print("[yellow]Warning: No channels enabled[/yellow]")
+    console.print(f"[green]✓[/green] Agent workers: {workers} (broker at {socket_path}; cron and heartbeat in worker-0)")
+    if config.sessions.archive_after_days > 0:
+        console.print("[dim]Idle sessions are not archived with workers; run `nanobot sessions archive` while stopped[/dim]")
+
+    async def run():
+        stop = _stop_on_signals()
+        try:
+            await bus.connect()
+            start = asyncio.create_task(channels.start_all())
+            await stop.wait()
+            console.print("\nShutting down...")
+            start.cancel()
+        finally:
+            await channels.stop_all()
+            await bus.close()
+
+    try:
+        asyncio.run(run())
+    finally:
+        # Workers first, so their unacked messages are requeued before the broker closes the bus
+        for proc in reversed(procs):
+            proc.terminate()
+            try:
+                proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+
+@app.command()
+def broker(
+    socket: str = typer.Option("", "--socket", help="Unix socket path (default: config bus.socket)"),
+):
+    """Run the local bus broker for multi-process mode."""
+    from nanobot.bus.broker import BusBroker
+    from nanobot.config.loader import load_config
+
+    config = load_config()
+    path = Path(socket).expanduser() if socket else _bus_socket(config)
+
+    async def run():
+        stop = _stop_on_signals()
+        server = BusBroker(path, _make_bus(config))
+        await server.start()
+        try:
+            await stop.wait()
+        finally:
+            await server.stop()
+
+    asyncio.run(run())
+
+
+@app.command()
+def worker(
+    socket: str = typer.Option("", "--socket", help="Broker socket path (default: config bus.socket)"),
+    name: str = typer.Option("worker-0", "--name", help="Worker name; sessions are routed to workers by name"),
+    cron: bool = typer.Option(False, "--cron", help="Also run cron jobs and the heartbeat"),
+):
+    """Run an agent worker attached to the bus broker."""
+    from nanobot.bus.remote import RemoteMessageBus
+    from nanobot.config.loader import load_config
+
+    config = load_config()
+    path = Path(socket).expanduser() if socket else _bus_socket(config)
+    # Enough for every concurrent turn plus as many parked ones; the rest waits in the broker's scheduler
+    prefetch = 2 * config.agents.defaults.max_concurrent_turns
+    bus = RemoteMessageBus(path, role="worker", name=name, prefetch=prefetch, **_bus_scheduling(config))
+    agent, cron_service, heartbeat = _make_agent_services(config, bus)
+    # No session archiver here: other workers hold sessions this one cannot see in use
+
+    async def run():
+        stop = _stop_on_signals()
+        await bus.connect()
+        if cron:
+            await cron_service.start()
+            await heartbeat.start()
+        agent_task = asyncio.create_task(agent.run())
+        try:
+            await stop.wait()
+        finally:
+            heartbeat.stop()
+            cron_service.stop()
+            agent.stop()
+            await asyncio.gather(agent_task, return_exceptions=True)
+            await agent.close()
+            await bus.close()
+
+    asyncio.run(run())
+
+
 @app.command()
 def relay(
     host: str = typer.Option("127.0.0.1", "--host", help="Relay bind host"),
@@ -463,11 +727,9 @@ def relay(
     verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output"),
 ):
     """Run nanobot Teams relay server (/internal/inbound)."""
-    from nanobot.config.loader import load_config, get_data_dir
-    from nanobot.bus.events import OutboundMessage
-    from nanobot.bus.queue import MessageBus
     from nanobot.agent.loop import AgentLoop
-    from nanobot.session.manager import SessionManager
+    from nanobot.bus.events import OutboundMessage
+    from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
     from nanobot.heartbeat.service import HeartbeatService
@@ -480,9 +742,9 @@ def relay(
     console.print(f"{__logo__} Starting nanobot relay on {host}:{port}...")
 
     config = load_config()
-    bus = MessageBus()
+    bus = _make_bus(config)
     provider = _make_provider(config)
-    session_manager = SessionManager(config.workspace_path)
+    session_manager = _make_session_manager(config)
 
     cron_store_path = get_data_dir() / "cron" / "jobs.json"
     cron = CronService(cron_store_path)
@@ -498,10 +760,18 @@ def relay(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        offload_config=config.tools.offload,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
         session_manager=session_manager,
         mcp_servers=config.tools.mcp_servers,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        turn_policy=config.agents.defaults.turn_policy,
+        max_parallel_tools=config.agents.defaults.max_parallel_tools,
+        prompt_layout=config.agents.defaults.prompt_layout,
+        context_window_tokens=config.get_context_window(),
+        history_reserve_tokens=config.agents.defaults.history_reserve_tokens,
+        metrics_path=_metrics_path(config),
     )
 
     async def on_cron_job(job: CronJob) -> str | None:
@@ -515,7 +785,7 @@ def relay(
             ))
             return job.payload.message
 
-        response = await agent.process_direct(
+        response = await agent.submit(
             job.payload.message,
             session_key=f"cron:{job.id}",
             channel=target_channel,
@@ -531,7 +801,7 @@ def relay(
     cron.on_job = on_cron_job
 
     async def on_heartbeat(prompt: str) -> str:
-        return await agent.process_direct(prompt, session_key="heartbeat")
+        return await agent.submit(prompt, session_key="heartbeat")
 
     heartbeat = HeartbeatService(
         workspace=config.workspace_path,
@@ -551,13 +821,20 @@ def relay(
         internal_token=internal_token,
         teams_proactive_url=teams_proactive_url,
         teams_internal_token=teams_internal_token or internal_token,
+        coalesce_window_ms=config.channels.coalesce_window_ms,
+        coalesce_max_wait_ms=config.channels.coalesce_max_wait_ms,
+        coalesce_max_messages=config.channels.coalesce_max_messages,
     )
 
+    archiver = _make_session_archiver(config, session_manager)
+
     async def run():
         try:
             await relay_server.start()
+            await archiver.start()
             await asyncio.Event().wait()
         finally:
+            archiver.stop()
             await relay_server.stop()
 
     try:
@@ -581,11 +858,12 @@ def agent(
     logs: bool = typer.Option(False, "--logs/--no-logs", help="Show nanobot runtime logs during chat"),
 ):
     """Interact with the agent directly."""
-    from nanobot.config.loader import load_config, get_data_dir
-    from nanobot.bus.queue import MessageBus
+    from loguru import logger
+
     from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
-    from loguru import logger
     
     config = load_config()
     
@@ -612,9 +890,18 @@ def agent(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        offload_config=config.tools.offload,
         cron_service=cron,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(config),
         mcp_servers=config.tools.mcp_servers,
+        max_concurrent_turns=config.agents.defaults.max_concurrent_turns,
+        turn_policy=config.agents.defaults.turn_policy,
+        max_parallel_tools=config.agents.defaults.max_parallel_tools,
+        prompt_layout=config.agents.defaults.prompt_layout,
+        context_window_tokens=config.get_context_window(),
+        history_reserve_tokens=config.agents.defaults.history_reserve_tokens,
+        metrics_path=_metrics_path(config),
     )
     
     # Show spinner when logs are off (no output to miss); skip when logs are on
@@ -631,10 +918,12 @@ def agent(
     if message:
         # Single message mode — direct call, no bus needed
         async def run_once():
-            with _thinking_ctx():
-                response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
-            _print_agent_response(response, render_markdown=markdown)
-            await agent_loop.close_mcp()
+            try:
+                with _thinking_ctx():
+                    response = await agent_loop.process_direct(message, session_id, on_progress=_cli_progress)
+                _print_agent_response(response, render_markdown=markdown)
+            finally:
+                await agent_loop.close()
 
         asyncio.run(run_once())
     else:
@@ -662,22 +951,18 @@ def agent(
             turn_response: list[str] = []
 
             async def _consume_outbound():
-                while True:
-                    try:
-                        msg = await asyncio.wait_for(bus.consume_outbound(), timeout=1.0)
-                        if msg.metadata.get("_progress"):
-                            console.print(f"  [dim]↳ {msg.content}[/dim]")
-                        elif not turn_done.is_set():
-                            if msg.content:
-                                turn_response.append(msg.content)
-                            turn_done.set()
-                        elif msg.content:
-                            console.print()
-                            _print_agent_response(msg.content, render_markdown=markdown)
-                    except asyncio.TimeoutError:
-                        continue
-                    except asyncio.CancelledError:
-                        break
+                async for msg in bus.outbound_stream():
+                    if msg.metadata.get("_stream"):
+                        continue  # The final response repeats the streamed text
+                    if msg.metadata.get("_progress"):
+                        console.print(f"  [dim]↳ {msg.content}[/dim]")
+                    elif not turn_done.is_set():
+                        if msg.content:
+                            turn_response.append(msg.content)
+                        turn_done.set()
+                    elif msg.content:
+                        console.print()
+                        _print_agent_response(msg.content, render_markdown=markdown)
 
             outbound_task = asyncio.create_task(_consume_outbound())
 
@@ -722,7 +1007,7 @@ def agent(
                 agent_loop.stop()
                 outbound_task.cancel()
                 await asyncio.gather(bus_task, outbound_task, return_exceptions=True)
-                await agent_loop.close_mcp()
+                await agent_loop.close()
 
         asyncio.run(run_interactive())
 
@@ -891,6 +1176,7 @@ def _get_bridge_dir() -> Path:
 def channels_login():
     """Link device via QR code."""
     import subprocess
+
     from nanobot.config.loader import load_config
     
     config = load_config()
@@ -1069,11 +1355,12 @@ def cron_run(
 ):
     """Manually run a job."""
     from loguru import logger
-    from nanobot.config.loader import load_config, get_data_dir
+
+    from nanobot.agent.loop import AgentLoop
+    from nanobot.bus.queue import MessageBus
+    from nanobot.config.loader import get_data_dir, load_config
     from nanobot.cron.service import CronService
     from nanobot.cron.types import CronJob
-    from nanobot.bus.queue import MessageBus
-    from nanobot.agent.loop import AgentLoop
     logger.disable("nanobot")
 
     config = load_config()
@@ -1090,8 +1377,15 @@ def cron_run(
         memory_window=config.agents.defaults.memory_window,
         brave_api_key=config.tools.web.search.api_key or None,
         exec_config=config.tools.exec,
+        offload_config=config.tools.offload,
         restrict_to_workspace=config.tools.restrict_to_workspace,
+        session_manager=_make_session_manager(config),
         mcp_servers=config.tools.mcp_servers,
+        max_parallel_tools=config.agents.defaults.max_parallel_tools,
+        prompt_layout=config.agents.defaults.prompt_layout,
+        context_window_tokens=config.get_context_window(),
+        history_reserve_tokens=config.agents.defaults.history_reserve_tokens,
+        metrics_path=_metrics_path(config),
     )
 
     store_path = get_data_dir() / "cron" / "jobs.json"
@@ -1112,7 +1406,10 @@ def cron_run(
     service.on_job = on_job
 
     async def run():
-        return await service.run_job(job_id, force=force)
+        try:
+            return await service.run_job(job_id, force=force)
+        finally:
+            await agent_loop.close()
 
     if asyncio.run(run()):
         console.print("[green]✓[/green] Job executed")
@@ -1130,7 +1427,7 @@ def cron_run(
 @app.command()
 def status():
     """Show nanobot status."""
-    from nanobot.config.loader import load_config, get_config_path
+    from nanobot.config.loader import get_config_path, load_config
 
     config_path = get_config_path()
     config = load_config()
@@ -1164,6 +1461,533 @@ def status():
                 console.print(f"{spec.label}: {'[green]✓[/green]' if has_key else '[dim]not set[/dim]'}")
 
 
+@app.command()
+def stats(
+    since: str = typer.Option("", "--since", "-s", help="Only turns within this window, e.g. 30m, 24h, 7d"),
+):
+    """Show agent turn latency percentiles per phase, channel and tool."""
+    from datetime import datetime, timedelta
+
+    from nanobot.agent.timing import PHASES, TurnMetrics
+    from nanobot.config.loader import get_data_dir
+
+    cutoff = None
+    if since:
+        units = {"m": "minutes", "h": "hours", "d": "days"}
+        try:
+            cutoff = datetime.now() - timedelta(**{units[since[-1]]: float(since[:-1])})
+        except (KeyError, ValueError):
+            console.print(f"[red]Invalid --since value: {since}[/red]")
+            raise typer.Exit(1)
+
+    path = get_data_dir() / "metrics" / "turns.jsonl"
+    metrics = TurnMetrics.load(path, since=cutoff)
+    if not metrics.histograms:
+        console.print(f"No turn metrics recorded yet ({path}); enable agents.defaults.turnMetrics to record them.")
+        return
+
+    order = {name: i for i, name in enumerate(PHASES)}
+    for kind, title in (
+        ("phase", "Phase"), ("channel", "Channel (end to end)"), ("lane", "Lane (queue wait)"), ("tool", "Tool"),
+    ):
+        rows = sorted(
+            ((name, h) for (k, name), h in metrics.histograms.items() if k == kind),
+            key=lambda item: (order.get(item[0], len(order)), item[0]) if kind == "phase" else item[0],
+        )
+        if not rows:
+            continue
+        table = Table(title=f"Latency by {title.lower()} (ms)")
+        table.add_column(title, style="cyan")
+        for col in ("Count", "Mean", "p50", "p95", "p99", "Max"):
+            table.add_column(col, justify="right")
+        for name, h in rows:
+            table.add_row(
+                name, str(h.count), f"{h.mean:.1f}",
+                f"{h.percentile(50):.1f}", f"{h.percentile(95):.1f}", f"{h.percentile(99):.1f}",
+                f"{h.max:.1f}",
+            )
+        console.print(table)
+
+
+# ============================================================================
+# Sessions
+# ============================================================================
+
+sessions_app = typer.Typer(help="Manage conversation sessions")
+app.add_typer(sessions_app, name="sessions")
+
+
+def _session_keys(spec) -> list[str]:
+    """Keys of all sessions in a store, most recently updated first."""
+    store = spec.open()
+    try:
+        return [info["key"] for info in store.list_sessions()]
+    finally:
+        store.close()
+
+
+def _stream_results(
+    results, show: tuple[str, ...] = ("error",), every: int = 1000, keep: list | None = None,
+) -> dict[str, int]:
+    """
+    Print results with a status in ``show`` as they arrive, plus progress;
+    returns counts per status. Results are also appended to ``keep``.
+    """
+    from collections import Counter
+
+    counts: Counter[str] = Counter()
+    try:
+        for r in results:
+            counts[r["status"]] += 1
+            if keep is not None:
+                keep.append(r)
+            if r["status"] in show:
+                detail = r.get("error") or "; ".join(r.get("problems", []))
+                color = "red" if r["status"] == "error" else "yellow"
+                console.print(f"[{color}]{r['status']}[/{color}] {r['key']}: {detail}")
+            done = sum(counts.values())
+            if done % every == 0:
+                console.print(f"[dim]{done} sessions...[/dim]")
+    except KeyboardInterrupt:
+        console.print("[yellow]Interrupted; run the command again to resume[/yellow]")
+        raise typer.Exit(130)
+    return dict(counts)
+
+
+def _journal(config: Config, name: str, restart: bool):
+    """Resume journal of a bulk operation (discarded with --restart)."""
+    from nanobot.session.maintenance import Journal
+
+    journal = Journal(config.workspace_path / "sessions" / ".maintenance" / f"{name}.journal")
+    if restart:
+        journal.finish()
+        journal = Journal(journal.path)
+    elif journal.done:
+        console.print(f"Resuming: {len(journal.done)} sessions already done ({journal.path})")
+    return journal
+
+
+def _finish_journal(journal, counts: dict[str, int]) -> None:
+    """Drop the journal once nothing failed; otherwise keep it so a rerun retries only the failures."""
+    if counts.get("error"):
+        journal.close()
+        console.print(f"[yellow]{counts['error']} sessions failed; run the command again to retry them[/yellow]")
+    else:
+        journal.finish()
+
+
+_WORKERS_HELP = "Worker processes (default: CPU count)"
+
+
+@sessions_app.command("stats")
+def sessions_stats(
+    backend: str = typer.Option("", "--backend", "-b", help="Store to inspect (default: the configured one)"),
+    workers: int = typer.Option(0, "--workers", "-j", help=_WORKERS_HELP),
+    top: int = typer.Option(5, "--top", help="Largest sessions to list"),
+):
+    """Show session counts, sizes and idle times of the whole store and the archive."""
+    from datetime import datetime
+
+    from nanobot.config.loader import load_config
+    from nanobot.session.archive import SessionArchive
+    from nanobot.session.maintenance import run_bulk, stats_task
+
+    config = load_config()
+    spec = _session_store_spec(config, backend or None)
+    results: list[dict] = []
+    counts = _stream_results(run_bulk(stats_task, _session_keys(spec), spec, workers=workers or None), keep=results)
+    ok = [r for r in results if r["status"] == "ok"]
+
+    now = datetime.now()
+    buckets = {"< 1 day": 0, "1-7 days": 0, "7-30 days": 0, "> 30 days": 0}
+    for r in ok:
+        idle = (now - datetime.fromisoformat(r["updated_at"])).days
+        name = "< 1 day" if idle < 1 else "1-7 days" if idle < 7 else "7-30 days" if idle < 30 else "> 30 days"
+        buckets[name] += 1
+
+    table = Table(title=f"Sessions ({spec.backend}: {spec.path})")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Sessions", str(len(ok)))
+    table.add_row("Unreadable", str(counts.get("error", 0)))
+    table.add_row("Messages", str(sum(r["messages"] for r in ok)))
+    table.add_row("Unconsolidated messages", str(sum(r["unconsolidated"] for r in ok)))
+    sizes = [r["bytes"] for r in ok if r["bytes"] is not None]
+    if sizes:
+        table.add_row("Size", f"{sum(sizes) / 1024 / 1024:.1f} MB")
+    elif spec.backend == "sqlite" and spec.path.exists():
+        table.add_row("Database size", f"{spec.path.stat().st_size / 1024 / 1024:.1f} MB")
+    for name, n in buckets.items():
+        table.add_row(f"Idle {name}", str(n))
+
+    archive = SessionArchive(config.workspace_path / "sessions" / "archive")
+    if archive.index_path.exists():
+        a = archive.stats()
+        table.add_row("Archived sessions", str(a["sessions"]))
+        table.add_row("Archived messages", str(a["messages"]))
+        table.add_row("Archive size", f"{a['stored_bytes'] / 1024 / 1024:.1f} MB ({a['ratio']:.1f}x, {a['segments']} segments)")
+    console.print(table)
+
+    largest = sorted(ok, key=lambda r: r["messages"], reverse=True)[:top]
+    if largest:
+        table = Table(title="Largest sessions")
+        table.add_column("Key", style="cyan")
+        table.add_column("Messages", justify="right")
+        table.add_column("Updated")
+        for r in largest:
+            table.add_row(r["key"], str(r["messages"]), r["updated_at"][:19])
+        console.print(table)
+
+
+@sessions_app.command("verify")
+def sessions_verify(
+    repair: bool = typer.Option(False, "--repair", help="Rewrite damaged sessions from what could be read"),
+    backend: str = typer.Option("", "--backend", "-b", help="Store to check (default: the configured one)"),
+    workers: int = typer.Option(0, "--workers", "-j", help=_WORKERS_HELP),
+):
+    """Check every session for torn files and inconsistent state."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.maintenance import run_bulk, verify_task
+
+    config = load_config()
+    spec = _session_store_spec(config, backend or None)
+    results = run_bulk(
+        verify_task, _session_keys(spec), spec, options={"repair": repair}, workers=workers or None,
+    )
+    counts = _stream_results(results, show=("error", "problem", "repaired"))
+    console.print(
+        f"Checked {sum(counts.values())} sessions: {counts.get('ok', 0)} ok, {counts.get('problem', 0)} damaged, "
+        f"{counts.get('repaired', 0)} repaired, {counts.get('error', 0)} unreadable"
+    )
+    if counts.get("problem") or counts.get("error"):
+        raise typer.Exit(1)
+
+
+@sessions_app.command("compact")
+def sessions_compact(
+    workers: int = typer.Option(0, "--workers", "-j", help=_WORKERS_HELP),
+    restart: bool = typer.Option(False, "--restart", help="Ignore the progress of an interrupted run"),
+):
+    """Rewrite session files without superseded records (VACUUM for SQLite)."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.maintenance import compact_task, run_bulk
+
+    config = load_config()
+    spec = _session_store_spec(config)
+    if spec.backend == "sqlite":
+        store = spec.open()
+        try:
+            reclaimed = store.vacuum()
+        finally:
+            store.close()
+        console.print(f"[green]✓[/green] Vacuumed {spec.path} ({reclaimed / 1024 / 1024:.1f} MB reclaimed)")
+        return
+
+    journal = _journal(config, f"compact-{spec.backend}", restart)
+    results: list[dict] = []
+    counts = _stream_results(
+        run_bulk(compact_task, _session_keys(spec), spec, workers=workers or None, journal=journal), keep=results,
+    )
+    _finish_journal(journal, counts)
+    reclaimed = sum(r.get("reclaimed", 0) for r in results)
+    console.print(
+        f"[green]✓[/green] Compacted {counts.get('compacted', 0)} sessions "
+        f"({counts.get('unchanged', 0)} unchanged, {reclaimed / 1024 / 1024:.1f} MB reclaimed)"
+    )
+
+
+@sessions_app.command("migrate")
+def sessions_migrate(
+    to: str = typer.Option("", "--to", help="Target backend: jsonl, sqlite or msgpack (default: the configured one)"),
+    source: str = typer.Option("", "--from", help="Source backend: jsonl, sqlite, msgpack or legacy (~/.nanobot/sessions)"),
+    workers: int = typer.Option(0, "--workers", "-j", help=_WORKERS_HELP),
+    restart: bool = typer.Option(False, "--restart", help="Ignore the progress of an interrupted run"),
+):
+    """
+    Copy all sessions from one storage backend to another.
+
+    Legacy sessions are moved instead, and only where the workspace has no
+    session of the same key (as when they are migrated lazily on load).
+    """
+    from nanobot.config.loader import load_config
+    from nanobot.session.maintenance import migrate_task, run_bulk
+
+    config = load_config()
+    to = to or config.sessions.backend
+    source = source or (config.sessions.backend if config.sessions.backend != to else "jsonl")
+    if source == to:
+        console.print("[red]Source and target backends are the same[/red]")
+        raise typer.Exit(1)
+    if to == "legacy":
+        console.print("[red]Sessions cannot be migrated to the legacy location[/red]")
+        raise typer.Exit(1)
+    try:
+        src, dst = _session_store_spec(config, source), _session_store_spec(config, to)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        raise typer.Exit(1)
+
+    legacy = source == "legacy"
+    if legacy and not src.path.exists():
+        console.print(f"No legacy sessions ({src.path})")
+        return
+    journal = _journal(config, f"migrate-{source}-{to}", restart)
+    counts = _stream_results(run_bulk(
+        migrate_task, _session_keys(src), src, target=dst,
+        options={"move": legacy, "keep_existing": legacy},
+        workers=workers or None, journal=journal,
+    ))
+    _finish_journal(journal, counts)
+
+    console.print(f"[green]✓[/green] Migrated {counts.get('migrated', 0)} sessions from {source} to {to}")
+    if counts.get("skipped"):
+        console.print(f"Kept {counts['skipped']} legacy sessions that already exist in the workspace")
+    if config.sessions.backend != to:
+        console.print(f"Set [cyan]sessions.backend[/cyan] to \"{to}\" in the config to use them.")
+
+
+@sessions_app.command("export")
+def sessions_export(
+    out: Path = typer.Argument(..., help="Output directory"),
+    fmt: str = typer.Option("jsonl", "--format", "-f", help="File format: jsonl or msgpack"),
+    backend: str = typer.Option("", "--backend", "-b", help="Store to export (default: the configured one)"),
+    workers: int = typer.Option(0, "--workers", "-j", help=_WORKERS_HELP),
+    restart: bool = typer.Option(False, "--restart", help="Ignore the progress of an interrupted run"),
+):
+    """Write every session to its own file, e.g. for backups or inspection."""
+    from nanobot.config.loader import load_config
+    from nanobot.session.maintenance import Journal, export_task, run_bulk
+    from nanobot.utils.helpers import ensure_dir
+
+    if fmt not in ("jsonl", "msgpack"):
+        console.print(f"[red]Unknown format: {fmt}[/red]")
+        raise typer.Exit(1)
+    config = load_config()
+    spec = _session_store_spec(config, backend or None)
+    out = ensure_dir(out.expanduser().resolve())
+    journal = Journal(out / ".export.journal")
+    if restart:
+        journal.finish()
+        journal = Journal(journal.path)
+    elif journal.done:
+        console.print(f"Resuming: {len(journal.done)} sessions already exported")
+    counts = _stream_results(run_bulk(
+        export_task, _session_keys(spec), spec, options={"out_dir": str(out), "format": fmt},
+        workers=workers or None, journal=journal,
+    ))
+    _finish_journal(journal, counts)
+    console.print(f"[green]✓[/green] Exported {counts.get('exported', 0)} sessions to {out}")
+
+
+@sessions_app.command("archive")
+def sessions_archive(
+    days: float = typer.Option(None, "--days", help="Archive sessions idle this many days (default: config)"),
+    consolidated_days: float = typer.Option(
+        None, "--consolidated-days", help="Limit for fully consolidated sessions (default: config)",
+    ),
+    workers: int = typer.Option(0, "--workers", "-j", help=_WORKERS_HELP),
+):
+    """
+    Compress idle sessions into the archive now (they are restored on their next message).
+
+    Run it while the gateway is stopped; a single-process gateway archives
+    on its own every sessions.archiveIntervalHours, one with --workers
+    never does. An interrupted run is resumed by running it again.
+    """
+    from nanobot.config.loader import load_config
+    from nanobot.session.archive import SessionArchive
+    from nanobot.session.maintenance import archive_store
+
+    config = load_config()
+    sessions = config.sessions
+    days = sessions.archive_after_days if days is None else days
+    if days <= 0:
+        console.print("[yellow]Archiving is disabled (sessions.archiveAfterDays is 0); pass --days[/yellow]")
+        raise typer.Exit(1)
+    if consolidated_days is None:
+        consolidated_days = min(days, sessions.archive_consolidated_after_days)
+    archive = SessionArchive(config.workspace_path / "sessions" / "archive", codec=sessions.archive_codec)
+    counts = _stream_results(archive_store(
+        _session_store_spec(config), archive, days, consolidated_days, workers=workers or None,
+    ))
+
+    stats = archive.stats()
+    console.print(f"[green]✓[/green] Archived {counts.get('archived', 0)} sessions")
+    table = Table(title="Session archive")
+    table.add_column("Sessions", justify="right")
+    table.add_column("Messages", justify="right")
+    table.add_column("Segments", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Ratio", justify="right")
+    table.add_row(
+        str(stats["sessions"]), str(stats["messages"]), str(stats["segments"]),
+        f"{stats['stored_bytes'] / 1024:.0f} KB", f"{stats['ratio']:.1f}x",
+    )
+    console.print(table)
+
+
+@sessions_app.command("convert")
+def sessions_convert(
+    source: Path = typer.Argument(..., help="Session file (.jsonl or .msgpack)"),
+    target: Path = typer.Argument(None, help="Output file (default: source with the other suffix)"),
+):
+    """Convert one session file between JSONL and the binary msgpack format."""
+    from nanobot.session.binary import MAGIC, convert_session_file
+
+    if not source.exists():
+        console.print(f"[red]{source} not found[/red]")
+        raise typer.Exit(1)
+    if target is None:
+        with open(source, "rb") as f:
+            binary = f.read(len(MAGIC)) == MAGIC
+        target = source.with_suffix(".jsonl" if binary else ".msgpack")
+    count = convert_session_file(source, target)
+    console.print(f"[green]✓[/green] Wrote {count} messages to {target}")
+
+
+# ============================================================================
+# Benchmarks
+# ============================================================================
+
+bench_app = typer.Typer(help="Run benchmarks (no LLM calls)")
+app.add_typer(bench_app, name="bench")
+
+
+@bench_app.command("agent")
+def bench_agent(
+    chats: int = typer.Option(50, "--chats", "-c", help="Concurrent chats"),
+    messages: int = typer.Option(5, "--messages", "-n", help="Messages per chat"),
+    latency: float = typer.Option(50.0, "--latency", help="Simulated LLM latency per call (ms)"),
+    jitter: float = typer.Option(0.0, "--jitter", help="Extra random LLM latency per call (ms)"),
+    concurrency: int = typer.Option(16, "--concurrency", help="Agent max concurrent turns"),
+    script: Path | None = typer.Option(None, "--script", help="JSONL/YAML trace file for the scripted provider"),
+    baseline: Path | None = typer.Option(
+        None, "--baseline", help="Baseline JSON (default: ~/.nanobot/bench/agent-baseline.json)",
+    ),
+    save_baseline: bool = typer.Option(False, "--save-baseline", help="Store this run as the new baseline"),
+    tolerance: float = typer.Option(0.25, "--tolerance", help="Allowed relative regression"),
+):
+    """Measure agent loop throughput, latency, event-loop lag and RSS."""
+    import json
+
+    from loguru import logger
+
+    from nanobot.bench.agent import baseline_mismatch, compare_to_baseline, run_agent_bench
+    from nanobot.config.loader import get_data_dir
+
+    logger.disable("nanobot")
+    result = asyncio.run(run_agent_bench(
+        chats=chats, messages_per_chat=messages, latency_ms=latency, jitter_ms=jitter,
+        max_concurrent_turns=concurrency, script_path=script,
+    ))
+
+    table = Table(title=f"Agent benchmark ({result.messages} messages)")
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", justify="right")
+    table.add_row("Duration", f"{result.duration_s:.2f} s")
+    table.add_row("Throughput", f"{result.messages_per_sec:.1f} msg/s")
+    for q in ("p50", "p95", "p99"):
+        table.add_row(f"Turn latency {q}", f"{result.latency_ms[q]:.1f} ms")
+    table.add_row("Event-loop lag p99", f"{result.loop_lag_ms['p99']:.2f} ms")
+    table.add_row("Event-loop lag max", f"{result.loop_lag_ms['max']:.2f} ms")
+    table.add_row("Peak RSS", f"{result.peak_rss_mb} MB" if result.peak_rss_mb is not None else "n/a")
+    table.add_row("Calibration workload", f"{result.calibration_ms:.1f} ms")
+    for name, ms in result.phases_p50_ms.items():
+        table.add_row(f"[dim]{name} p50[/dim]", f"[dim]{ms:.2f} ms[/dim]")
+    console.print(table)
+
+    baseline_path = baseline or get_data_dir() / "bench" / "agent-baseline.json"
+    if save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(result.to_dict(), indent=2) + "\n", encoding="utf-8")
+        console.print(f"[green]✓[/green] Baseline saved to {baseline_path}")
+        return
+    if not baseline_path.exists():
+        console.print(f"[dim]No baseline at {baseline_path}; use --save-baseline to create one.[/dim]")
+        return
+    stored = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if mismatch := baseline_mismatch(result, stored):
+        console.print(f"[yellow]Baseline not compared: {mismatch}.[/yellow]")
+        return
+    problems = compare_to_baseline(result, stored, tolerance)
+    if problems:
+        for problem in problems:
+            console.print(f"[red]Regression:[/red] {problem}")
+        raise typer.Exit(1)
+    console.print(f"[green]✓[/green] Within {tolerance:.0%} of baseline")
+
+
+@bench_app.command("bus")
+def bench_bus(
+    messages: int = typer.Option(10_000, "--messages", "-n", help="Messages to publish"),
+    producers: int = typer.Option(16, "--producers", "-p", help="Concurrent publishers"),
+):
+    """Compare in-memory and durable (SQLite) bus throughput."""
+    from loguru import logger
+
+    from nanobot.bench.bus import run_bus_bench
+
+    logger.disable("nanobot")
+    table = Table(title=f"Message bus benchmark ({messages} messages, {producers} producers)")
+    table.add_column("Backend", style="cyan")
+    table.add_column("Throughput", justify="right")
+    table.add_column("Publish p50", justify="right")
+    table.add_column("Publish p99", justify="right")
+    for backend, sync in (("memory", "full"), ("sqlite", "normal"), ("sqlite", "full")):
+        r = asyncio.run(run_bus_bench(backend, messages=messages, producers=producers, sync=sync))
+        table.add_row(
+            r["backend"], f"{r['messages_per_sec']:.0f} msg/s",
+            f"{r['publish_p50_ms']:.3f} ms", f"{r['publish_p99_ms']:.3f} ms",
+        )
+    console.print(table)
+
+
+@bench_app.command("sessions")
+def bench_sessions(
+    messages: int = typer.Option(5000, "--messages", "-n", help="Messages in the session"),
+    size: int = typer.Option(400, "--size", help="Characters per message"),
+    tail: int = typer.Option(50, "--tail", help="Messages read by get_history"),
+):
+    """Compare disk size, load time and tail reads of the session backends."""
+    from nanobot.bench.sessions import run_session_bench
+
+    table = Table(title=f"Session storage ({messages} messages of {size} chars, tail {tail})")
+    table.add_column("Backend", style="cyan")
+    table.add_column("Disk", justify="right")
+    table.add_column("Full load", justify="right")
+    table.add_column("Tail read", justify="right")
+    table.add_column("Append 2", justify="right")
+    for r in run_session_bench(messages=messages, size=size, tail=tail):
+        table.add_row(
+            r["backend"], f"{r['bytes'] / 1024:.0f} KB", f"{r['load_ms']:.1f} ms",
+            f"{r['tail_ms']:.2f} ms", f"{r['append_ms']:.2f} ms",
+        )
+    console.print(table)
+
+
+@bench_app.command("idle")
+def bench_idle(
+    consumers: int = typer.Option(3, "--consumers", "-c", help="Idle bus consumers"),
+    seconds: float = typer.Option(5.0, "--seconds", "-s", help="Idle period"),
+):
+    """Compare idle CPU, wakeups and shutdown time of polling and streaming consumers."""
+    from nanobot.bench.idle import run_idle_bench
+
+    table = Table(title=f"Idle consumers ({consumers} consumers, {seconds:g}s idle)")
+    table.add_column("Mode", style="cyan")
+    table.add_column("CPU", justify="right")
+    table.add_column("Wakeups", justify="right")
+    table.add_column("Delivery", justify="right")
+    table.add_column("Shutdown", justify="right")
+    for mode in ("poll", "stream"):
+        r = asyncio.run(run_idle_bench(mode, consumers=consumers, seconds=seconds))
+        table.add_row(
+            r["mode"], f"{r['cpu_ms_per_s']:.3f} ms/s", f"{r['wakeups_per_s']:.2f}/s",
+            f"{r['deliver_max_ms']:.3f} ms", f"{r['shutdown_ms']:.1f} ms",
+        )
+    console.print(table)
+
+
 # ============================================================================
 # OAuth Login
 # ============================================================================
@@ -177,6 +177,12 @@ class ChannelsConfig(Base):
     email: EmailConfig = Field(default_factory=EmailConfig)
     slack: SlackConfig = Field(default_factory=SlackConfig)
     qq: QQConfig = Field(default_factory=QQConfig)
+    outbound_workers: int = 4  # Concurrent senders per channel; one chat always uses the same sender
+    outbound_queue_size: int = 100  # Queued outbound messages per channel before overflow handling
+    outbound_put_timeout: float = 5.0  # Seconds a full queue may hold up a reply before it is dropped
+    coalesce_window_ms: int = 0  # Merge a sender's messages arriving within this window into one turn (0 = off)
+    coalesce_max_wait_ms: int = 5000  # Longest a burst is held back, however often the window restarts
+    coalesce_max_messages: int = 10  # Messages after which a burst is sent right away
 
 
 class AgentDefaults(Base):
@@ -188,6 +194,15 @@ class AgentDefaults(Base):
     temperature: float = 0.7
     max_tool_iterations: int = 20
     memory_window: int = 50
+    max_concurrent_turns: int = 4  # Sessions processed in parallel; turns within a session stay ordered
+    max_parallel_tools: int = 4  # Read-only tool calls of one LLM response executed concurrently
+    stream: bool = False  # Forward LLM text deltas to channels while the response is generated
+    prompt_layout: str = "legacy"  # "legacy" | "stable" (cache-friendly: time/session/memory after history)
+    context_window_tokens: int = 0  # Model context size; > 0 trims history by token budget instead of count only
+    context_windows: dict[str, int] = Field(default_factory=dict)  # Per-model context size, e.g. {"openai/gpt-4o": 128000}; overrides context_window_tokens
+    history_reserve_tokens: int = 8000  # Kept free for the system prompt, tools and the current message
+    turn_policy: str = "queue"  # "queue" | "supersede" (a new message cancels the running turn of its session)
+    turn_metrics: bool = False  # Append per-turn latency records to ~/.nanobot/metrics/turns.jsonl
 
 
 class AgentsConfig(Base):
@@ -226,6 +241,30 @@ class ProvidersConfig(Base):
     github_copilot: ProviderConfig = Field(default_factory=ProviderConfig)  # Github Copilot (OAuth)
 
 
+class AdmissionConfig(Base):
+    """Admission control for inbound messages (every limit is off at 0)."""
+
+    max_queue_depth: int = 0  # Reject while this many messages wait on the bus
+    sender_rate_per_minute: float = 0.0  # Sustained messages per sender and channel
+    sender_burst: int = 5  # Messages a sender may send at once before the rate applies
+    max_estimated_wait_s: float = 0.0  # Reject when the backlog would take longer to drain
+    busy_message: str = "I'm handling a lot of requests right now. Please try again in a moment."
+
+
+class BusConfig(Base):
+    """Message bus configuration."""
+
+    backend: str = "memory"  # "memory" | "sqlite" (queued messages survive restarts)
+    path: str = ""  # SQLite file for the sqlite backend; defaults to ~/.nanobot/bus/queue.db
+    sync: str = "full"  # "full" fsyncs every group commit; "normal" survives process but not OS crashes
+    lanes: dict[str, int] = Field(default_factory=lambda: {"interactive": 8, "system": 4, "background": 1})  # Lane weights
+    fair_key: str = "tenant_id"  # Inbound metadata key whose values share a lane fairly
+    tenant_weights: dict[str, int] = Field(default_factory=dict)  # Per fair_key value weight (default 1)
+    admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
+    workers: int = 0  # Agent worker processes started by `nanobot gateway` (0 = everything in one process)
+    socket: str = ""  # Unix socket of the bus broker; defaults to ~/.nanobot/bus/broker.sock
+
+
 class GatewayConfig(Base):
     """Gateway/server configuration."""
 
@@ -252,6 +291,13 @@ class ExecToolConfig(Base):
     timeout: int = 60
 
 
+class ToolOffloadConfig(Base):
+    """Large tool result offloading configuration."""
+
+    threshold: int = 8000  # Results longer than this (chars) are stored and previewed; 0 disables
+    preview_chars: int = 2000  # Head + tail characters kept inline
+
+
 class MCPServerConfig(Base):
     """MCP server connection configuration (stdio or HTTP)."""
 
@@ -267,10 +313,26 @@ class ToolsConfig(Base):
 
     web: WebToolsConfig = Field(default_factory=WebToolsConfig)
     exec: ExecToolConfig = Field(default_factory=ExecToolConfig)
+    offload: ToolOffloadConfig = Field(default_factory=ToolOffloadConfig)
     restrict_to_workspace: bool = False  # If true, restrict all tool access to workspace directory
     mcp_servers: dict[str, MCPServerConfig] = Field(default_factory=dict)
 
 
+class SessionsConfig(Base):
+    """Conversation session storage configuration."""
+
+    cache_max_sessions: int = 1000  # Sessions kept in memory; least recently used ones are reloaded from disk
+    cache_max_mb: int = 256  # Estimated memory budget of cached sessions
+    backend: str = "jsonl"  # "jsonl" or "msgpack" (one file per session), or "sqlite" (one WAL database)
+    path: str = ""  # SQLite database file (default: <workspace>/sessions/sessions.db)
+    write_behind: bool = True  # Save sessions on a writer thread instead of the event loop
+    write_window_ms: int = 50  # Saves of one session within this window are written once
+    archive_after_days: int = 30  # Compress sessions idle this long into the archive (0 disables)
+    archive_consolidated_after_days: int = 7  # Same, for sessions whose messages are all consolidated into memory
+    archive_codec: str = "gzip"  # "gzip" or "zstd" (needs the zstandard package)
+    archive_interval_hours: int = 6  # How often a single-process gateway looks for idle sessions
+
+
 class Config(BaseSettings):
     """Root configuration for nanobot."""
 
@@ -278,6 +340,8 @@ class Config(BaseSettings):
     channels: ChannelsConfig = Field(default_factory=ChannelsConfig)
     providers: ProvidersConfig = Field(default_factory=ProvidersConfig)
     gateway: GatewayConfig = Field(default_factory=GatewayConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
+    sessions: SessionsConfig = Field(default_factory=SessionsConfig)
     tools: ToolsConfig = Field(default_factory=ToolsConfig)
 
     @property
@@ -332,6 +396,11 @@ class Config(BaseSettings):
         _, name = self._match_provider(model)
         return name
 
+    def get_context_window(self, model: str | None = None) -> int:
+        """Context size of a model for history budgeting (0: no token budget)."""
+        defaults = self.agents.defaults
+        return defaults.context_windows.get(model or defaults.model, defaults.context_window_tokens)
+
     def get_api_key(self, model: str | None = None) -> str | None:
         """Get API key for the given model. Falls back to first available key."""
         p = self.get_provider(model)
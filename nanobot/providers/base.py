@@ -2,7 +2,10 @@
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Awaitable, Callable
+
+# Receives each text fragment as soon as the provider produces it.
+DeltaCallback = Callable[[str], Awaitable[None]]
 
 
 @dataclass
@@ -64,6 +67,37 @@ class LLMProvider(ABC):
         """
         pass
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        on_delta: DeltaCallback | None = None,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request, forwarding text deltas as they arrive.
+
+        Providers without a streaming transport fall back to ``chat`` and emit
+        the whole content as a single delta.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions.
+            model: Model identifier (provider-specific).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+            on_delta: Optional callback receiving each content fragment.
+
+        Returns:
+            The complete LLMResponse, identical to what ``chat`` would return.
+        """
+        response = await self.chat(messages, tools, model, max_tokens, temperature)
+        if on_delta and response.content and response.finish_reason != "error":
+            await on_delta(response.content)
+        return response
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
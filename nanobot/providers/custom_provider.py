@@ -7,7 +7,7 @@ from typing import Any
 import json_repair
 from openai import AsyncOpenAI
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import DeltaCallback, LLMProvider, LLMResponse, ToolCallRequest
 
 
 class CustomProvider(LLMProvider):
@@ -17,17 +17,66 @@ class CustomProvider(LLMProvider):
         self.default_model = default_model
         self._client = AsyncOpenAI(api_key=api_key, base_url=api_base)
 
-    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
-                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
+    def _kwargs(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None,
+                model: str | None, max_tokens: int, temperature: float) -> dict[str, Any]:
         kwargs: dict[str, Any] = {"model": model or self.default_model, "messages": messages,
                                   "max_tokens": max(1, max_tokens), "temperature": temperature}
         if tools:
             kwargs.update(tools=tools, tool_choice="auto")
+        return kwargs
+
+    async def chat(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                   model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7) -> LLMResponse:
+        kwargs = self._kwargs(messages, tools, model, max_tokens, temperature)
         try:
             return self._parse(await self._client.chat.completions.create(**kwargs))
         except Exception as e:
             return LLMResponse(content=f"Error: {e}", finish_reason="error")
 
+    async def chat_stream(self, messages: list[dict[str, Any]], tools: list[dict[str, Any]] | None = None,
+                          model: str | None = None, max_tokens: int = 4096, temperature: float = 0.7,
+                          on_delta: DeltaCallback | None = None) -> LLMResponse:
+        kwargs = self._kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs.update(stream=True, stream_options={"include_usage": True})
+        try:
+            return await self._consume_stream(await self._client.chat.completions.create(**kwargs), on_delta)
+        except Exception as e:
+            return LLMResponse(content=f"Error: {e}", finish_reason="error")
+
+    async def _consume_stream(self, stream: Any, on_delta: DeltaCallback | None) -> LLMResponse:
+        content: list[str] = []
+        reasoning: list[str] = []
+        calls: dict[int, dict[str, str]] = {}  # index -> {"id", "name", "arguments"}
+        finish_reason, usage = "stop", {}
+        async for chunk in stream:
+            if chunk.usage:
+                usage = _usage(chunk.usage)
+            if not chunk.choices:
+                continue
+            choice = chunk.choices[0]
+            delta = choice.delta
+            if delta.content:
+                content.append(delta.content)
+                if on_delta:
+                    await on_delta(delta.content)
+            if text := getattr(delta, "reasoning_content", None):
+                reasoning.append(text)
+            for tc in delta.tool_calls or []:
+                buf = calls.setdefault(tc.index, {"id": "", "name": "", "arguments": ""})
+                buf["id"] = tc.id or buf["id"]
+                if tc.function:
+                    buf["name"] += tc.function.name or ""
+                    buf["arguments"] += tc.function.arguments or ""
+            finish_reason = choice.finish_reason or finish_reason
+        tool_calls = [
+            ToolCallRequest(id=buf["id"], name=buf["name"], arguments=json_repair.loads(buf["arguments"] or "{}"))
+            for _, buf in sorted(calls.items())
+        ]
+        return LLMResponse(
+            content="".join(content) or None, tool_calls=tool_calls, finish_reason=finish_reason,
+            usage=usage, reasoning_content="".join(reasoning) or None,
+        )
+
     def _parse(self, response: Any) -> LLMResponse:
         choice = response.choices[0]
         msg = choice.message
@@ -39,9 +88,17 @@ class CustomProvider(LLMProvider):
         u = response.usage
         return LLMResponse(
             content=msg.content, tool_calls=tool_calls, finish_reason=choice.finish_reason or "stop",
-            usage={"prompt_tokens": u.prompt_tokens, "completion_tokens": u.completion_tokens, "total_tokens": u.total_tokens} if u else {},
+            usage=_usage(u),
             reasoning_content=getattr(msg, "reasoning_content", None),
         )
 
     def get_default_model(self) -> str:
         return self.default_model
+
+
+def _usage(u: Any) -> dict[str, int]:
+    if not u:
+        return {}
+    details = getattr(u, "prompt_tokens_details", None)
+    return {"prompt_tokens": u.prompt_tokens, "completion_tokens": u.completion_tokens, "total_tokens": u.total_tokens,
+            "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details else 0}
@@ -8,7 +8,7 @@ from typing import Any
 import litellm
 from litellm import acompletion
 
-from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from nanobot.providers.base import DeltaCallback, LLMProvider, LLMResponse, ToolCallRequest
 from nanobot.providers.registry import find_by_model, find_gateway
 
 
@@ -115,22 +115,39 @@ class LiteLLMProvider(LLMProvider):
         spec = find_by_model(model)
         return spec is not None and spec.supports_prompt_caching
 
+    @staticmethod
+    def _with_cache_control(msg: dict[str, Any]) -> dict[str, Any]:
+        """Return a copy of msg whose last content block carries an ephemeral breakpoint."""
+        content = msg.get("content")
+        if isinstance(content, str):
+            new_content = [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
+        else:
+            new_content = list(content)
+            new_content[-1] = {**new_content[-1], "cache_control": {"type": "ephemeral"}}
+        return {**msg, "content": new_content}
+
     def _apply_cache_control(
         self,
         messages: list[dict[str, Any]],
         tools: list[dict[str, Any]] | None,
     ) -> tuple[list[dict[str, Any]], list[dict[str, Any]] | None]:
-        """Return copies of messages and tools with cache_control injected."""
+        """
+        Return copies of messages and tools with cache_control injected.
+
+        Breakpoints (Anthropic allows four) go on the system prompt, the tool
+        list, the end of the conversation history before the current user
+        message (reused by the next turn) and the last message (reused by the
+        next tool iteration of this turn).
+        """
+        last_user = max((i for i, m in enumerate(messages) if m.get("role") == "user"), default=-1)
+        breakpoints = {len(messages) - 1}
+        if last_user > 0:
+            breakpoints.add(last_user - 1)
+
         new_messages = []
-        for msg in messages:
-            if msg.get("role") == "system":
-                content = msg["content"]
-                if isinstance(content, str):
-                    new_content = [{"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}]
-                else:
-                    new_content = list(content)
-                    new_content[-1] = {**new_content[-1], "cache_control": {"type": "ephemeral"}}
-                new_messages.append({**msg, "content": new_content})
+        for i, msg in enumerate(messages):
+            if msg.get("role") == "system" or (i in breakpoints and msg.get("content")):
+                new_messages.append(self._with_cache_control(msg))
             else:
                 new_messages.append(msg)
 
@@ -163,27 +180,15 @@ class LiteLLMProvider(LLMProvider):
             sanitized.append(clean)
         return sanitized
 
-    async def chat(
+    def _build_kwargs(
         self,
         messages: list[dict[str, Any]],
-        tools: list[dict[str, Any]] | None = None,
-        model: str | None = None,
-        max_tokens: int = 4096,
-        temperature: float = 0.7,
-    ) -> LLMResponse:
-        """
-        Send a chat completion request via LiteLLM.
-        
-        Args:
-            messages: List of message dicts with 'role' and 'content'.
-            tools: Optional list of tool definitions in OpenAI format.
-            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
-            max_tokens: Maximum tokens in response.
-            temperature: Sampling temperature.
-        
-        Returns:
-            LLMResponse with content and/or tool calls.
-        """
+        tools: list[dict[str, Any]] | None,
+        model: str | None,
+        max_tokens: int,
+        temperature: float,
+    ) -> dict[str, Any]:
+        """Build the acompletion keyword arguments shared by chat and chat_stream."""
         original_model = model or self.default_model
         model = self._resolve_model(original_model)
 
@@ -220,6 +225,31 @@ class LiteLLMProvider(LLMProvider):
             kwargs["tools"] = tools
             kwargs["tool_choice"] = "auto"
         
+        return kwargs
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """
+        Send a chat completion request via LiteLLM.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions in OpenAI format.
+            model: Model identifier (e.g., 'anthropic/claude-sonnet-4-5').
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Returns:
+            LLMResponse with content and/or tool calls.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+
         try:
             response = await acompletion(**kwargs)
             return self._parse_response(response)
@@ -230,6 +260,43 @@ class LiteLLMProvider(LLMProvider):
                 finish_reason="error",
             )
     
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+        on_delta: DeltaCallback | None = None,
+    ) -> LLMResponse:
+        """
+        Stream a chat completion via LiteLLM, forwarding content deltas.
+
+        Chunks are reassembled with ``litellm.stream_chunk_builder`` so tool
+        calls, usage and reasoning content match the non-streaming response.
+        """
+        kwargs = self._build_kwargs(messages, tools, model, max_tokens, temperature)
+        kwargs["stream"] = True
+        kwargs["stream_options"] = {"include_usage": True}
+
+        try:
+            chunks = []
+            async for chunk in await acompletion(**kwargs):
+                chunks.append(chunk)
+                delta = chunk.choices[0].delta if chunk.choices else None
+                text = getattr(delta, "content", None) if delta else None
+                if text and on_delta:
+                    await on_delta(text)
+            response = litellm.stream_chunk_builder(chunks, messages=kwargs["messages"])
+            if response is None:
+                return LLMResponse(content=None, finish_reason="stop")
+            return self._parse_response(response)
+        except Exception as e:
+            return LLMResponse(
+                content=f"Error calling LLM: {str(e)}",
+                finish_reason="error",
+            )
+
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse LiteLLM response into our standard format."""
         choice = response.choices[0]
@@ -255,6 +322,7 @@ class LiteLLMProvider(LLMProvider):
                 "prompt_tokens": response.usage.prompt_tokens,
                 "completion_tokens": response.usage.completion_tokens,
                 "total_tokens": response.usage.total_tokens,
+                "cached_tokens": self._cached_tokens(response.usage),
             }
         
         reasoning_content = getattr(message, "reasoning_content", None)
@@ -267,6 +335,15 @@ class LiteLLMProvider(LLMProvider):
             reasoning_content=reasoning_content,
         )
     
+    @staticmethod
+    def _cached_tokens(usage: Any) -> int:
+        """Prompt tokens served from the provider cache (OpenAI- or Anthropic-style usage)."""
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details else None
+        if cached is None:
+            cached = getattr(usage, "cache_read_input_tokens", None)
+        return int(cached or 0)
+
     def get_default_model(self) -> str:
         """Get the default model."""
         return self.default_model
@@ -0,0 +1,107 @@
+"""Scripted provider: replays recorded LLM responses without calling a model."""
+
+import asyncio
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+from nanobot.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+
+# Default trace: look around the workspace once, then answer.
+DEFAULT_SCRIPT: list[list[dict[str, Any]]] = [[
+    {"tool_calls": [{"name": "list_dir", "arguments": {"path": "."}}]},
+    {"content": "Done."},
+]]
+
+
+class ScriptedProvider(LLMProvider):
+    """
+    Drop-in LLM provider that replays tool-call traces with simulated latency.
+
+    A script is a list of traces; a trace is the list of responses for one
+    turn. Each step may carry ``content``, ``tool_calls`` (name + arguments),
+    ``usage`` and a ``latency_ms`` override. The trace is picked by the number
+    of user messages in the conversation and the step by the number of
+    assistant messages since the last user message, so replay is
+    deterministic no matter how concurrent turns interleave.
+    """
+
+    def __init__(
+        self,
+        script: list[list[dict[str, Any]]] | None = None,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        seed: int = 0,
+        default_model: str = "scripted",
+    ):
+        super().__init__(api_key=None, api_base=None)
+        self.script = script or DEFAULT_SCRIPT
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.default_model = default_model
+        self.calls = 0
+        self._random = random.Random(seed)
+
+    @classmethod
+    def from_file(cls, path: Path, **kwargs: Any) -> "ScriptedProvider":
+        """
+        Load a script from a JSONL file (one trace per line) or a YAML file
+        (a list of traces). A trace may also be given as ``{"steps": [...]}``.
+        """
+        text = path.read_text(encoding="utf-8")
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("YAML scripts require PyYAML: pip install pyyaml") from None
+            traces = yaml.safe_load(text) or []
+        else:
+            traces = [json.loads(line) for line in text.splitlines() if line.strip()]
+        script = [t["steps"] if isinstance(t, dict) else t for t in traces]
+        return cls(script=script, **kwargs)
+
+    def _step(self, messages: list[dict[str, Any]]) -> dict[str, Any]:
+        users = [i for i, m in enumerate(messages) if m.get("role") == "user"]
+        trace = self.script[max(0, len(users) - 1) % len(self.script)]
+        after = messages[users[-1] + 1:] if users else messages
+        index = sum(1 for m in after if m.get("role") == "assistant")
+        return trace[min(index, len(trace) - 1)]
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        self.calls += 1
+        step = self._step(messages)
+
+        latency = step.get("latency_ms", self.latency_ms)
+        if self.jitter_ms:
+            latency += self._random.uniform(0, self.jitter_ms)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+        tool_calls = [
+            ToolCallRequest(id=f"call_{self.calls}_{i}", name=tc["name"], arguments=tc.get("arguments", {}))
+            for i, tc in enumerate(step.get("tool_calls", []))
+        ]
+        prompt_tokens = sum(len(str(m.get("content") or "")) for m in messages) // 4
+        usage = step.get("usage") or {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(step.get("content") or "") // 4,
+            "total_tokens": prompt_tokens + len(step.get("content") or "") // 4,
+            "cached_tokens": 0,
+        }
+        return LLMResponse(
+            content=step.get("content"),
+            tool_calls=tool_calls,
+            finish_reason="tool_calls" if tool_calls else "stop",
+            usage=usage,
+        )
+
+    def get_default_model(self) -> str:
+        return self.default_model
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import math
 from http import HTTPStatus
 from typing import Any
 from uuid import uuid4
@@ -13,8 +14,9 @@ from aiohttp.web import Request, Response, json_response
 from loguru import logger
 
 from nanobot.agent.loop import AgentLoop
-from nanobot.bus.events import InboundMessage
+from nanobot.bus.events import InboundMessage, OutboundMessage
 from nanobot.bus.queue import MessageBus
+from nanobot.channels.coalesce import InboundCoalescer
 from nanobot.cron.service import CronService
 from nanobot.heartbeat.service import HeartbeatService
 
@@ -35,6 +37,9 @@ class TeamsInboundRelayServer:
         internal_token: str = "",
         teams_proactive_url: str = "",
         teams_internal_token: str = "",
+        coalesce_window_ms: int = 0,
+        coalesce_max_wait_ms: int = 5000,
+        coalesce_max_messages: int = 10,
     ):
         self.bus = bus
         self.agent = agent
@@ -48,12 +53,19 @@ class TeamsInboundRelayServer:
         self.teams_internal_token = teams_internal_token
 
         self._running = False
-        self._pending: dict[str, asyncio.Future[str]] = {}
+        self._pending: dict[str, asyncio.Future[OutboundMessage]] = {}
         self._agent_task: asyncio.Task | None = None
         self._outbound_task: asyncio.Task | None = None
         self._runner: web.AppRunner | None = None
         self._site: web.TCPSite | None = None
         self._http = httpx.AsyncClient(timeout=15.0)
+        self._coalescer = InboundCoalescer(
+            self.bus.publish_inbound,
+            window_ms=coalesce_window_ms,
+            max_wait_ms=coalesce_max_wait_ms,
+            max_messages=coalesce_max_messages,
+            on_merge=self._on_merge,
+        ) if coalesce_window_ms > 0 else None
 
     def _auth_ok(self, req: Request) -> bool:
         if not self.internal_token:
@@ -80,33 +92,96 @@ class TeamsInboundRelayServer:
             return Response(status=HTTPStatus.BAD_REQUEST, text="chat_id/content required")
 
         metadata["request_id"] = request_id
+        msg = InboundMessage(
+            channel=channel,
+            sender_id=sender_id,
+            chat_id=chat_id,
+            content=content,
+            metadata=metadata,
+        )
+        try:
+            deadline_s = float(data["deadline_ms"]) / 1000 if data.get("deadline_ms") else None
+        except (TypeError, ValueError):
+            return Response(status=HTTPStatus.BAD_REQUEST, text="invalid deadline_ms")
+        rejection = self.bus.admit(msg, deadline_s)
+        if rejection:
+            retry_after = math.ceil(rejection.retry_after)
+            logger.warning("Relay rejecting request {}: {}", request_id, rejection.reason)
+            return json_response(
+                {"status": "busy", "reason": rejection.reason, "request_id": request_id,
+                 "retry_after": retry_after},
+                status=HTTPStatus.TOO_MANY_REQUESTS,
+                headers={"Retry-After": str(retry_after)},
+            )
+
         fut = asyncio.get_running_loop().create_future()
         self._pending[request_id] = fut
-
-        await self.bus.publish_inbound(
-            InboundMessage(
-                channel=channel,
-                sender_id=sender_id,
-                chat_id=chat_id,
-                content=content,
-                metadata=metadata,
-            )
-        )
+        if self._coalescer:
+            await self._coalescer.submit(msg)
+        else:
+            await self.bus.publish_inbound(msg)
 
         try:
-            response_text = await asyncio.wait_for(fut, timeout=self.inbound_timeout_sec)
+            response = await self._wait_for_response(req, fut)
+            if response.metadata.get("_cancelled"):
+                return json_response({"status": "cancelled", "request_id": request_id})
+            if merged_into := response.metadata.get("_merged_into"):
+                return json_response(
+                    {"status": "merged", "request_id": request_id, "merged_into": merged_into}
+                )
             return json_response(
-                {"status": "ok", "content": response_text, "request_id": request_id}
+                {"status": "ok", "content": response.content, "request_id": request_id}
             )
         except asyncio.TimeoutError:
             self._pending.pop(request_id, None)
             return json_response({"status": "accepted", "request_id": request_id})
+        except (ConnectionResetError, asyncio.CancelledError) as e:
+            # Nobody is waiting for the answer any more: stop the turn instead of finishing it
+            self._pending.pop(request_id, None)
+            logger.info("Relay client disconnected, cancelling request {}", request_id)
+            self.agent.cancel_request(request_id)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            return Response(status=HTTPStatus.REQUEST_TIMEOUT, text="client disconnected")
         finally:
             if fut.done():
                 self._pending.pop(request_id, None)
 
+    def _on_merge(self, messages: list[InboundMessage], merged: InboundMessage) -> None:
+        """Answer the requests folded into a merged message; its last request gets the reply."""
+        merged_into = merged.metadata.get("request_id")
+        for msg in messages[:-1]:
+            fut = self._pending.get(msg.metadata.get("request_id", ""))
+            if fut and not fut.done():
+                fut.set_result(OutboundMessage(
+                    channel=msg.channel, chat_id=msg.chat_id, content="",
+                    metadata={"_merged_into": merged_into},
+                ))
+
+    async def _wait_for_response(
+        self, req: Request, fut: asyncio.Future[OutboundMessage]
+    ) -> OutboundMessage:
+        """Wait for the agent's response, watching for the client to disconnect."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.inbound_timeout_sec
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            done, _ = await asyncio.wait({fut}, timeout=min(remaining, 0.5))
+            if done:
+                return fut.result()
+            if req.transport is None or req.transport.is_closing():
+                raise ConnectionResetError("client disconnected")
+
     async def _healthz(self, _: Request) -> Response:
-        return json_response({"status": "ok"})
+        sessions = self.agent.sessions
+        return json_response({
+            "status": "ok",
+            "sessions": sessions.cache_stats(),
+            "session_writes": sessions.storage_stats(),
+            "session_archive": sessions.archive.stats() if sessions.archive else None,
+        })
 
     async def _send_proactive(self, *, chat_id: str, content: str, request_id: str = "") -> None:
         if not self.teams_proactive_url:
@@ -124,31 +199,33 @@ class TeamsInboundRelayServer:
             logger.error("Failed to send proactive to Teams backend: {}", e)
 
     async def _outbound_loop(self) -> None:
-        while self._running:
+        async for msg in self.bus.outbound_stream():
             try:
-                msg = await asyncio.wait_for(self.bus.consume_outbound(), timeout=1.0)
-            except asyncio.TimeoutError:
-                continue
-            except asyncio.CancelledError:
-                break
-
-            meta = msg.metadata or {}
-            if meta.get("_progress"):
-                continue
-
-            request_id = str(meta.get("request_id", "")).strip()
-            if request_id and request_id in self._pending:
-                fut = self._pending[request_id]
-                if not fut.done():
-                    fut.set_result(msg.content)
-                continue
-
-            if msg.channel == "teams":
-                await self._send_proactive(
-                    chat_id=msg.chat_id,
-                    content=msg.content,
-                    request_id=request_id,
-                )
+                await self._route_outbound(msg)
+            finally:
+                self.bus.ack(msg)
+
+    async def _route_outbound(self, msg: OutboundMessage) -> None:
+        meta = msg.metadata or {}
+        if meta.get("_progress") or meta.get("_stream"):
+            return
+
+        request_id = str(meta.get("request_id", "")).strip()
+        if request_id and request_id in self._pending:
+            fut = self._pending[request_id]
+            if not fut.done():
+                fut.set_result(msg)
+            return
+
+        if meta.get("_cancelled"):
+            return
+
+        if msg.channel == "teams":
+            await self._send_proactive(
+                chat_id=msg.chat_id,
+                content=msg.content,
+                request_id=request_id,
+            )
 
     async def start(self) -> None:
         if self._running:
@@ -172,6 +249,8 @@ class TeamsInboundRelayServer:
     async def stop(self) -> None:
         self._running = False
 
+        if self._coalescer:
+            await self._coalescer.flush_all()
         self.heartbeat.stop()
         self.cron.stop()
         self.agent.stop()
@@ -182,8 +261,9 @@ class TeamsInboundRelayServer:
         if tasks:
             await asyncio.gather(*tasks, return_exceptions=True)
 
-        await self.agent.close_mcp()
+        await self.agent.close()
         await self._http.aclose()
+        await self.bus.close()
 
         if self._runner:
             await self._runner.cleanup()
@@ -1,5 +1,17 @@
 """Session management module."""
 
-from nanobot.session.manager import SessionManager, Session
+from nanobot.session.archive import SessionArchive, SessionArchiver
+from nanobot.session.binary import MsgpackSessionStore
+from nanobot.session.manager import Session, SessionManager
+from nanobot.session.store import JsonlSessionStore, SessionStore, SqliteSessionStore
 
-__all__ = ["SessionManager", "Session"]
+__all__ = [
+    "SessionManager",
+    "Session",
+    "SessionStore",
+    "JsonlSessionStore",
+    "SqliteSessionStore",
+    "MsgpackSessionStore",
+    "SessionArchive",
+    "SessionArchiver",
+]
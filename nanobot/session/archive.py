@@ -0,0 +1,256 @@
+"""Archive of idle sessions: compressed segments restored on demand."""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from loguru import logger
+
+from nanobot.session.store import _metadata_record, parse_jsonl_session
+from nanobot.utils.helpers import ensure_dir
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from nanobot.session.manager import Session, SessionManager
+
+_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        if not ZSTD_AVAILABLE:
+            raise RuntimeError("zstandard is not installed; pip install zstandard to restore this session")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def _encode(session: Session) -> bytes:
+    """A session in the JSONL layout: one metadata line, then one line per message."""
+    lines = [json.dumps(_metadata_record(session), ensure_ascii=False)]
+    lines.extend(json.dumps(m, ensure_ascii=False) for m in session.messages)
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def encode_session(session: Session, codec: str = "gzip") -> tuple[bytes, dict[str, Any]]:
+    """Compress a session into an archive frame; returns it with its index entry (minus the placement)."""
+    raw = _encode(session)
+    frame = _compress(raw, codec)
+    return frame, {
+        "length": len(frame),
+        "codec": codec,
+        "raw_bytes": len(raw),
+        "messages": len(session.messages),
+        "updated_at": session.updated_at.isoformat(),
+    }
+
+
+def is_archivable(session: Session, idle: timedelta, idle_days: float, consolidated_idle_days: float) -> bool:
+    """Whether a session idle for ``idle`` is due for the archive (fully consolidated ones sooner)."""
+    consolidated = session.last_consolidated >= len(session.messages)
+    return idle >= timedelta(days=consolidated_idle_days if consolidated else idle_days)
+
+
+class SessionArchive:
+    """
+    Compressed copies of idle sessions, kept out of the live session store.
+
+    Sessions are archived in batches. Each batch is written to one segment
+    file with one compressed frame per session (a gzip member or a zstd
+    frame), and ``index.json`` maps each key to its segment, offset and
+    length, so restoring a session reads and decompresses only its frame.
+    A segment is deleted once none of its sessions is left in the index.
+    """
+
+    def __init__(self, archive_dir: Path, codec: str = "gzip"):
+        if codec not in _SUFFIXES:
+            raise ValueError(f"Unknown archive codec: {codec}")
+        if codec == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard is not installed, archiving sessions with gzip")
+            codec = "gzip"
+        self.archive_dir = archive_dir
+        self.codec = codec
+        self._lock = threading.Lock()
+        self._index: dict[str, dict[str, Any]] | None = None
+
+    @property
+    def index_path(self) -> Path:
+        return self.archive_dir / "index.json"
+
+    def _entries(self) -> dict[str, dict[str, Any]]:
+        if self._index is None:
+            try:
+                self._index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._index = {}
+            except Exception as e:
+                logger.error("Unreadable session archive index {}: {}", self.index_path, e)
+                raise
+        return self._index
+
+    def _save_index(self) -> None:
+        tmp = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.index_path)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._entries()
+
+    def keys(self) -> list[str]:
+        with self._lock:
+            return list(self._entries())
+
+    def put_many(self, sessions: list[Session]) -> int:
+        """Write sessions to a new segment and index them; returns the compressed bytes written."""
+        return self.put_frames([(s.key, *encode_session(s, self.codec)) for s in sessions])
+
+    def put_frames(self, frames: list[tuple[str, bytes, dict[str, Any]]]) -> int:
+        """
+        Write frames made by ``encode_session`` (key, frame, entry) to a new
+        segment and index them; returns the compressed bytes written.
+        """
+        if not frames:
+            return 0
+        with self._lock:
+            entries = self._entries()
+            ensure_dir(self.archive_dir)
+            name = f"segment-{datetime.now():%Y%m%d-%H%M%S-%f}{_SUFFIXES[self.codec]}"
+            archived_at = datetime.now().isoformat()
+            added: dict[str, dict[str, Any]] = {}
+            pos = 0
+            with open(self.archive_dir / name, "wb") as f:
+                for key, frame, entry in frames:
+                    f.write(frame)
+                    added[key] = {**entry, "segment": name, "offset": pos, "archived_at": archived_at}
+                    pos += len(frame)
+                f.flush()
+                os.fsync(f.fileno())
+            replaced = {entries[key]["segment"] for key in added if key in entries}
+            entries.update(added)
+            self._save_index()
+            self._drop_unused(replaced)
+            return pos
+
+    def load(self, key: str) -> Session | None:
+        """Decompress an archived session (it stays in the archive), or None if it is not archived."""
+        with self._lock:
+            entry = self._entries().get(key)
+            if entry is None:
+                return None
+            with open(self.archive_dir / entry["segment"], "rb") as f:
+                f.seek(entry["offset"])
+                frame = f.read(entry["length"])
+        text = _decompress(frame, entry["codec"]).decode("utf-8")
+        session = parse_jsonl_session(text.splitlines(), key)
+        session._persisted = 0  # Not in the live store: the next save writes it in full
+        return session
+
+    def discard_many(self, keys: list[str]) -> int:
+        """Remove sessions from the archive; returns how many were archived."""
+        with self._lock:
+            entries = self._entries()
+            removed = [entries.pop(key) for key in set(keys) if key in entries]
+            if removed:
+                self._save_index()
+                self._drop_unused({entry["segment"] for entry in removed})
+            return len(removed)
+
+    def discard(self, key: str) -> bool:
+        return self.discard_many([key]) > 0
+
+    def _drop_unused(self, segments: set[str]) -> None:
+        """Delete segments no longer referenced by the index."""
+        used = {entry["segment"] for entry in self._entries().values()}
+        for name in segments - used:
+            try:
+                (self.archive_dir / name).unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self) -> dict[str, Any]:
+        """Archived sessions and messages, segment count and compressed vs raw size."""
+        with self._lock:
+            entries = list(self._entries().values())
+        stored = sum(e["length"] for e in entries)
+        raw = sum(e["raw_bytes"] for e in entries)
+        return {
+            "sessions": len(entries),
+            "messages": sum(e["messages"] for e in entries),
+            "segments": len({e["segment"] for e in entries}),
+            "stored_bytes": stored,
+            "raw_bytes": raw,
+            "ratio": raw / stored if stored else 0.0,
+        }
+
+
+class SessionArchiver:
+    """
+    Periodically moves idle sessions from the live store to the archive.
+
+    Runs ``SessionManager.archive_idle`` on a worker thread every
+    ``interval_s`` seconds; archived sessions come back on their next message.
+    """
+
+    def __init__(
+        self,
+        sessions: SessionManager,
+        idle_days: float = 30,
+        consolidated_idle_days: float | None = None,
+        interval_s: int = 6 * 60 * 60,
+    ):
+        self.sessions = sessions
+        self.idle_days = idle_days
+        self.consolidated_idle_days = consolidated_idle_days
+        self.interval_s = interval_s
+        self._task: asyncio.Task | None = None
+
+    async def start(self) -> None:
+        if self.sessions.archive is None:
+            logger.info("Session archiving disabled")
+            return
+        self._task = asyncio.create_task(self._run_loop())
+        logger.info("Session archiver started (sessions idle for {} days, every {}s)", self.idle_days, self.interval_s)
+
+    def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _run_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.sleep(self.interval_s)
+                await self.run_once()
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Session archiver error: {}", e)
+
+    async def run_once(self) -> list[str]:
+        """Archive idle sessions now; returns the archived keys."""
+        keys = await asyncio.to_thread(self.sessions.archive_idle, self.idle_days, self.consolidated_idle_days)
+        if keys:
+            logger.info("Archived {} idle sessions", len(keys))
+        return keys
@@ -0,0 +1,358 @@
+"""Binary session files: msgpack messages with a trailing offset index."""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import msgpack
+from loguru import logger
+
+from nanobot.session.store import (
+    SessionStore,
+    _mark_persisted,
+    _meta_state,
+    read_jsonl_session,
+    write_jsonl_session,
+)
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+if TYPE_CHECKING:
+    from nanobot.session.manager import Session
+
+# Layout: MAGIC, one msgpack map per message, the index (a msgpack map with
+# session metadata, the message count, the data end, the start offset of
+# every message as little-endian uint64s and the [start, end) runs of message
+# data), then TRAILER: index size + INDEX_MAGIC. Appends add messages and a
+# new index after the old trailer, which stays behind as dead space between
+# runs until the file is rewritten.
+MAGIC = b"NBS1"
+INDEX_MAGIC = b"NBSX"
+_TRAILER = struct.Struct("<Q4s")
+_INDEX_TYPE = "index"
+
+
+def _offsets_from_bytes(data: bytes) -> array:
+    offsets = array("Q")
+    offsets.frombytes(data)
+    if sys.byteorder == "big":
+        offsets.byteswap()
+    return offsets
+
+
+def _offsets_to_bytes(offsets: array) -> bytes:
+    if sys.byteorder == "big":
+        offsets = array("Q", offsets)
+        offsets.byteswap()
+    return offsets.tobytes()
+
+
+def _index_record(session: Session, offsets: array, end: int, runs: list[list[int]]) -> bytes:
+    return msgpack.packb({
+        "_type": _INDEX_TYPE,
+        "key": session.key,
+        "created_at": session.created_at.isoformat(),
+        "updated_at": session.updated_at.isoformat(),
+        "metadata": session.metadata,
+        "last_consolidated": session.last_consolidated,
+        "count": len(offsets),
+        "end": end,
+        "offsets": _offsets_to_bytes(offsets),
+        "runs": runs,
+    }, use_bin_type=True, default=str)
+
+
+def _write_index(f, session: Session, offsets: array, end: int, runs: list[list[int]]) -> None:
+    index = _index_record(session, offsets, end, runs)
+    f.write(index)
+    f.write(_TRAILER.pack(len(index), INDEX_MAGIC))
+
+
+def read_index(f) -> dict[str, Any] | None:
+    """The index of an open binary session file, or None if it is missing or torn."""
+    size = f.seek(0, os.SEEK_END)
+    if size < len(MAGIC) + _TRAILER.size:
+        return None
+    f.seek(size - _TRAILER.size)
+    length, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+    if magic != INDEX_MAGIC or length > size - len(MAGIC) - _TRAILER.size:
+        return None
+    f.seek(size - _TRAILER.size - length)
+    try:
+        index = msgpack.unpackb(f.read(length), raw=False)
+    except Exception:
+        return None
+    if not isinstance(index, dict) or index.get("_type") != _INDEX_TYPE:
+        return None
+    index["offsets"] = _offsets_from_bytes(index["offsets"])
+    # Files written before appends kept runs hold a single one
+    index["runs"] = index.get("runs") or ([[len(MAGIC), index["end"]]] if index["offsets"] else [])
+    return index
+
+
+def _message_bounds(index: dict[str, Any], first: int) -> list[tuple[int, int]]:
+    """File (start, end) of messages ``first`` onwards: the next message's start, or the end of its run."""
+    offsets, runs = index["offsets"], index["runs"]
+    starts = [start for start, _ in runs]
+    bounds = []
+    for i in range(max(0, first), len(offsets)):
+        end = runs[bisect_right(starts, offsets[i]) - 1][1]
+        if i + 1 < len(offsets):
+            end = min(end, offsets[i + 1])
+        bounds.append((offsets[i], end))
+    return bounds
+
+
+def _scan(data: memoryview) -> tuple[list[dict[str, Any]], dict[str, Any] | None]:
+    """Recover messages (and the last complete index) from a file whose trailer is missing."""
+    messages: list[dict[str, Any]] = []
+    index = None
+    pos = len(MAGIC)
+    while pos < len(data):
+        unpacker = msgpack.Unpacker(raw=False)
+        unpacker.feed(data[pos:])
+        try:
+            record = next(unpacker)
+        except Exception:
+            break  # Torn record at the end
+        pos += unpacker.tell()
+        if isinstance(record, dict) and record.get("_type") == _INDEX_TYPE:
+            index = record
+            pos += _TRAILER.size  # A superseded index is followed by its trailer
+        elif isinstance(record, dict) and "role" in record:
+            messages.append(record)
+        else:
+            logger.warning("Skipping unreadable record at offset {}", pos)
+    return messages, index
+
+
+def _session_from(key: str, index: dict[str, Any] | None, messages: list[dict[str, Any]]) -> Session:
+    from nanobot.session.manager import Session
+
+    index = index or {}
+    return Session(
+        key=key,
+        messages=messages,
+        created_at=datetime.fromisoformat(index["created_at"]) if index.get("created_at") else datetime.now(),
+        updated_at=datetime.fromisoformat(index["updated_at"]) if index.get("updated_at") else datetime.now(),
+        metadata=index.get("metadata", {}),
+        last_consolidated=index.get("last_consolidated", 0),
+    )
+
+
+def read_msgpack_session(path: Path, key: str) -> Session:
+    """Load a binary session file, recovering what it can if the index is torn."""
+    with open(path, "rb") as f:
+        index = read_index(f)
+        f.seek(0)
+        data = f.read(index["end"] if index else -1)
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a binary session file")
+
+    if index is None:
+        logger.warning("Session {} has no valid index, recovering messages", key)
+        messages, last_index = _scan(memoryview(data))
+        return _session_from(key, last_index, messages)  # _persisted stays 0: rewritten on the next save
+
+    view = memoryview(data)
+    messages = []
+    for start, end in index["runs"]:
+        unpacker = msgpack.Unpacker(raw=False, max_buffer_size=len(data))
+        unpacker.feed(view[start:end])
+        messages.extend(unpacker)
+    session = _session_from(key, index, messages)
+    if len(session.messages) == index["count"]:
+        session._persisted = index["count"]
+        session._persisted_meta = _meta_state(session)
+        session._trailers = max(0, len(index["runs"]) - 1)
+    return session
+
+
+def read_msgpack_tail(path: Path, max_messages: int) -> list[dict[str, Any]]:
+    """
+    The last ``max_messages`` messages of a binary session file.
+
+    Only the index and the tail are touched: the file is memory-mapped and
+    each message is decoded straight from its slice of the map.
+    """
+    with open(path, "rb") as f:
+        index = read_index(f)
+        if index is None:
+            return read_msgpack_session(path, path.stem).messages[-max_messages:]
+        offsets = index["offsets"]
+        if not offsets or max_messages <= 0:
+            return []
+        bounds = _message_bounds(index, len(offsets) - max_messages)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return [msgpack.unpackb(view[a:b], raw=False) for a, b in bounds]
+            finally:
+                view.release()
+
+
+def write_msgpack_session(path: Path, session: Session, messages: list[dict[str, Any]]) -> None:
+    """Write a binary session file atomically (temp file, fsync, rename)."""
+    tmp = path.with_name(path.name + ".tmp")
+    offsets = array("Q")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        pos = len(MAGIC)
+        packer = msgpack.Packer(use_bin_type=True, default=str)
+        for msg in messages:
+            data = packer.pack(msg)
+            offsets.append(pos)
+            pos += len(data)
+            f.write(data)
+        _write_index(f, session, offsets, pos, [[len(MAGIC), pos]] if messages else [])
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class MsgpackSessionStore(SessionStore):
+    """
+    One binary file per session: msgpack-encoded messages followed by an index.
+
+    The index at the end of the file holds the session metadata and the
+    offset of every message, so ``get_history`` decodes only the tail and
+    listing reads only the index. Saving appends the new messages and a new
+    index after the old one, which is never written over: a crash mid-append
+    leaves at worst a torn tail, and loading then recovers the messages by
+    scanning the file and the next save rewrites it. Once a file holds
+    ``compact_after`` superseded indexes it is rewritten on save.
+    """
+
+    suffix = ".msgpack"
+    compact_after = 16
+
+    def __init__(self, sessions_dir: Path):
+        self.sessions_dir = ensure_dir(sessions_dir)
+        self._io_locks: dict[str, threading.Lock] = {}
+
+    def path_for(self, key: str) -> Path:
+        """File of a session."""
+        return self.sessions_dir / f"{safe_filename(key.replace(':', '_'))}{self.suffix}"
+
+    def _io_lock(self, key: str) -> threading.Lock:
+        return self._io_locks.setdefault(key, threading.Lock())
+
+    def load(self, key: str) -> Session | None:
+        path = self.path_for(key)
+        if not path.exists():
+            return None
+        try:
+            with self._io_lock(key):
+                return read_msgpack_session(path, key)
+        except Exception as e:
+            logger.warning("Failed to load session {}: {}", key, e)
+            return None
+
+    def save(self, session: Session) -> None:
+        path = self.path_for(session.key)
+        with self._io_lock(session.key):
+            messages = session.messages
+            count = len(messages)
+            meta = _meta_state(session)
+            persisted = session._persisted
+            if (persisted and persisted <= count and path.exists()
+                    and session._trailers < self.compact_after
+                    and self._append(path, session, messages, count)):
+                _mark_persisted(session, messages, count, meta)
+                session._trailers += 1
+                return
+            # New file, a cleared session, one that no longer matches the file, or due for compaction
+            write_msgpack_session(path, session, messages[:count])
+            _mark_persisted(session, messages, count, meta)
+            session._trailers = 0
+
+    def _append(self, path: Path, session: Session, messages: list[dict[str, Any]], count: int) -> bool:
+        """Append messages and a new index after the current one; False if the file must be rewritten."""
+        with open(path, "r+b") as f:
+            index = read_index(f)
+            if index is None or index["count"] != session._persisted:
+                return False
+            offsets, runs = index["offsets"], index["runs"]
+            start = pos = f.seek(0, os.SEEK_END)
+            packer = msgpack.Packer(use_bin_type=True, default=str)
+            for msg in messages[session._persisted:count]:
+                data = packer.pack(msg)
+                offsets.append(pos)
+                pos += len(data)
+                f.write(data)
+            if pos > start:
+                runs.append([start, pos])
+            _write_index(f, session, offsets, pos, runs)
+        return True
+
+    def compact(self, session: Session) -> None:
+        """Rewrite the file without superseded indexes."""
+        with self._io_lock(session.key):
+            path = self.path_for(session.key)
+            if session._persisted and path.exists():
+                messages, count = session.messages, session._persisted
+                write_msgpack_session(path, session, messages[:count])
+                _mark_persisted(session, messages, count, _meta_state(session))
+                session._trailers = 0
+
+    def get_history(self, key: str, max_messages: int) -> list[dict[str, Any]]:
+        path = self.path_for(key)
+        if max_messages <= 0 or not path.exists():
+            return []
+        with self._io_lock(key):
+            return read_msgpack_tail(path, max_messages)
+
+    def delete(self, key: str) -> bool:
+        with self._io_lock(key):
+            path = self.path_for(key)
+            if not path.exists():
+                return False
+            path.unlink()
+            return True
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        sessions = []
+        for path in self.sessions_dir.glob(f"*{self.suffix}"):
+            try:
+                with open(path, "rb") as f:
+                    index = read_index(f)
+                if index is None:
+                    continue
+                sessions.append({
+                    "key": index.get("key") or path.stem.replace("_", ":", 1),
+                    "created_at": index.get("created_at"),
+                    "updated_at": index.get("updated_at"),
+                    "messages": index["count"],
+                    "path": str(path),
+                })
+            except Exception:
+                continue
+        return sorted(sessions, key=lambda x: x.get("updated_at") or "", reverse=True)
+
+
+def convert_session_file(source: Path, target: Path) -> int:
+    """
+    Convert one session file between the JSONL and binary layouts, by the
+    source's content (binary files start with MAGIC). Returns the message count.
+    """
+    with open(source, "rb") as f:
+        binary = f.read(len(MAGIC)) == MAGIC
+        index = read_index(f) if binary else None
+    if binary:
+        session = read_msgpack_session(source, (index or {}).get("key") or source.stem.replace("_", ":", 1))
+        write_jsonl_session(target, session, session.messages)
+    else:
+        with open(source, encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+        session = read_jsonl_session(source, header.get("key") or source.stem.replace("_", ":", 1))
+        write_msgpack_session(target, session, session.messages)
+    return len(session.messages)
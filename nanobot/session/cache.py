@@ -0,0 +1,134 @@
+"""Bounded in-memory cache of loaded sessions."""
+
+from __future__ import annotations
+
+import json
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from nanobot.session.manager import Session
+
+_MESSAGE_OVERHEAD = 240  # Rough size of a message dict, its keys and timestamp
+
+
+def estimate_message_bytes(msg: dict[str, Any]) -> int:
+    """Approximate memory held by one session message."""
+    content = msg.get("content")
+    size = _MESSAGE_OVERHEAD + (len(content) if isinstance(content, str) else len(json.dumps(content, default=str)))
+    if "tool_calls" in msg:
+        size += len(json.dumps(msg["tool_calls"], default=str))
+    return size
+
+
+@dataclass
+class _Entry:
+    session: Session
+    counted: int = 0  # Messages included in size
+    size: int = 0
+    source: list | None = None  # Message list counted
+
+
+class SessionCache:
+    """
+    LRU cache of sessions bounded by count and by estimated bytes.
+
+    Sizes are estimated incrementally as messages are added (see ``put``).
+    When either bound is exceeded, the least recently used sessions are
+    evicted; they are reloaded from disk on their next use. Pinned sessions
+    (those with a turn or consolidation in flight) are never evicted, so one
+    session is never loaded twice while in use.
+    """
+
+    def __init__(self, max_sessions: int = 1000, max_bytes: int = 256 * 1024 * 1024):
+        self.max_sessions = max_sessions
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._pins: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def get(self, key: str) -> Session | None:
+        """Cached session for key (marking it recently used), or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry.session
+
+    def peek(self, key: str) -> Session | None:
+        """Cached session for key without touching LRU order or statistics."""
+        entry = self._entries.get(key)
+        return entry.session if entry else None
+
+    def put(self, session: Session) -> None:
+        """Insert or refresh a session, account for new messages and evict if over budget."""
+        entry = self._entries.get(session.key)
+        if entry is None or entry.session is not session:
+            if entry is not None:
+                self.bytes -= entry.size
+            entry = self._entries[session.key] = _Entry(session)
+        self._entries.move_to_end(session.key)
+
+        messages = session.messages
+        if entry.source is not messages or entry.counted > len(messages):  # Cleared or replaced
+            self.bytes -= entry.size
+            entry.counted = entry.size = 0
+            entry.source = messages
+        added = sum(estimate_message_bytes(m) for m in messages[entry.counted:])
+        entry.counted = len(messages)
+        entry.size += added
+        self.bytes += added
+        self._evict()
+
+    def pop(self, key: str) -> Session | None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry.size
+        return entry.session
+
+    def pin(self, key: str) -> None:
+        self._pins[key] = self._pins.get(key, 0) + 1
+
+    def unpin(self, key: str) -> None:
+        count = self._pins.get(key, 0) - 1
+        if count > 0:
+            self._pins[key] = count
+        else:
+            self._pins.pop(key, None)
+            self._evict()
+
+    def _evict(self) -> None:
+        if len(self._entries) <= self.max_sessions and self.bytes <= self.max_bytes:
+            return
+        for key in list(self._entries):
+            if len(self._entries) <= self.max_sessions and self.bytes <= self.max_bytes:
+                break
+            if key in self._pins:
+                continue
+            self.pop(key)
+            self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._entries),
+            "pinned": len(self._pins),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
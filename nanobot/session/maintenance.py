@@ -0,0 +1,337 @@
+"""Offline maintenance of a whole session store, spread over a process pool."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator
+
+from nanobot.session.archive import SessionArchive, encode_session, is_archivable
+from nanobot.session.binary import MsgpackSessionStore, write_msgpack_session
+from nanobot.session.store import (
+    JsonlSessionStore,
+    SessionStore,
+    SqliteSessionStore,
+    write_jsonl_session,
+)
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+
+@dataclass(frozen=True)
+class StoreSpec:
+    """What a session store is made of, so that worker processes can open their own."""
+
+    backend: str  # "jsonl", "msgpack" or "sqlite"
+    path: Path  # Sessions directory, or the database file for sqlite
+    legacy_dir: Path | None = None  # JSONL only: legacy sessions moved in lazily on load
+
+    def open(self) -> SessionStore:
+        if self.backend == "sqlite":
+            return SqliteSessionStore(self.path)
+        if self.backend == "msgpack":
+            return MsgpackSessionStore(self.path)
+        if self.backend == "jsonl":
+            return JsonlSessionStore(self.path, legacy_dir=self.legacy_dir)
+        raise ValueError(f"Unknown session backend: {self.backend}")
+
+
+class Journal:
+    """
+    Keys already handled by an interrupted bulk operation, one per line.
+
+    Rerunning the operation skips them; ``finish`` removes the journal once
+    every key is done.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.done: set[str] = set()
+        if path.exists():
+            self.done = {line for line in path.read_text(encoding="utf-8").splitlines() if line}
+        self._file = None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.done
+
+    def record(self, key: str) -> None:
+        if self._file is None:
+            ensure_dir(self.path.parent)
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(key + "\n")
+        self._file.flush()
+        self.done.add(key)
+
+    def close(self) -> None:
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    def finish(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+
+# Per-process state of pool workers, set by _init_worker
+_source: SessionStore | None = None
+_target: SessionStore | None = None
+_options: dict[str, Any] = {}
+
+
+def _init_worker(source: StoreSpec, target: StoreSpec | None, options: dict[str, Any]) -> None:
+    global _source, _target, _options
+    _source = source.open()
+    _target = target.open() if target else None
+    _options = options
+
+
+def _close_worker() -> None:
+    global _source, _target
+    for store in (_source, _target):
+        if store is not None:
+            store.close()
+    _source = _target = None
+
+
+def run_bulk(
+    task: Callable[[Any], dict[str, Any]],
+    items: Iterable[Any],
+    source: StoreSpec,
+    target: StoreSpec | None = None,
+    options: dict[str, Any] | None = None,
+    workers: int | None = None,
+    journal: Journal | None = None,
+    chunksize: int = 16,
+) -> Iterator[dict[str, Any]]:
+    """
+    Run ``task`` on every item across a pool of worker processes.
+
+    Each worker opens its own stores from the specs. Results are yielded
+    as they complete, in no particular order. With a ``journal``, items
+    whose key it holds are skipped and every successful key is recorded,
+    so an interrupted run picks up where it stopped.
+
+    Args:
+        task: Module-level function taking an item (a key, or a tuple
+            starting with the key) and returning a result dict with
+            ``key`` and ``status`` ("error" results are not journaled).
+        items: Work items.
+        source, target: Stores the task reads and writes.
+        options: Passed to the workers as-is.
+        workers: Worker processes (default: CPU count); 1 runs inline.
+    """
+    items = [item for item in items if journal is None or _item_key(item) not in journal]
+    if not items:
+        return
+    workers = workers or os.cpu_count() or 1
+    args = (source, target, options or {})
+    if workers == 1 or len(items) == 1:
+        _init_worker(*args)
+        try:
+            results: Iterable[dict[str, Any]] = (task(item) for item in items)
+            yield from _journaled(results, journal)
+        finally:
+            _close_worker()
+        return
+    with multiprocessing.Pool(min(workers, len(items)), initializer=_init_worker, initargs=args) as pool:
+        yield from _journaled(pool.imap_unordered(task, items, chunksize), journal)
+
+
+def _item_key(item: Any) -> str:
+    return item[0] if isinstance(item, tuple) else item
+
+
+def _journaled(results: Iterable[dict[str, Any]], journal: Journal | None) -> Iterator[dict[str, Any]]:
+    for result in results:
+        if journal is not None and result["status"] != "error":
+            journal.record(result["key"])
+        yield result
+
+
+def _call(fn: Callable[[Any], dict[str, Any]], item: Any) -> dict[str, Any]:
+    """Run a task, turning an exception into an "error" result."""
+    try:
+        return fn(item)
+    except Exception as e:
+        return {"key": _item_key(item), "status": "error", "error": str(e)}
+
+
+def _file_size(store: SessionStore, key: str) -> int | None:
+    path_for = getattr(store, "path_for", None)
+    if path_for is None:
+        return None
+    path = path_for(key)
+    return path.stat().st_size if path.exists() else None
+
+
+def _stats(key: str) -> dict[str, Any]:
+    session = _source.load(key)
+    if session is None:
+        return {"key": key, "status": "error", "error": "unreadable"}
+    return {
+        "key": key,
+        "status": "ok",
+        "messages": len(session.messages),
+        "unconsolidated": max(0, len(session.messages) - session.last_consolidated),
+        "bytes": _file_size(_source, key),
+        "updated_at": session.updated_at.isoformat(),
+    }
+
+
+def _verify(key: str) -> dict[str, Any]:
+    session = _source.load(key)
+    if session is None:
+        return {"key": key, "status": "error", "error": "unreadable"}
+    problems = []
+    if session.messages and not session._persisted:
+        problems.append("torn or missing metadata")
+    if session.last_consolidated > len(session.messages):
+        problems.append(f"last_consolidated {session.last_consolidated} > {len(session.messages)} messages")
+    bad = sum(1 for m in session.messages if not isinstance(m, dict) or "role" not in m)
+    if bad:
+        problems.append(f"{bad} malformed messages")
+    if not problems:
+        return {"key": key, "status": "ok"}
+    if _options.get("repair"):
+        session.messages = [m for m in session.messages if isinstance(m, dict) and "role" in m]
+        session.last_consolidated = min(session.last_consolidated, len(session.messages))
+        session._persisted = 0
+        _source.save(session)
+        return {"key": key, "status": "repaired", "problems": problems}
+    return {"key": key, "status": "problem", "problems": problems}
+
+
+def _compact(key: str) -> dict[str, Any]:
+    session = _source.load(key)
+    if session is None:
+        return {"key": key, "status": "error", "error": "unreadable"}
+    before = _file_size(_source, key)
+    if not session._persisted:
+        _source.save(session)  # Torn file: rewritten in full
+    elif session._trailers:
+        _source.compact(session)
+    else:
+        return {"key": key, "status": "unchanged"}
+    after = _file_size(_source, key)
+    return {"key": key, "status": "compacted", "reclaimed": (before or 0) - (after or 0)}
+
+
+def _migrate(key: str) -> dict[str, Any]:
+    if _options.get("keep_existing") and _target.load(key) is not None:
+        return {"key": key, "status": "skipped"}
+    session = _source.load(key)
+    if session is None:
+        return {"key": key, "status": "error", "error": "unreadable"}
+    session._persisted = 0  # Write it out in full
+    _target.save(session)
+    if _options.get("move"):
+        _source.delete(key)
+    return {"key": key, "status": "migrated", "messages": len(session.messages)}
+
+
+def _export(key: str) -> dict[str, Any]:
+    session = _source.load(key)
+    if session is None:
+        return {"key": key, "status": "error", "error": "unreadable"}
+    fmt = _options["format"]
+    path = Path(_options["out_dir"]) / f"{safe_filename(key.replace(':', '_'))}.{fmt}"
+    if fmt == "msgpack":
+        write_msgpack_session(path, session, session.messages)
+    else:
+        write_jsonl_session(path, session, session.messages)
+    return {"key": key, "status": "exported", "messages": len(session.messages), "path": str(path)}
+
+
+def _archive(item: tuple[str, float]) -> dict[str, Any]:
+    key, idle_s = item
+    session = _source.load(key)
+    if session is None:
+        return {"key": key, "status": "error", "error": "unreadable"}
+    idle = timedelta(seconds=idle_s)
+    if not is_archivable(session, idle, _options["idle_days"], _options["consolidated_idle_days"]):
+        return {"key": key, "status": "skipped"}
+    frame, entry = encode_session(session, _options["codec"])
+    return {"key": key, "status": "encoded", "frame": frame, "entry": entry}
+
+
+def stats_task(key: str) -> dict[str, Any]:
+    """Message counts and size of a session."""
+    return _call(_stats, key)
+
+
+def verify_task(key: str) -> dict[str, Any]:
+    """Check a session for torn files and inconsistent state; fix it with the repair option."""
+    return _call(_verify, key)
+
+
+def compact_task(key: str) -> dict[str, Any]:
+    """Rewrite a session file without superseded metadata records."""
+    return _call(_compact, key)
+
+
+def migrate_task(key: str) -> dict[str, Any]:
+    """Copy a session to the target store (moving it with the move option)."""
+    return _call(_migrate, key)
+
+
+def export_task(key: str) -> dict[str, Any]:
+    """Write a session to a file in the out_dir option."""
+    return _call(_export, key)
+
+
+def archive_task(item: tuple[str, float]) -> dict[str, Any]:
+    """Compress a (key, idle seconds) session if it is due for the archive."""
+    return _call(_archive, item)
+
+
+def idle_sessions(store: SessionStore, min_idle_days: float) -> list[tuple[str, float]]:
+    """(key, idle seconds) of the sessions of a store not updated for ``min_idle_days``."""
+    now = datetime.now()
+    items = []
+    for info in store.list_sessions():
+        if info.get("updated_at"):
+            idle = (now - datetime.fromisoformat(info["updated_at"])).total_seconds()
+            if idle >= min_idle_days * 86400:
+                items.append((info["key"], idle))
+    return items
+
+
+def archive_store(
+    source: StoreSpec,
+    archive: SessionArchive,
+    idle_days: float,
+    consolidated_idle_days: float,
+    workers: int | None = None,
+    batch_size: int = 256,
+) -> Iterator[dict[str, Any]]:
+    """
+    Move idle sessions of a store to the archive. Workers load and compress
+    sessions; this process writes segments of ``batch_size`` sessions and
+    then deletes them from the store, so an interrupted run only leaves
+    sessions in the store, to be archived by the next run.
+    """
+    store = source.open()
+    try:
+        items = idle_sessions(store, min(idle_days, consolidated_idle_days))
+        options = {"idle_days": idle_days, "consolidated_idle_days": consolidated_idle_days, "codec": archive.codec}
+        batch: list[dict[str, Any]] = []
+
+        def flush() -> Iterator[dict[str, Any]]:
+            archive.put_frames([(r["key"], r.pop("frame"), r.pop("entry")) for r in batch])
+            for r in batch:
+                store.delete(r["key"])
+                yield {**r, "status": "archived"}
+            batch.clear()
+
+        for result in run_bulk(archive_task, items, source, options=options, workers=workers):
+            if result["status"] != "encoded":
+                yield result
+                continue
+            batch.append(result)
+            if len(batch) >= batch_size:
+                yield from flush()
+        yield from flush()
+    finally:
+        store.close()
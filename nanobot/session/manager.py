@@ -1,14 +1,21 @@
 """Session management for conversation history."""
 
-import json
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timedelta
+from typing import Any, Iterator
 
 from loguru import logger
 
-from nanobot.utils.helpers import ensure_dir, safe_filename
+from nanobot.session.archive import SessionArchive, is_archivable
+from nanobot.session.cache import SessionCache
+from nanobot.session.store import JsonlSessionStore, SessionStore
+from nanobot.utils.helpers import estimate_message_tokens
+from nanobot.utils.writebehind import WriteBehind
 
 
 @dataclass
@@ -29,6 +36,13 @@ class Session:
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     last_consolidated: int = 0  # Number of messages already consolidated to files
+    # Token estimate per message, parallel to messages; filled lazily and never persisted
+    _token_counts: list[int] = field(default_factory=list, init=False, repr=False, compare=False)
+    _token_source: list | None = field(default=None, init=False, repr=False, compare=False)  # List counted
+    # Persistence state: messages already stored, metadata last written, trailers since a rewrite
+    _persisted: int = field(default=0, init=False, repr=False, compare=False)
+    _persisted_meta: Any = field(default=None, init=False, repr=False, compare=False)
+    _trailers: int = field(default=0, init=False, repr=False, compare=False)
     
     def add_message(self, role: str, content: str, **kwargs: Any) -> None:
         """Add a message to the session."""
@@ -41,10 +55,33 @@ class Session:
         self.messages.append(msg)
         self.updated_at = datetime.now()
     
-    def get_history(self, max_messages: int = 500) -> list[dict[str, Any]]:
-        """Get recent messages in LLM format, preserving tool metadata."""
+    def get_history(
+        self,
+        max_messages: int = 500,
+        max_tokens: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Get recent messages in LLM format, preserving tool metadata.
+
+        Args:
+            max_messages: Upper bound on the number of messages considered.
+            max_tokens: Optional token budget. History is filled from newest to
+                oldest until the next message would exceed it; an assistant
+                tool-call message and its tool results are kept or dropped together.
+
+        Returns:
+            Messages in chronological order.
+        """
+        start = max(0, len(self.messages) - max_messages)
+        if max_tokens is not None:
+            start = self._budget_start(start, max_tokens)
+        window = self.messages[start:]
+        # Never start with tool results whose assistant tool-call message was cut off
+        while window and window[0].get("role") == "tool":
+            window = window[1:]
+
         out: list[dict[str, Any]] = []
-        for m in self.messages[-max_messages:]:
+        for m in window:
             entry: dict[str, Any] = {"role": m["role"], "content": m.get("content", "")}
             for k in ("tool_calls", "tool_call_id", "name"):
                 if k in m:
@@ -52,9 +89,38 @@ class Session:
             out.append(entry)
         return out
     
+    def token_counts(self) -> list[int]:
+        """Per-message token estimates, computed once per message and cached."""
+        counts = self._token_counts
+        if self._token_source is not self.messages or len(counts) > len(self.messages):
+            counts.clear()  # messages were replaced wholesale, or truncated in place
+            self._token_source = self.messages
+        for m in self.messages[len(counts):]:
+            counts.append(estimate_message_tokens(m))
+        return counts
+
+    def _budget_start(self, start: int, max_tokens: int) -> int:
+        """Index of the oldest message that fits in max_tokens, walking back from the newest."""
+        counts = self.token_counts()
+        used = 0
+        i = len(self.messages)
+        while i > start:
+            # A block is one message, or a run of tool results plus the call that produced them
+            j = i - 1
+            while j > start and self.messages[j].get("role") == "tool":
+                j -= 1
+            block = sum(counts[j:i])
+            if used + block > max_tokens:
+                break
+            used += block
+            i = j
+        return i
+
     def clear(self) -> None:
         """Clear all messages and reset session to initial state."""
         self.messages = []
+        self._token_counts = []
+        self._persisted = 0  # The store rewrites it on the next save
         self.last_consolidated = 0
         self.updated_at = datetime.now()
 
@@ -63,24 +129,44 @@ class SessionManager:
     """
     Manages conversation sessions.
 
-    Sessions are stored as JSONL files in the sessions directory.
+    Sessions are persisted through a SessionStore: JSONL files in the
+    workspace's sessions directory by default, or SQLite (see store.py).
+    Loaded sessions are kept in a bounded LRU cache (see SessionCache);
+    callers pin a session while a turn or consolidation uses it.
+
+    With a ``writer``, saves are queued to its thread instead of writing on
+    the caller's (event loop) thread, and repeated saves of a session within
+    the writer's window collapse into one. A session with a queued save is
+    served from memory even if the cache evicted it, so it is never reloaded
+    stale. ``close`` flushes the queue.
+
+    With an ``archive``, ``archive_idle`` moves sessions idle for days out of
+    the store into compressed segments (see SessionArchive), and loading a
+    session that is no longer in the store restores it from the archive.
     """
 
-    def __init__(self, workspace: Path):
+    def __init__(
+        self,
+        workspace: Path,
+        cache_max_sessions: int = 1000,
+        cache_max_bytes: int = 256 * 1024 * 1024,
+        store: SessionStore | None = None,
+        writer: WriteBehind | None = None,
+        archive: SessionArchive | None = None,
+    ):
         self.workspace = workspace
-        self.sessions_dir = ensure_dir(self.workspace / "sessions")
-        self.legacy_sessions_dir = Path.home() / ".nanobot" / "sessions"
-        self._cache: dict[str, Session] = {}
-    
-    def _get_session_path(self, key: str) -> Path:
-        """Get the file path for a session."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.sessions_dir / f"{safe_key}.jsonl"
-
-    def _get_legacy_session_path(self, key: str) -> Path:
-        """Legacy global session path (~/.nanobot/sessions/)."""
-        safe_key = safe_filename(key.replace(":", "_"))
-        return self.legacy_sessions_dir / f"{safe_key}.jsonl"
+        self.store = store or JsonlSessionStore(
+            workspace / "sessions", legacy_dir=Path.home() / ".nanobot" / "sessions"
+        )
+        self.writer = writer
+        self.archive = archive
+        self._cache = SessionCache(cache_max_sessions, cache_max_bytes)
+        self._unsaved: dict[str, tuple[Session, object]] = {}  # Sessions with a queued save
+        self._unsaved_lock = threading.Lock()
+        self._loading: dict[str, asyncio.Future] = {}
+        # Last access per key; the archiver leaves recently used sessions alone
+        self._accessed: dict[str, float] = {}
+        self._archive_lock = threading.Lock()  # Store reads vs. the archiver's deletes
     
     def get_or_create(self, key: str) -> Session:
         """
@@ -92,83 +178,128 @@ class SessionManager:
         Returns:
             The session.
         """
-        if key in self._cache:
-            return self._cache[key]
+        self._accessed[key] = time.monotonic()
+        session = self._cached(key)
+        if session is not None:
+            return session
         
-        session = self._load(key)
+        session = self._load(key) or Session(key=key)
+        self._cache.put(session)
+        return session
+
+    async def get_or_create_async(self, key: str) -> Session:
+        """Like get_or_create, but loads from storage on a worker thread."""
+        self._accessed[key] = time.monotonic()
+        session = self._cached(key)
+        if session is not None:
+            return session
+
+        loading = self._loading.get(key)
+        if loading is None:
+            loading = self._loading[key] = asyncio.ensure_future(asyncio.to_thread(self._load, key))
+            loading.add_done_callback(lambda _: self._loading.pop(key, None))
+        loaded = await asyncio.shield(loading)
+
+        # Another caller may have cached the key while this one waited
+        session = self._cached(key)
         if session is None:
-            session = Session(key=key)
-        
-        self._cache[key] = session
+            session = loaded or Session(key=key)
+            self._cache.put(session)
         return session
-    
+
     def _load(self, key: str) -> Session | None:
-        """Load a session from disk."""
-        path = self._get_session_path(key)
-        if not path.exists():
-            legacy_path = self._get_legacy_session_path(key)
-            if legacy_path.exists():
-                import shutil
-                shutil.move(str(legacy_path), str(path))
-                logger.info("Migrated session {} from legacy path", key)
-
-        if not path.exists():
-            return None
+        """Load a session from the store, restoring it from the archive if it was archived."""
+        with self._archive_lock:
+            session = self.store.load(key)
+            if session is None and self.archive is not None and key in self.archive:
+                session = self.archive.load(key)
+                if session is not None:
+                    self.store.save(session)
+                    self.archive.discard(key)
+                    logger.info("Restored session {} from the archive", key)
+        return session
+
+    def _cached(self, key: str) -> Session | None:
+        session = self._cache.get(key)
+        if session is None and (unsaved := self._unsaved.get(key)):
+            session = unsaved[0]
+            self._cache.put(session)
+        return session
+
+    def get_history(self, key: str, max_messages: int = 500) -> list[dict[str, Any]]:
+        """
+        Last stored messages of a session, without loading it into the cache.
+
+        Serves from the cache when the session is loaded; otherwise asks the
+        store, which may read just the tail (SQLite uses a LIMIT query).
+        """
+        session = self._cache.peek(key)
+        if session is not None:
+            return session.messages[-max_messages:] if max_messages > 0 else []
+        history = self.store.get_history(key, max_messages)
+        if not history and max_messages > 0 and self.archive is not None and key in self.archive:
+            archived = self.archive.load(key)
+            return archived.messages[-max_messages:] if archived else []
+        return history
 
+    def pin(self, key: str) -> None:
+        """Keep a session in the cache until unpinned (pins are counted)."""
+        self._cache.pin(key)
+
+    def unpin(self, key: str) -> None:
+        self._cache.unpin(key)
+
+    @contextmanager
+    def pinned(self, key: str) -> Iterator[None]:
+        """Pin a session for the duration of a block."""
+        self._cache.pin(key)
         try:
-            messages = []
-            metadata = {}
-            created_at = None
-            last_consolidated = 0
-
-            with open(path, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
+            yield
+        finally:
+            self._cache.unpin(key)
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Session cache size, hit/miss counts and evictions."""
+        return self._cache.stats()
 
-                    data = json.loads(line)
-
-                    if data.get("_type") == "metadata":
-                        metadata = data.get("metadata", {})
-                        created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
-                        last_consolidated = data.get("last_consolidated", 0)
-                    else:
-                        messages.append(data)
-
-            return Session(
-                key=key,
-                messages=messages,
-                created_at=created_at or datetime.now(),
-                metadata=metadata,
-                last_consolidated=last_consolidated
-            )
-        except Exception as e:
-            logger.warning("Failed to load session {}: {}", key, e)
-            return None
-    
     def save(self, session: Session) -> None:
-        """Save a session to disk."""
-        path = self._get_session_path(session.key)
-
-        with open(path, "w", encoding="utf-8") as f:
-            metadata_line = {
-                "_type": "metadata",
-                "key": session.key,
-                "created_at": session.created_at.isoformat(),
-                "updated_at": session.updated_at.isoformat(),
-                "metadata": session.metadata,
-                "last_consolidated": session.last_consolidated
-            }
-            f.write(json.dumps(metadata_line, ensure_ascii=False) + "\n")
-            for msg in session.messages:
-                f.write(json.dumps(msg, ensure_ascii=False) + "\n")
-
-        self._cache[session.key] = session
+        """Save a session, writing what changed since the last save (queued when there is a writer)."""
+        self._accessed[session.key] = time.monotonic()
+        self._cache.put(session)
+        if self.writer is None:
+            self.store.save(session)
+            return
+        token = object()
+        with self._unsaved_lock:
+            self._unsaved[session.key] = (session, token)
+        self.writer.submit(("session", session.key), lambda: self._write(session, token))
+
+    def _write(self, session: Session, token: object) -> None:
+        try:
+            self.store.save(session)
+        finally:
+            with self._unsaved_lock:
+                if self._unsaved.get(session.key, (None, None))[1] is token:
+                    del self._unsaved[session.key]
+
+    def compact(self, session: Session) -> None:
+        """Drop superseded records of a session from its storage."""
+        self.store.compact(session)
     
     def invalidate(self, key: str) -> None:
         """Remove a session from the in-memory cache."""
-        self._cache.pop(key, None)
+        self._cache.pop(key)
+
+    def delete(self, key: str) -> bool:
+        """Remove a session from the cache, from storage and from the archive."""
+        self._cache.pop(key)
+        archived = self.archive is not None and self.archive.discard(key)
+        if self.writer is None:
+            return self.store.delete(key) or archived
+        with self._unsaved_lock:
+            self._unsaved.pop(key, None)
+        # Replaces a queued save, so the session is not written back afterwards
+        return self.writer.submit(("session", key), lambda: self.store.delete(key)).result() or archived
     
     def list_sessions(self) -> list[dict[str, Any]]:
         """
@@ -177,24 +308,99 @@ class SessionManager:
         Returns:
             List of session info dicts.
         """
-        sessions = []
-        
-        for path in self.sessions_dir.glob("*.jsonl"):
-            try:
-                # Read just the metadata line
-                with open(path, encoding="utf-8") as f:
-                    first_line = f.readline().strip()
-                    if first_line:
-                        data = json.loads(first_line)
-                        if data.get("_type") == "metadata":
-                            key = data.get("key") or path.stem.replace("_", ":", 1)
-                            sessions.append({
-                                "key": key,
-                                "created_at": data.get("created_at"),
-                                "updated_at": data.get("updated_at"),
-                                "path": str(path)
-                            })
-            except Exception:
+        return self.store.list_sessions()
+
+    def archive_idle(
+        self,
+        idle_days: float,
+        consolidated_idle_days: float | None = None,
+        batch_size: int = 256,
+    ) -> list[str]:
+        """
+        Move sessions not updated for ``idle_days`` from the store to the archive.
+
+        Only this process's use of a session is visible here, so call it
+        only when no other process shares the store (not from gateway
+        workers): a session another process holds would be deleted from the
+        store under it, and its next incremental save would leave only the
+        new messages there.
+
+        Args:
+            idle_days: Days without an update before a session is archived.
+            consolidated_idle_days: Shorter limit for sessions whose messages
+                are all consolidated into memory (default: ``idle_days``).
+            batch_size: Sessions written per archive segment.
+
+        Returns:
+            Keys of the archived sessions. Sessions in memory or used by
+            this process within the limit are left in the store.
+        """
+        if self.archive is None:
+            return []
+        if consolidated_idle_days is None:
+            consolidated_idle_days = idle_days
+        now = datetime.now()
+        shortest = timedelta(days=min(idle_days, consolidated_idle_days))
+        recent = time.monotonic() - shortest.total_seconds()
+
+        candidates = []
+        for info in self.store.list_sessions():
+            updated = info.get("updated_at")
+            if not updated or self._in_use(info["key"], recent):
                 continue
-        
-        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+            idle = now - datetime.fromisoformat(updated)
+            if idle >= shortest:
+                candidates.append((info["key"], idle))
+
+        archived: list[str] = []
+        for i in range(0, len(candidates), batch_size):
+            batch = []
+            for key, idle in candidates[i:i + batch_size]:
+                session = self.store.load(key)
+                if session is None:
+                    continue
+                if is_archivable(session, idle, idle_days, consolidated_idle_days):
+                    batch.append(session)
+            self.archive.put_many(batch)
+            kept = []
+            for session in batch:
+                with self._archive_lock:
+                    # Used since it was read: the live copy stays and the archived one is dropped
+                    if self._in_use(session.key, recent):
+                        kept.append(session.key)
+                        continue
+                    self.store.delete(session.key)
+                archived.append(session.key)
+            self.archive.discard_many(kept)
+        return archived
+
+    def _in_use(self, key: str, since: float) -> bool:
+        """Whether a session is in memory or was used by this process after ``since`` (monotonic)."""
+        return (
+            self._accessed.get(key, float("-inf")) >= since
+            or key in self._unsaved
+            or self._cache.peek(key) is not None
+        )
+
+    def archive_stats(self) -> dict[str, Any]:
+        """Sessions in the live store and the archive's size (empty without an archive)."""
+        stats: dict[str, Any] = {"live_sessions": len(self.store.list_sessions())}
+        if self.archive is not None:
+            stats["archive"] = self.archive.stats()
+        return stats
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until queued saves are written; False on timeout."""
+        return self.writer.flush(timeout) if self.writer else True
+
+    def storage_stats(self) -> dict[str, Any]:
+        """Write queue depth and counters (all zero without a writer)."""
+        if self.writer is None:
+            return {"pending": 0, "written": 0, "coalesced": 0, "failed": 0}
+        return self.writer.stats()
+
+    def close(self) -> None:
+        """Write queued saves, finish background work and release the store."""
+        if self.writer:
+            self.writer.close()
+        self.store.close()
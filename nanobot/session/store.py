@@ -0,0 +1,461 @@
+"""Pluggable persistence backends for conversation sessions."""
+
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import sqlite3
+import threading
+import weakref
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable
+
+from loguru import logger
+
+from nanobot.utils.helpers import ensure_dir, safe_filename
+
+if TYPE_CHECKING:
+    from nanobot.session.manager import Session
+
+
+def _metadata_record(session: Session) -> dict[str, Any]:
+    return {
+        "_type": "metadata",
+        "key": session.key,
+        "created_at": session.created_at.isoformat(),
+        "updated_at": session.updated_at.isoformat(),
+        "metadata": session.metadata,
+        "last_consolidated": session.last_consolidated,
+    }
+
+
+def _meta_state(session: Session) -> str:
+    """What a metadata record stores, minus updated_at (which moves every turn)."""
+    return json.dumps([session.metadata, session.last_consolidated], ensure_ascii=False, sort_keys=True)
+
+
+def _mark_persisted(session: Session, messages: list[dict[str, Any]], count: int, meta: str) -> None:
+    """Record that ``count`` messages of ``messages`` are stored, unless the session was cleared meanwhile."""
+    if session.messages is messages:
+        session._persisted = count
+    session._persisted_meta = meta
+
+
+class SessionStore(ABC):
+    """
+    Where SessionManager keeps sessions.
+
+    ``save`` is called after every turn and should only write what changed
+    since the session was loaded or last saved, using the ``_persisted``
+    (messages stored) and ``_persisted_meta`` markers on the session. A
+    session whose ``_persisted`` is 0, or larger than its message count
+    (cleared), must be written out in full.
+
+    ``save`` may run on a writer thread while the event loop keeps adding
+    messages, so it works on a snapshot of the message count and leaves
+    ``_persisted`` alone if the message list was replaced meanwhile.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Session | None:
+        """Load a session, or None if it is not stored."""
+
+    @abstractmethod
+    def save(self, session: Session) -> None:
+        """Persist a session's new messages and changed metadata."""
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        """Remove a stored session; True if it existed."""
+
+    @abstractmethod
+    def list_sessions(self) -> list[dict[str, Any]]:
+        """Info dicts (key, created_at, updated_at, ...) of all sessions, most recent first."""
+
+    def get_history(self, key: str, max_messages: int) -> list[dict[str, Any]]:
+        """The last ``max_messages`` stored messages of a session."""
+        session = self.load(key)
+        return session.messages[-max_messages:] if session and max_messages > 0 else []
+
+    def compact(self, session: Session) -> None:
+        """Reclaim space used by superseded records of a session, if the format has any."""
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class JsonlSessionStore(SessionStore):
+    """
+    One JSONL file per session: a metadata line followed by one line per message.
+
+    Saving appends only the messages added since the last save, plus a
+    metadata trailer line when metadata or ``last_consolidated`` changed (the
+    last metadata line wins on load). Once a file carries ``compact_after``
+    trailers it is rewritten in the background to a single metadata line,
+    atomically via a temp file and rename. Clearing a session rewrites its
+    file right away.
+    """
+
+    compact_after = 16
+
+    def __init__(self, sessions_dir: Path, legacy_dir: Path | None = None):
+        self.sessions_dir = ensure_dir(sessions_dir)
+        self.legacy_dir = legacy_dir
+        self._io_locks: dict[str, threading.Lock] = {}  # Serialize appends and compaction per file
+        # Session object each file was last written from; compaction of any other copy is stale
+        self._owners: weakref.WeakValueDictionary[str, Session] = weakref.WeakValueDictionary()
+        self._compactor: ThreadPoolExecutor | None = None
+
+    def path_for(self, key: str) -> Path:
+        """File of a session."""
+        safe_key = safe_filename(key.replace(":", "_"))
+        return self.sessions_dir / f"{safe_key}.jsonl"
+
+    def _legacy_path(self, key: str) -> Path | None:
+        """Legacy global session path (~/.nanobot/sessions/)."""
+        if self.legacy_dir is None:
+            return None
+        return self.legacy_dir / f"{safe_filename(key.replace(':', '_'))}.jsonl"
+
+    def _io_lock(self, key: str) -> threading.Lock:
+        return self._io_locks.setdefault(key, threading.Lock())
+
+    def load(self, key: str) -> Session | None:
+        path = self.path_for(key)
+        if not path.exists():
+            legacy_path = self._legacy_path(key)
+            if legacy_path and legacy_path.exists():
+                shutil.move(str(legacy_path), str(path))
+                logger.info("Migrated session {} from legacy path", key)
+
+        if not path.exists():
+            return None
+
+        try:
+            session = read_jsonl_session(path, key)
+        except Exception as e:
+            logger.warning("Failed to load session {}: {}", key, e)
+            return None
+        self._owners[key] = session
+        return session
+
+    def save(self, session: Session) -> None:
+        path = self.path_for(session.key)
+
+        with self._io_lock(session.key):
+            messages = session.messages
+            count = len(messages)
+            persisted = session._persisted
+            if not persisted or persisted > count or not path.exists():
+                # New file, a cleared session or one not loaded from this file
+                self._rewrite(path, session, messages, count)
+            else:
+                meta = _meta_state(session)
+                lines = [json.dumps(m, ensure_ascii=False) for m in messages[persisted:count]]
+                if meta != session._persisted_meta:
+                    lines.append(json.dumps(_metadata_record(session), ensure_ascii=False))
+                    session._trailers += 1
+                if lines:
+                    with open(path, "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+                _mark_persisted(session, messages, count, meta)
+            self._owners[session.key] = session
+
+        if session._trailers >= self.compact_after:
+            if self._compactor is None:
+                self._compactor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="session-compact")
+            self._compactor.submit(self._compact_in_background, session)
+
+    def _rewrite(self, path: Path, session: Session, messages: list[dict[str, Any]], count: int) -> None:
+        """Atomically replace the file with one metadata line and the first ``count`` messages."""
+        meta = _meta_state(session)
+        write_jsonl_session(path, session, messages[:count])
+        _mark_persisted(session, messages, count, meta)
+        session._trailers = 0
+
+    def compact(self, session: Session) -> None:
+        with self._io_lock(session.key):
+            path = self.path_for(session.key)
+            if session._persisted and path.exists():
+                self._rewrite(path, session, session.messages, session._persisted)
+
+    def _compact_in_background(self, session: Session) -> None:
+        if self._owners.get(session.key) is not session or session._trailers < self.compact_after:
+            return  # Superseded or already compacted
+        try:
+            self.compact(session)
+        except Exception as e:
+            logger.warning("Failed to compact session {}: {}", session.key, e)
+
+    def delete(self, key: str) -> bool:
+        with self._io_lock(key):
+            path = self.path_for(key)
+            self._owners.pop(key, None)
+            if not path.exists():
+                return False
+            path.unlink()
+            return True
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        sessions = []
+
+        for path in self.sessions_dir.glob("*.jsonl"):
+            try:
+                # Read just the metadata line
+                with open(path, encoding="utf-8") as f:
+                    first_line = f.readline().strip()
+                    if first_line:
+                        data = json.loads(first_line)
+                        if data.get("_type") == "metadata":
+                            key = data.get("key") or path.stem.replace("_", ":", 1)
+                            # Appends do not touch the header, so the file is newer than its updated_at
+                            modified = datetime.fromtimestamp(path.stat().st_mtime).isoformat()
+                            sessions.append({
+                                "key": key,
+                                "created_at": data.get("created_at"),
+                                "updated_at": max(data.get("updated_at") or "", modified),
+                                "path": str(path)
+                            })
+            except Exception:
+                continue
+
+        return sorted(sessions, key=lambda x: x.get("updated_at", ""), reverse=True)
+
+    def close(self) -> None:
+        if self._compactor:
+            self._compactor.shutdown(wait=True)
+            self._compactor = None
+
+
+def read_jsonl_session(path: Path, key: str) -> Session:
+    """Parse a session file in the JSONL layout (header and trailer metadata lines)."""
+    with open(path, encoding="utf-8") as f:
+        return parse_jsonl_session(f, key)
+
+
+def parse_jsonl_session(lines: Iterable[str], key: str) -> Session:
+    """Build a session from lines in the JSONL layout."""
+    from nanobot.session.manager import Session
+
+    messages = []
+    metadata = {}
+    created_at = None
+    updated_at = None
+    last_consolidated = 0
+    records = 0
+    torn = False
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError:
+            # A line cut short by a crash during an append
+            logger.warning("Skipping unreadable line in session {}", key)
+            torn = True
+            continue
+
+        if data.get("_type") == "metadata":
+            # Header, or a trailer appended later: the last one wins
+            records += 1
+            metadata = data.get("metadata", {})
+            created_at = datetime.fromisoformat(data["created_at"]) if data.get("created_at") else None
+            updated_at = datetime.fromisoformat(data["updated_at"]) if data.get("updated_at") else None
+            last_consolidated = data.get("last_consolidated", 0)
+        else:
+            messages.append(data)
+
+    session = Session(
+        key=key,
+        messages=messages,
+        created_at=created_at or datetime.now(),
+        updated_at=updated_at or datetime.now(),
+        metadata=metadata,
+        last_consolidated=last_consolidated
+    )
+    if records and not torn:  # A torn file is rewritten on the next save
+        session._persisted = len(messages)
+        session._persisted_meta = _meta_state(session)
+        session._trailers = records - 1
+    return session
+
+
+def write_jsonl_session(path: Path, session: Session, messages: list[dict[str, Any]]) -> None:
+    """Write a session file in the JSONL layout atomically (temp file, fsync, rename)."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(_metadata_record(session), ensure_ascii=False) + "\n")
+        for msg in messages:
+            f.write(json.dumps(msg, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    key TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    last_consolidated INTEGER NOT NULL DEFAULT 0,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS sessions_updated_at ON sessions (updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    session TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (session, seq)
+) WITHOUT ROWID;
+"""
+
+
+class SqliteSessionStore(SessionStore):
+    """
+    All sessions in one SQLite database in WAL mode.
+
+    Each message is a row keyed by (session, seq), so saving inserts only
+    the new rows, and history tails are read with an indexed ``LIMIT``
+    query. The sessions table keeps metadata, ``updated_at`` (indexed, for
+    listing) and the message count. WAL mode with a busy timeout lets
+    several processes (e.g. agent workers) share one store safely.
+    """
+
+    def __init__(self, path: Path, busy_timeout_ms: int = 5000):
+        self.path = path
+        ensure_dir(path.parent)
+        self._db = sqlite3.connect(str(path), isolation_level=None, check_same_thread=False)
+        self._db.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SQLITE_SCHEMA)
+        self._lock = threading.Lock()  # One connection, shared with background threads
+
+    def load(self, key: str) -> Session | None:
+        from nanobot.session.manager import Session
+
+        with self._lock:
+            row = self._db.execute(
+                "SELECT created_at, updated_at, metadata, last_consolidated FROM sessions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            bodies = self._db.execute(
+                "SELECT body FROM messages WHERE session = ? ORDER BY seq", (key,)
+            ).fetchall()
+        session = Session(
+            key=key,
+            messages=[json.loads(body) for (body,) in bodies],
+            created_at=datetime.fromisoformat(row[0]),
+            updated_at=datetime.fromisoformat(row[1]),
+            metadata=json.loads(row[2]),
+            last_consolidated=row[3],
+        )
+        session._persisted = len(session.messages)
+        session._persisted_meta = _meta_state(session)
+        return session
+
+    def save(self, session: Session) -> None:
+        messages = session.messages
+        count = len(messages)
+        meta = _meta_state(session)
+        persisted = session._persisted
+        rewrite = not persisted or persisted > count
+        start = 0 if rewrite else persisted
+        rows = [
+            (session.key, seq, json.dumps(m, ensure_ascii=False))
+            for seq, m in enumerate(messages[start:count], start)
+        ]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                if rewrite:
+                    self._db.execute("DELETE FROM messages WHERE session = ?", (session.key,))
+                self._db.executemany("INSERT INTO messages (session, seq, body) VALUES (?, ?, ?)", rows)
+                self._db.execute(
+                    "INSERT INTO sessions (key, created_at, updated_at, metadata, last_consolidated, message_count)"
+                    " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET"
+                    " updated_at = excluded.updated_at, metadata = excluded.metadata,"
+                    " last_consolidated = excluded.last_consolidated, message_count = excluded.message_count",
+                    (
+                        session.key, session.created_at.isoformat(), session.updated_at.isoformat(),
+                        json.dumps(session.metadata, ensure_ascii=False), session.last_consolidated, count,
+                    ),
+                )
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        _mark_persisted(session, messages, count, meta)
+
+    def get_history(self, key: str, max_messages: int) -> list[dict[str, Any]]:
+        if max_messages <= 0:
+            return []
+        with self._lock:
+            bodies = self._db.execute(
+                "SELECT body FROM messages WHERE session = ? ORDER BY seq DESC LIMIT ?", (key, max_messages)
+            ).fetchall()
+        return [json.loads(body) for (body,) in reversed(bodies)]
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM messages WHERE session = ?", (key,))
+                deleted = self._db.execute("DELETE FROM sessions WHERE key = ?", (key,)).rowcount
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return bool(deleted)
+
+    def list_sessions(self) -> list[dict[str, Any]]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT key, created_at, updated_at, message_count FROM sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [
+            {"key": key, "created_at": created, "updated_at": updated, "messages": count, "path": str(self.path)}
+            for key, created, updated, count in rows
+        ]
+
+    def compact(self, session: Session) -> None:
+        """Checkpoint the WAL (rows are deleted in place, so there is nothing per session)."""
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def vacuum(self) -> int:
+        """Checkpoint the WAL and rebuild the database to reclaim free pages; returns bytes reclaimed."""
+        before = self.path.stat().st_size
+        with self._lock:
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._db.execute("VACUUM")
+        return before - self.path.stat().st_size
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def migrate_sessions(source: SessionStore, target: SessionStore) -> int:
+    """
+    Copy every session of ``source`` into ``target``, replacing sessions of
+    the same key there. Returns the number of sessions copied.
+    """
+    copied = 0
+    for info in source.list_sessions():
+        session = source.load(info["key"])
+        if session is None:
+            continue
+        session._persisted = 0  # Write it out in full
+        target.save(session)
+        copied += 1
+    return copied
@@ -1,7 +1,9 @@
 """Utility functions for nanobot."""
 
+import json
 from pathlib import Path
 from datetime import datetime
+from typing import Any
 
 
 def ensure_dir(path: Path) -> Path:
@@ -78,3 +80,36 @@ def parse_session_key(key: str) -> tuple[str, str]:
     if len(parts) != 2:
         raise ValueError(f"Invalid session key: {key}")
     return parts[0], parts[1]
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheaply estimate the token count of a text without a tokenizer.
+
+    ASCII text averages about four characters per token, while CJK and other
+    multi-byte characters are closer to one token each.
+    """
+    if not text:
+        return 0
+    chars = len(text)
+    # Every non-ASCII character adds one to three extra UTF-8 bytes; two is typical
+    non_ascii = min(chars, (len(text.encode("utf-8")) - chars) // 2)
+    return (chars - non_ascii) // 4 + non_ascii + 1
+
+
+def estimate_message_tokens(message: dict[str, Any]) -> int:
+    """Estimate the prompt tokens of one chat message, including tool calls."""
+    content = message.get("content")
+    if isinstance(content, str):
+        tokens = estimate_tokens(content)
+    elif isinstance(content, list):
+        tokens = sum(
+            estimate_tokens(block.get("text", "")) if block.get("type") == "text" else 1000  # images
+            for block in content if isinstance(block, dict)
+        )
+    else:
+        tokens = 0
+    if message.get("tool_calls"):
+        tokens += estimate_tokens(json.dumps(message["tool_calls"], ensure_ascii=False))
+    return tokens + 4  # Role and message framing
+
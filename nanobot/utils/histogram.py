@@ -0,0 +1,44 @@
+"""Fixed-memory latency histogram."""
+
+import math
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram.
+
+    Buckets grow by 2^(1/4) (about 19%), so percentiles are accurate to
+    within one bucket while memory stays constant.
+    """
+
+    _BASE_MS = 0.1
+    _GROWTH = 2 ** 0.25
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, ms: float) -> None:
+        index = 0 if ms <= self._BASE_MS else math.ceil(math.log(ms / self._BASE_MS, self._GROWTH))
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th percentile (0-100)."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * q / 100))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(self._BASE_MS * self._GROWTH ** index, self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
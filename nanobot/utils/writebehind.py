@@ -0,0 +1,137 @@
+"""Write-behind queue that moves blocking file writes off the event loop."""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Hashable
+
+from loguru import logger
+
+
+class _Write:
+    __slots__ = ("fn", "futures")
+
+    def __init__(self, fn: Callable[[], Any]):
+        self.fn = fn
+        self.futures: list[Future] = []
+
+
+class WriteBehind:
+    """
+    Runs blocking writes on one dedicated thread, in submission order.
+
+    A write submitted under a key replaces a pending (not yet started) write
+    with the same key and keeps its place in the queue, so several saves of
+    one session within ``window_ms`` collapse into one. Writes without a key
+    (e.g. appends) are never merged. After the first write arrives the thread
+    waits ``window_ms`` to gather more, then writes them as one batch.
+
+    ``submit`` returns a future resolved when the write has landed, for
+    callers that need to know. ``close`` (or ``flush``) drains the queue.
+    """
+
+    def __init__(self, window_ms: int = 50, name: str = "write-behind"):
+        self.window = window_ms / 1000
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._queue: OrderedDict[Hashable, _Write] = OrderedDict()
+        self._cond = threading.Condition()
+        self._active = 0  # Writes taken by the thread and not yet finished
+        self._flushing = 0
+        self._closed = False
+        self._seq = 0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, key: Hashable | None, fn: Callable[[], Any]) -> Future:
+        """Queue a write; a pending write with the same key is replaced by this one."""
+        future: Future = Future()
+        with self._cond:
+            if not self._closed:
+                if key is None:
+                    self._seq += 1
+                    key = (WriteBehind, self._seq)
+                write = self._queue.get(key)
+                if write is None:
+                    write = self._queue[key] = _Write(fn)
+                    self._cond.notify_all()
+                else:
+                    write.fn = fn
+                    self.coalesced += 1
+                write.futures.append(future)
+                return future
+
+        # Closed: nobody will drain the queue, so write in the caller
+        self._execute(_Write(fn), [future])
+        return future
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                deadline = time.monotonic() + self.window
+                while not self._closed and not self._flushing:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = list(self._queue.values())
+                self._queue.clear()
+                self._active = len(batch)
+
+            for write in batch:
+                self._execute(write, write.futures)
+
+            with self._cond:
+                self._active = 0
+                self._cond.notify_all()
+
+    def _execute(self, write: _Write, futures: list[Future]) -> None:
+        try:
+            result = write.fn()
+        except Exception as e:
+            self.failed += 1
+            logger.warning("Background write failed: {}", e)
+            for future in futures:
+                future.set_exception(e)
+        else:
+            self.written += 1
+            for future in futures:
+                future.set_result(result)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Write everything queued now, skipping the window; False on timeout."""
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                return self._cond.wait_for(lambda: not self._queue and not self._active, timeout)
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout: float | None = None) -> None:
+        """Drain the queue and stop the thread; later writes run in the caller."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            logger.warning("Background writes still pending at shutdown: {}", self.pending)
+
+    @property
+    def pending(self) -> int:
+        """Writes queued or in progress."""
+        return len(self._queue) + self._active
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "pending": self.pending,
+            "written": self.written,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+        }
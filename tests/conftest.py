@@ -0,0 +1,47 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from nanobot.agent.loop import AgentLoop
+from nanobot.bus.events import InboundMessage, OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.providers.scripted_provider import ScriptedProvider
+
+
+def inbound(chat_id: str = "c1", content: str = "hi", channel: str = "test", **metadata) -> InboundMessage:
+    return InboundMessage(channel=channel, sender_id="u1", chat_id=chat_id, content=content, metadata=metadata)
+
+
+async def replies(bus: MessageBus, count: int, timeout: float = 5.0) -> list[OutboundMessage]:
+    """The next ``count`` final (non-progress, non-stream) outbound messages."""
+    out: list[OutboundMessage] = []
+    async with asyncio.timeout(timeout):
+        while len(out) < count:
+            msg = await bus.consume_outbound()
+            if not (msg.metadata.get("_progress") or msg.metadata.get("_stream")):
+                out.append(msg)
+    return out
+
+
+@pytest.fixture
+def make_agent(tmp_path: Path):
+    """Build an AgentLoop over a ScriptedProvider; run() is started and stopped with the test."""
+    started: list[tuple[AgentLoop, asyncio.Task]] = []
+
+    def _make(script=None, latency_ms: float = 0.0, bus: MessageBus | None = None, run: bool = True, **kwargs):
+        agent = AgentLoop(
+            bus=bus or MessageBus(),
+            provider=ScriptedProvider(script, latency_ms=latency_ms),
+            workspace=tmp_path,
+            memory_window=10_000,
+            **kwargs,
+        )
+        if run:
+            started.append((agent, asyncio.create_task(agent.run())))
+        return agent
+
+    yield _make
+    for agent, task in started:
+        agent.stop()
+        task.cancel()
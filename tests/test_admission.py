@@ -0,0 +1,56 @@
+import pytest
+
+from nanobot.bus import admission as admission_module
+from nanobot.bus.admission import AdmissionController
+from nanobot.bus.queue import MessageBus
+from tests.conftest import inbound
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(admission_module.time, "monotonic", lambda: now[0])
+    return now
+
+
+def _dequeue_every(controller: AdmissionController, clock: list[float], seconds: float, depths: list[int]) -> None:
+    for depth in depths:
+        clock[0] += seconds
+        controller.observe_dequeue(depth)
+
+
+def test_idle_gaps_do_not_count_as_busy_time(clock):
+    controller = AdmissionController(max_estimated_wait_s=1)
+    _dequeue_every(controller, clock, 0.1, [5, 4, 3, 0])
+    clock[0] += 120  # Idle: nothing was waiting
+    _dequeue_every(controller, clock, 0.1, [2, 1])
+    assert controller.drain_rate == pytest.approx(10)
+    assert controller.estimated_wait(20) == pytest.approx(2)
+
+
+def test_drain_rate_follows_recent_load(clock):
+    controller = AdmissionController()
+    _dequeue_every(controller, clock, 1.0, [10] * 100)
+    assert controller.drain_rate == pytest.approx(1)
+    _dequeue_every(controller, clock, 0.1, [10] * 100)
+    assert controller.drain_rate == pytest.approx(10)
+
+
+def test_unknown_rate_admits(clock):
+    controller = AdmissionController(max_estimated_wait_s=1)
+    assert controller.drain_rate is None
+    assert controller.check(inbound(), depth=1000) is None
+
+
+async def test_bus_rejects_when_backlog_exceeds_deadline(clock):
+    bus = MessageBus()
+    bus.admission = AdmissionController()
+    for n in range(30):
+        await bus.publish_inbound(inbound(chat_id=f"c{n}"))
+    for _ in range(10):
+        clock[0] += 0.5  # Two messages a second
+        await bus.consume_inbound()
+    assert bus.admit(inbound(), deadline_s=60) is None
+    rejection = bus.admit(inbound(), deadline_s=5)
+    assert rejection is not None and rejection.reason == "deadline"
+    assert rejection.retry_after == pytest.approx(5)
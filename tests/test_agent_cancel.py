@@ -0,0 +1,99 @@
+import asyncio
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from tests.conftest import inbound, replies
+
+TOOLS_THEN_ANSWER = [[
+    {"tool_calls": [{"name": "list_dir", "arguments": {"path": "."}}, {"name": "slow", "arguments": {}}]},
+    {"content": "Done."},
+]]
+
+
+class SlowTool(Tool):
+    def __init__(self):
+        self.started = asyncio.Event()
+
+    @property
+    def name(self) -> str:
+        return "slow"
+
+    @property
+    def description(self) -> str:
+        return "Takes a long time"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return True
+
+    async def execute(self, **kwargs: Any) -> str:
+        self.started.set()
+        await asyncio.sleep(30)
+        return "finished"
+
+
+def _agent_with_slow_tool(make_agent, **kwargs):
+    agent = make_agent(TOOLS_THEN_ANSWER, **kwargs)
+    slow = SlowTool()
+    agent.tools.register(slow)
+    return agent, slow
+
+
+async def test_stop_cancels_running_turn_and_keeps_finished_tool_calls(make_agent):
+    agent, slow = _agent_with_slow_tool(make_agent)
+    await agent.bus.publish_inbound(inbound(content="look around"))
+    await asyncio.wait_for(slow.started.wait(), 5)
+    await agent.bus.publish_inbound(inbound(content="/stop"))
+    (reply,) = await replies(agent.bus, 1)
+    assert reply.content == "⏹ Stopped."
+
+    for _ in range(50):
+        if not agent._active_turns:
+            break
+        await asyncio.sleep(0.01)
+    session = agent.sessions.get_or_create("test:c1")
+    roles = [m["role"] for m in session.messages]
+    assert roles == ["user", "assistant", "tool", "assistant"]
+    call = session.messages[1]
+    assert [tc["function"]["name"] for tc in call["tool_calls"]] == ["list_dir"]
+    assert session.messages[2]["tool_call_id"] == call["tool_calls"][0]["id"]
+    assert session.messages[3]["content"] == agent._CANCELLED_REPLY
+
+    history = session.get_history()
+    assert [m["role"] for m in history] == roles
+
+
+async def test_stop_without_running_turn(make_agent):
+    agent = make_agent()
+    await agent.bus.publish_inbound(inbound(content="/stop"))
+    (reply,) = await replies(agent.bus, 1)
+    assert reply.content == "Nothing to stop."
+
+
+async def test_supersede_cancels_running_turn(make_agent):
+    agent, slow = _agent_with_slow_tool(make_agent, turn_policy="supersede")
+    await agent.bus.publish_inbound(inbound(content="first"))
+    await asyncio.wait_for(slow.started.wait(), 5)
+    agent.tools.unregister("slow")  # The newer turn answers without waiting on it
+    await agent.bus.publish_inbound(inbound(content="second"))
+    (reply,) = await replies(agent.bus, 1)
+    assert reply.content == "Done."
+    contents = [m["content"] for m in agent.sessions.get_or_create("test:c1").messages if m["role"] == "user"]
+    assert contents == ["first", "second"]
+
+
+async def test_cancel_request_tells_the_requester(make_agent):
+    agent, slow = _agent_with_slow_tool(make_agent)
+    await agent.bus.publish_inbound(inbound(content="work", request_id="r1"))
+    await asyncio.wait_for(slow.started.wait(), 5)
+    assert agent.cancel_request("r1")
+    async with asyncio.timeout(5):
+        while True:
+            msg = await agent.bus.consume_outbound()
+            if msg.metadata.get("_cancelled"):
+                break
+    assert msg.metadata["request_id"] == "r1"
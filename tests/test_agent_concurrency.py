@@ -0,0 +1,55 @@
+import asyncio
+import time
+
+from tests.conftest import inbound, replies
+
+# One trace per turn of a session: the nth message of a chat gets "reply n"
+NUMBERED = [[{"content": f"reply {n}"}] for n in range(3)]
+
+
+async def test_sessions_run_concurrently(make_agent):
+    agent = make_agent(latency_ms=200, max_concurrent_turns=4)
+    started = time.perf_counter()
+    for chat in range(4):
+        await agent.bus.publish_inbound(inbound(chat_id=str(chat)))
+    out = await replies(agent.bus, 4)
+    assert sorted(m.chat_id for m in out) == ["0", "1", "2", "3"]
+    assert time.perf_counter() - started < 0.6  # 0.8 s if the turns ran one after another
+
+
+async def test_turns_of_one_session_run_in_order(make_agent):
+    agent = make_agent(NUMBERED, latency_ms=20)
+    for n in range(3):
+        await agent.bus.publish_inbound(inbound(content=f"message {n}"))
+    out = await replies(agent.bus, 3)
+    # Each turn saw the previous ones in its history, so none overlapped
+    assert [m.content for m in out] == ["reply 0", "reply 1", "reply 2"]
+
+
+async def test_max_concurrent_turns_is_a_limit(make_agent):
+    agent = make_agent(latency_ms=150, max_concurrent_turns=2)
+    started = time.perf_counter()
+    for chat in range(4):
+        await agent.bus.publish_inbound(inbound(chat_id=str(chat)))
+    await replies(agent.bus, 4)
+    assert time.perf_counter() - started >= 0.3
+
+
+async def test_failing_turn_does_not_stop_other_sessions(make_agent, monkeypatch):
+    agent = make_agent()
+    original = agent._process_message
+
+    async def process(msg, **kwargs):
+        if msg.chat_id == "bad":
+            raise RuntimeError("boom")
+        return await original(msg, **kwargs)
+
+    monkeypatch.setattr(agent, "_process_message", process)
+    await agent.bus.publish_inbound(inbound(chat_id="bad"))
+    await agent.bus.publish_inbound(inbound(chat_id="good"))
+    out = {m.chat_id: m.content for m in await replies(agent.bus, 2)}
+    assert "boom" in out["bad"]
+    assert out["good"] == "Done."
+    for _ in range(10):  # Workers exit a few loop iterations after their last reply
+        await asyncio.sleep(0)
+    assert not agent._session_workers
@@ -0,0 +1,44 @@
+from nanobot.bench.agent import BenchResult, baseline_mismatch, compare_to_baseline, run_agent_bench
+
+
+async def test_bench_runs_every_message():
+    result = await run_agent_bench(chats=3, messages_per_chat=2, latency_ms=0)
+    assert result.messages == 6
+    assert result.latency_ms["p50"] > 0
+    assert result.host["cpus"]
+    assert result.calibration_ms > 0
+
+
+def _result(**changes):
+    base = {
+        "params": {"chats": 1},
+        "messages": 10,
+        "duration_s": 1.0,
+        "messages_per_sec": 100.0,
+        "latency_ms": {"p50": 10.0, "p95": 20.0, "p99": 30.0, "max": 30.0},
+        "loop_lag_ms": {"p50": 0.1, "p95": 0.5, "p99": 1.0, "max": 2.0},
+        "peak_rss_mb": None,
+        "host": {"machine": "x86_64", "cpus": 8},
+        "calibration_ms": 50.0,
+    }
+    return BenchResult(**{**base, **changes})
+
+
+def test_regressions_are_reported():
+    baseline = _result().to_dict()
+    assert compare_to_baseline(_result(), baseline) == []
+    problems = compare_to_baseline(_result(messages_per_sec=50.0), baseline)
+    assert len(problems) == 1 and "throughput" in problems[0]
+
+
+def test_slower_host_relaxes_the_limits():
+    baseline = _result().to_dict()
+    busy = _result(messages_per_sec=50.0, calibration_ms=100.0)
+    assert compare_to_baseline(busy, baseline) == []
+
+
+def test_baselines_of_other_hosts_are_not_compared():
+    baseline = _result().to_dict()
+    assert baseline_mismatch(_result(), baseline) is None
+    assert "host" in baseline_mismatch(_result(host={"machine": "arm64", "cpus": 8}), baseline)
+    assert "parameters" in baseline_mismatch(_result(params={"chats": 2}), baseline)
@@ -0,0 +1,88 @@
+import asyncio
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from nanobot.bus.broker import BusBroker
+from nanobot.bus.remote import RemoteMessageBus
+from tests.conftest import inbound
+
+
+@pytest.fixture
+async def broker():
+    with tempfile.TemporaryDirectory(dir="/tmp") as tmp:  # Unix socket paths are short
+        server = BusBroker(Path(tmp) / "broker.sock")
+        await server.start()
+        yield server
+        await server.stop()
+
+
+async def _connect(broker: BusBroker, role: str, name: str, **kwargs) -> RemoteMessageBus:
+    bus = RemoteMessageBus(broker.path, role=role, name=name, reconnect_delay=0.05, **kwargs)
+    await bus.connect(timeout=5)
+    return bus
+
+
+async def _settle() -> None:
+    for _ in range(20):
+        await asyncio.sleep(0.01)
+
+
+async def test_worker_gets_at_most_prefetch_messages(broker):
+    worker = await _connect(broker, "worker", "w", prefetch=2)
+    frontend = await _connect(broker, "frontend", "f")
+    try:
+        for n in range(5):
+            await frontend.publish_inbound(inbound(chat_id=f"c{n}", content=f"m{n}"))
+        await _settle()
+        assert worker.inbound_size == 2
+        assert broker.status()["inbound_queued"] == 3
+
+        msg = await worker.consume_inbound()
+        worker.ack(msg)
+        await _settle()
+        assert broker.status()["workers"]["w"]["inflight"] == 2
+        assert broker.status()["inbound_queued"] == 2
+    finally:
+        await frontend.close()
+        await worker.close()
+
+
+async def test_scheduler_orders_messages_waiting_for_a_credit(broker):
+    worker = await _connect(broker, "worker", "w", prefetch=1)
+    frontend = await _connect(broker, "frontend", "f")
+    try:
+        for n in range(4):
+            await frontend.publish_inbound(inbound(chat_id="noisy", content=f"n{n}"))
+        got = [await asyncio.wait_for(worker.consume_inbound(), 5)]
+        # Arrives after the noisy chat's backlog, but is not queued behind all of it at the worker
+        await frontend.publish_inbound(inbound(chat_id="quiet", content="q0"))
+        for _ in range(4):
+            worker.ack(got[-1])
+            got.append(await asyncio.wait_for(worker.consume_inbound(), 5))
+        assert [m.content for m in got] == ["n0", "n1", "q0", "n2", "n3"]
+    finally:
+        await frontend.close()
+        await worker.close()
+
+
+async def test_unacked_messages_move_to_remaining_worker(broker):
+    frontend = await _connect(broker, "frontend", "f")
+    first = await _connect(broker, "worker", "w1", prefetch=1)
+    second = await _connect(broker, "worker", "w2", prefetch=1)
+    try:
+        for n in range(4):
+            await frontend.publish_inbound(inbound(chat_id=f"c{n}"))
+        await _settle()
+        await first.close()
+        got = []
+        for _ in range(4):
+            msg = await asyncio.wait_for(second.consume_inbound(), 5)
+            got.append(msg.chat_id)
+            second.ack(msg)
+        assert sorted(got) == ["c0", "c1", "c2", "c3"]
+        assert broker.status()["inbound_queued"] == 0
+    finally:
+        await frontend.close()
+        await second.close()
@@ -0,0 +1,52 @@
+import asyncio
+
+import pytest
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import BusClosedError, MessageBus
+from tests.conftest import inbound
+from tests.test_agent_cancel import _agent_with_slow_tool
+
+
+async def test_consumers_wake_on_message_without_polling():
+    bus = MessageBus()
+    received = []
+
+    async def consume():
+        async for msg in bus.inbound_stream():
+            received.append(msg.content)
+
+    consumer = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    await bus.publish_inbound(inbound(content="a"))
+    await asyncio.sleep(0.01)
+    assert received == ["a"]
+    await bus.close()
+    await asyncio.wait_for(consumer, 1)
+
+
+async def test_close_drains_queued_messages_then_ends_streams():
+    bus = MessageBus()
+    for n in range(2):
+        await bus.publish_outbound(OutboundMessage(channel="test", chat_id="c1", content=str(n)))
+    await bus.close()
+    with pytest.raises(BusClosedError):
+        await bus.publish_inbound(inbound())
+
+    async def drain():
+        return [m.content async for m in bus.outbound_stream()]
+
+    # Every consumer sees the end of the stream, not just the first one
+    first, second = await asyncio.wait_for(asyncio.gather(drain(), drain()), 1)
+    assert sorted(first + second) == ["0", "1"]
+
+
+async def test_turn_cancelled_after_close_does_not_raise(make_agent):
+    agent, slow = _agent_with_slow_tool(make_agent)
+    await agent.bus.publish_inbound(inbound(content="work", request_id="r1"))
+    await asyncio.wait_for(slow.started.wait(), 5)
+    _, task = agent._active_turns["test:c1"]
+    await agent.bus.close()
+    assert agent.cancel_request("r1")
+    await asyncio.wait({task}, timeout=5)
+    assert task.cancelled()
@@ -0,0 +1,77 @@
+import asyncio
+from types import SimpleNamespace
+
+from telegram import MessageEntity
+
+from nanobot.bus.events import InboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.coalesce import InboundCoalescer
+from nanobot.channels.discord import DiscordChannel
+from nanobot.channels.telegram import TelegramChannel
+from nanobot.config.schema import DiscordConfig, TelegramConfig
+from tests.conftest import inbound
+
+
+def _coalescer(**kwargs) -> tuple[InboundCoalescer, list[InboundMessage]]:
+    published: list[InboundMessage] = []
+
+    async def publish(msg: InboundMessage) -> None:
+        published.append(msg)
+
+    return InboundCoalescer(publish, **kwargs), published
+
+
+async def test_burst_is_merged_after_the_window():
+    coalescer, published = _coalescer(window_ms=50)
+    for n in range(3):
+        await coalescer.submit(inbound(content=f"part {n}"))
+    assert published == []
+    await asyncio.sleep(0.2)
+    assert [m.content for m in published] == ["part 0\npart 1\npart 2"]
+    assert published[0].metadata["coalesced_count"] == 3
+
+
+async def test_mention_flushes_the_burst_at_once():
+    coalescer, published = _coalescer(window_ms=10_000)
+    await coalescer.submit(inbound(content="so about that"))
+    await coalescer.submit(inbound(content="@bot what do you think", was_mentioned=True))
+    assert [m.content for m in published] == ["so about that\n@bot what do you think"]
+    assert coalescer.pending == 0
+
+
+async def test_discord_sets_mention_flag():
+    bus = MessageBus()
+    channel = DiscordChannel(DiscordConfig(token="t"), bus)
+    channel._bot_user_id = "42"
+
+    async def no_typing(channel_id: str) -> None:
+        pass
+
+    channel._start_typing = no_typing
+    base = {"author": {"id": "7"}, "channel_id": "c1"}
+    await channel._handle_message_create({**base, "id": "1", "content": "hi <@42>", "mentions": [{"id": "42"}]})
+    await channel._handle_message_create({**base, "id": "2", "content": "thanks", "referenced_message": {
+        "id": "0", "author": {"id": "42"},
+    }})
+    await channel._handle_message_create({**base, "id": "3", "content": "hi all", "mentions": [{"id": "8"}]})
+    flags = [(await bus.consume_inbound()).metadata["was_mentioned"] for _ in range(3)]
+    assert flags == [True, True, False]
+
+
+def test_telegram_detects_mentions_and_replies():
+    channel = TelegramChannel(TelegramConfig(token="t"), MessageBus())
+    channel._bot_id, channel._bot_username = 42, "NanoBot"
+
+    def message(entities=None, reply_from=None):
+        reply = SimpleNamespace(from_user=SimpleNamespace(id=reply_from)) if reply_from else None
+        return SimpleNamespace(
+            reply_to_message=reply,
+            parse_entities=lambda: entities or {},
+            parse_caption_entities=lambda: {},
+        )
+
+    mention = MessageEntity(type="mention", offset=0, length=8)
+    assert channel._mentions_bot(message({mention: "@nanobot"}))
+    assert channel._mentions_bot(message(reply_from=42))
+    assert not channel._mentions_bot(message({mention: "@someone"}))
+    assert not channel._mentions_bot(message(reply_from=7))
@@ -0,0 +1,110 @@
+from pathlib import Path
+
+from nanobot.agent.context import ContextBuilder
+
+SKILL = """---
+name: notes
+description: Keeps notes.
+always: true
+---
+
+{body}
+"""
+
+
+def _expire(builder: ContextBuilder) -> None:
+    """Age every cached segment past the revalidate window."""
+    for segment in builder._segments.values():
+        segment.checked_at -= builder.REVALIDATE_INTERVAL
+
+
+def _write_skill(workspace: Path, body: str) -> Path:
+    path = workspace / "skills" / "notes" / "SKILL.md"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(SKILL.format(body=body), encoding="utf-8")
+    return path
+
+
+def test_edited_bootstrap_file_is_picked_up_after_the_window(tmp_path):
+    agents = tmp_path / "AGENTS.md"
+    agents.write_text("Be brief.", encoding="utf-8")
+    builder = ContextBuilder(tmp_path)
+    assert "Be brief." in builder.build_system_prompt()
+
+    agents.write_text("Be thorough and cite sources.", encoding="utf-8")
+    assert "Be brief." in builder.build_system_prompt()  # Trusted within the window
+    _expire(builder)
+    prompt = builder.build_system_prompt()
+    assert "Be thorough and cite sources." in prompt and "Be brief." not in prompt
+
+
+def test_edited_skill_is_picked_up_after_the_window(tmp_path):
+    skill = _write_skill(tmp_path, "Write notes to notes.md")
+    builder = ContextBuilder(tmp_path)
+    assert "Write notes to notes.md" in builder.build_system_prompt()
+
+    skill.write_text(SKILL.format(body="Write notes to the journal directory"), encoding="utf-8")
+    _expire(builder)
+    prompt = builder.build_system_prompt()
+    assert "Write notes to the journal directory" in prompt
+    assert "Write notes to notes.md" not in prompt
+
+
+def test_unchanged_files_are_not_read_again(tmp_path, monkeypatch):
+    (tmp_path / "AGENTS.md").write_text("Be brief.", encoding="utf-8")
+    _write_skill(tmp_path, "Write notes to notes.md")
+    builder = ContextBuilder(tmp_path, prompt_layout="stable")  # No clock in the system prompt
+    first = builder.build_system_prompt()
+    rebuilds = {name: s.rebuilds for name, s in builder.cache_stats.items()}
+
+    reads: list[Path] = []
+    read_text = Path.read_text
+    monkeypatch.setattr(Path, "read_text", lambda self, *a, **kw: reads.append(self) or read_text(self, *a, **kw))
+    assert builder.build_system_prompt() == first
+    _expire(builder)
+    assert builder.build_system_prompt() == first
+    assert reads == []
+    assert {name: s.rebuilds for name, s in builder.cache_stats.items()} == rebuilds
+    assert builder.cache_stats["bootstrap"].hits == 2
+
+
+def test_stable_layout_keeps_the_system_prompt_identical(tmp_path, monkeypatch):
+    (tmp_path / "AGENTS.md").write_text("Be brief.", encoding="utf-8")
+    builder = ContextBuilder(tmp_path, prompt_layout="stable")
+    history = [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+
+    monkeypatch.setattr(ContextBuilder, "_current_time", staticmethod(lambda: "2026-01-01 09:00 (Thursday) (UTC)"))
+    first = builder.build_messages(history, "What's new?", channel="telegram", chat_id="42")
+    builder.memory.write_long_term("## User Information\n\n- Name: Sam\n")
+    monkeypatch.setattr(ContextBuilder, "_current_time", staticmethod(lambda: "2026-01-01 17:30 (Thursday) (UTC)"))
+    _expire(builder)
+    second = builder.build_messages(history, "And now?", channel="slack", chat_id="C7")
+
+    assert first[0]["role"] == "system" and first[0]["content"] == second[0]["content"]
+    assert first[1:-1] == second[1:-1] == history
+    system = first[0]["content"]
+    assert "09:00" not in system and "telegram" not in system and "Name: Sam" not in system
+
+    runtime, _, text = second[-1]["content"].partition("\n[/Runtime Context]\n\n")
+    assert text == "And now?"
+    assert runtime.startswith("[Runtime Context")
+    assert "Current Time: 2026-01-01 17:30" in runtime
+    assert "Channel: slack\nChat ID: C7" in runtime
+    assert "- Name: Sam" in runtime
+
+
+def test_deleted_files_drop_their_segments(tmp_path):
+    agents = tmp_path / "AGENTS.md"
+    agents.write_text("Be brief.", encoding="utf-8")
+    skill = _write_skill(tmp_path, "Write notes to notes.md")
+    builder = ContextBuilder(tmp_path)
+    prompt = builder.build_system_prompt()
+    assert "## AGENTS.md" in prompt and "<name>notes</name>" in prompt
+
+    agents.unlink()
+    skill.unlink()
+    skill.parent.rmdir()
+    _expire(builder)
+    prompt = builder.build_system_prompt()
+    assert "## AGENTS.md" not in prompt
+    assert "<name>notes</name>" not in prompt and "Write notes to notes.md" not in prompt
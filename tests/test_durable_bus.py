@@ -0,0 +1,93 @@
+import asyncio
+
+from nanobot.bus.durable import DurableMessageBus
+from nanobot.bus.events import OutboundMessage
+from tests.conftest import inbound, replies
+from tests.test_agent_cancel import _agent_with_slow_tool
+
+
+async def _reopen(bus: DurableMessageBus) -> DurableMessageBus:
+    await bus.close()
+    return DurableMessageBus(bus.path)
+
+
+async def test_unacked_messages_are_replayed_in_order(tmp_path):
+    bus = DurableMessageBus(tmp_path / "bus.db")
+    for n in range(3):
+        await bus.publish_inbound(inbound(content=f"m{n}", request_id=f"r{n}"))
+    first = await bus.consume_inbound()
+    bus.ack(first)
+
+    bus = await _reopen(bus)
+    assert bus.replayed == 2
+    replayed = [await bus.consume_inbound() for _ in range(2)]
+    assert [m.content for m in replayed] == ["m1", "m2"]
+    assert replayed[0].metadata == {"request_id": "r1"}
+    assert replayed[0].timestamp >= first.timestamp
+    for msg in replayed:
+        bus.ack(msg)
+
+    bus = await _reopen(bus)
+    assert bus.replayed == 0
+    await bus.close()
+
+
+async def test_nacked_message_is_delivered_again(tmp_path):
+    bus = DurableMessageBus(tmp_path / "bus.db")
+    await bus.publish_inbound(inbound(content="retry"))
+    msg = await bus.consume_inbound()
+    bus.nack(msg)
+    again = await bus.consume_inbound()
+    assert again is msg
+    bus.ack(again)
+    assert bus.pending == 0
+    await bus.close()
+
+
+async def test_transient_outbound_events_are_not_logged(tmp_path):
+    bus = DurableMessageBus(tmp_path / "bus.db")
+    for meta in ({"_progress": True}, {"_stream": True, "_stream_id": "s1"}, {}):
+        await bus.publish_outbound(OutboundMessage(channel="test", chat_id="c1", content="x", metadata=meta))
+    assert bus.pending == 1
+    assert bus.outbound_size == 3
+
+    bus = await _reopen(bus)
+    assert bus.replayed == 1
+    assert (await bus.consume_outbound()).metadata == {}
+    await bus.close()
+
+
+async def test_turn_interrupted_by_shutdown_is_replayed(make_agent, tmp_path):
+    bus = DurableMessageBus(tmp_path / "bus.db")
+    agent, slow = _agent_with_slow_tool(make_agent, bus=bus)
+    await bus.publish_inbound(inbound(content="long job"))
+    await asyncio.wait_for(slow.started.wait(), 5)
+    agent.stop()
+    for _ in range(50):
+        if not agent._active_turns:
+            break
+        await asyncio.sleep(0.01)
+
+    bus = await _reopen(bus)
+    assert bus.replayed == 1
+    assert (await bus.consume_inbound()).content == "long job"
+    await bus.close()
+
+
+async def test_stopped_turn_is_not_replayed(make_agent, tmp_path):
+    bus = DurableMessageBus(tmp_path / "bus.db")
+    agent, slow = _agent_with_slow_tool(make_agent, bus=bus)
+    await bus.publish_inbound(inbound(content="long job"))
+    await asyncio.wait_for(slow.started.wait(), 5)
+    await bus.publish_inbound(inbound(content="/stop"))
+    (reply,) = await replies(bus, 1)
+    bus.ack(reply)
+    for _ in range(50):
+        if not agent._active_turns:
+            break
+        await asyncio.sleep(0.01)
+    agent.stop()
+
+    bus = await _reopen(bus)
+    assert bus.replayed == 0
+    await bus.close()
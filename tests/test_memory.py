@@ -0,0 +1,120 @@
+from pathlib import Path
+
+from nanobot.agent.memory import MemoryStore, parse_memory_markdown
+
+TEMPLATE = Path(__file__).parent.parent / "workspace" / "memory" / "MEMORY.md"
+
+HAND_WRITTEN = """# Long-term Memory
+
+Notes kept for the agent.
+
+# Not the title
+
+## User Information
+
+- Name: Sam
+- Works on:
+  - the billing service
+  - the data pipeline
+
+| Tool | Version |
+|------|---------|
+| psql | 16 |
+
+## Project Context
+
+Deploys go through this script:
+
+```bash
+./deploy.sh --env prod
+
+## not a section inside a fence
+```
+
+1. Review
+2. Merge
+- Uses Postgres
+"""
+
+
+def _store(tmp_path: Path, markdown: str | None = None) -> MemoryStore:
+    store = MemoryStore(tmp_path)
+    if markdown is not None:
+        store.write_long_term(markdown)
+    return store
+
+
+def test_hand_written_blocks_survive_a_patch(tmp_path):
+    store = _store(tmp_path, HAND_WRITTEN)
+    assert store.apply_ops([{"op": "add", "section": "Project Context", "text": "CI runs on every push"}]) == 1
+    assert store.read_long_term() == HAND_WRITTEN + "\n- CI runs on every push\n"
+
+    facts, _ = store.load_facts()  # Rendered by the store: nothing to re-read
+    assert [f.text for f in facts if f.section == "User Information" and not f.raw] == [
+        "Name: Sam", "Works on:\n- the billing service\n- the data pipeline",
+    ]
+    assert "## not a section inside a fence" in next(f.text for f in facts if f.text.startswith("```"))
+    assert facts[-2].raw and facts[-2].text == "1. Review\n2. Merge\n- Uses Postgres"
+
+
+def test_list_that_would_be_reformatted_is_kept_whole(tmp_path):
+    markdown = "## User Information\n\n- Name: Sam\n* Likes short answers\n- Timezone: UTC\n"
+    _, entries = parse_memory_markdown(markdown)
+    assert entries == [("User Information", "- Name: Sam\n* Likes short answers\n- Timezone: UTC", True)]
+
+    store = _store(tmp_path, markdown)
+    store.apply_ops([{"op": "add", "section": "User Information", "text": "Prefers Python"}])
+    assert store.read_long_term().startswith("# Long-term Memory\n\n" + markdown.rstrip("\n") + "\n\n- Prefers Python")
+
+
+def test_rendered_memory_parses_back_to_the_same_facts(tmp_path):
+    store = _store(tmp_path)
+    store.apply_ops([
+        {"op": "add", "section": "Preferences", "text": "Prefers dark mode"},
+        {"op": "add", "section": "Preferences", "text": "Multi-line fact\n- with a nested point"},
+        {"op": "add", "text": "Default section"},
+    ])
+    facts, state = store.load_facts()
+    markdown = store.read_long_term()
+    _, parsed = parse_memory_markdown(markdown)
+    assert parsed == [(f.section, f.text, f.raw) for f in facts]
+    assert MemoryStore.render(facts, state["preamble"]) == markdown
+
+
+def test_template_is_kept_and_placeholders_give_way(tmp_path):
+    template = TEMPLATE.read_text(encoding="utf-8").replace("\r\n", "\n")
+    store = _store(tmp_path, template)
+    store.apply_ops([{"op": "add", "section": "Important Notes", "text": "Backups run nightly"}])
+    markdown = store.read_long_term()
+    assert "(Things to remember)" not in markdown
+    assert "(User preferences learned over time)" in markdown
+    assert markdown.endswith(
+        "## Important Notes\n\n- Backups run nightly\n\n---\n\n"
+        "*This file is automatically updated by nanobot when important information should be remembered.*\n"
+    )
+
+
+def test_edited_fact_keeps_its_key(tmp_path):
+    store = _store(tmp_path)
+    store.apply_ops([
+        {"op": "add", "section": "Preferences", "text": "Likes tea"},
+        {"op": "add", "section": "Preferences", "text": "Works late"},
+    ])
+    store.write_long_term(store.read_long_term().replace("Likes tea", "Likes green tea, no sugar"))
+
+    facts, _ = store.load_facts()
+    assert [(f.key, f.text) for f in facts] == [("m1", "Likes green tea, no sugar"), ("m2", "Works late")]
+
+    # An update from a prompt built before the edit still addresses the same fact
+    assert store.apply_ops([{"op": "update", "key": "m1", "text": "Likes green tea"}]) == 1
+    facts, state = store.load_facts()
+    assert [(f.key, f.text) for f in facts] == [("m1", "Likes green tea"), ("m2", "Works late")]
+    assert state["next_id"] == 3
+
+
+def test_unrelated_rewrite_gets_a_new_key(tmp_path):
+    store = _store(tmp_path)
+    store.apply_ops([{"op": "add", "section": "Preferences", "text": "Likes tea"}])
+    store.write_long_term(store.read_long_term().replace("Likes tea", "Speaks Korean and English"))
+    facts, _ = store.load_facts()
+    assert [(f.key, f.text) for f in facts] == [("m2", "Speaks Korean and English")]
@@ -0,0 +1,164 @@
+import asyncio
+
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+from nanobot.channels.manager import ChannelManager
+from nanobot.channels.outbox import ChannelOutbox
+from nanobot.config.schema import Config
+
+
+class GatedChannel(BaseChannel):
+    """Records what it sends; sends wait for ``gate`` to open."""
+
+    supports_streaming = True
+    stream_edit_interval = 0.0
+
+    def __init__(self, name: str, bus: MessageBus, open_gate: bool = True):
+        super().__init__(None, bus)
+        self.name = name
+        self.gate = asyncio.Event()
+        if open_gate:
+            self.gate.set()
+        self.sent: list[str] = []
+        self.drafts: dict[str, str] = {}
+
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def send(self, msg: OutboundMessage) -> None:
+        await self.gate.wait()
+        self.sent.append(msg.content)
+
+    async def send_delta(self, msg: OutboundMessage) -> None:
+        await self.gate.wait()
+        await super().send_delta(msg)
+
+    async def _stream_start(self, chat_id, text, metadata):
+        self.drafts[metadata["_stream_id"]] = text
+        return metadata["_stream_id"]
+
+    async def _stream_edit(self, chat_id, handle, text, metadata, final=False):
+        self.drafts[handle] = text
+
+
+def _out(channel: str, content: str, chat_id: str = "c1", **metadata) -> OutboundMessage:
+    return OutboundMessage(channel=channel, chat_id=chat_id, content=content, metadata=metadata)
+
+
+async def _settle(predicate, timeout: float = 2.0) -> None:
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+async def test_stalled_channel_does_not_hold_up_others():
+    bus = MessageBus()
+    config = Config()
+    config.channels.outbound_workers = 1
+    config.channels.outbound_queue_size = 8
+    manager = ChannelManager(config, bus)
+    slow, fast = GatedChannel("slow", bus, open_gate=False), GatedChannel("fast", bus)
+    manager.channels = {"slow": slow, "fast": fast}
+    await manager.start_all()
+    try:
+        for n in range(5):
+            await bus.publish_outbound(_out("slow", f"s{n}"))
+        await bus.publish_outbound(_out("fast", "f0"))
+        await _settle(lambda: fast.sent == ["f0"], timeout=1.0)
+        slow.gate.set()
+        await _settle(lambda: slow.sent == [f"s{n}" for n in range(5)])
+    finally:
+        await manager.stop_all()
+
+
+async def test_stream_deltas_are_merged_not_dropped():
+    bus = MessageBus()
+    channel = GatedChannel("test", bus, open_gate=False)
+    outbox = ChannelOutbox(channel, bus, workers=1, queue_size=2, put_timeout=0.05)
+    outbox.start()
+    try:
+        outbox.offer(_out("test", "", _progress=True))  # Taken by the sender, which blocks on the gate
+        await asyncio.sleep(0.01)
+        words = ["Hello", " streaming", " world", "!"]
+        for word in words:
+            outbox.offer(_out("test", word, _stream=True, _stream_id="s1"))
+        outbox.offer(_out("test", "", _stream=True, _stream_id="s1", _stream_end=True))
+        for n in range(3):
+            outbox.offer(_out("test", f"note {n}", _progress=True))
+        await asyncio.sleep(0.1)
+        assert outbox.stats.merged == 4
+        channel.gate.set()
+        await _settle(lambda: outbox.depth == 0)
+        assert channel.drafts["s1"] == "Hello streaming world!"
+        assert outbox.stats.dropped >= 1  # Progress notes may still be dropped
+    finally:
+        await outbox.stop()
+
+
+async def test_full_queue_applies_backpressure_then_drops():
+    bus = MessageBus()
+    channel = GatedChannel("test", bus, open_gate=False)
+    outbox = ChannelOutbox(channel, bus, workers=1, queue_size=1, put_timeout=0.05)
+    outbox.start()
+    try:
+        for n in range(3):
+            outbox.offer(_out("test", f"m{n}"))
+            await asyncio.sleep(0.01)  # Let the feeder move it into the shard
+        await _settle(lambda: outbox.stats.dropped == 1)
+        channel.gate.set()
+        await _settle(lambda: outbox.depth == 0)
+        assert channel.sent == ["m0", "m1"]
+        assert outbox.status()["overflows"] >= 1
+    finally:
+        await outbox.stop()
+
+
+class ChatGatedChannel(GatedChannel):
+    """Sends to the chats in ``blocked`` wait for ``gate``; others go straight out."""
+
+    def __init__(self, name: str, bus: MessageBus, blocked: set[str]):
+        super().__init__(name, bus, open_gate=False)
+        self.blocked = blocked
+
+    async def send(self, msg: OutboundMessage) -> None:
+        if msg.chat_id in self.blocked:
+            await self.gate.wait()
+        self.sent.append(msg.content)
+
+
+async def test_full_shard_does_not_delay_other_chats():
+    bus = MessageBus()
+    channel = ChatGatedChannel("test", bus, blocked={"slow"})
+    outbox = ChannelOutbox(channel, bus, workers=2, queue_size=2, put_timeout=5.0)
+    assert outbox._shard_index(_out("test", "", chat_id="slow")) != outbox._shard_index(_out("test", "", "fast"))
+    outbox.start()
+    try:
+        for n in range(3):
+            outbox.offer(_out("test", f"s{n}", chat_id="slow"))
+            await asyncio.sleep(0.01)
+        # s0 is being sent, s1 fills the shard and the feeder waits for room for s2
+        async with asyncio.timeout(1.0):
+            outbox.offer(_out("test", "f0", "fast"))
+            await _settle(lambda: channel.sent == ["f0"])
+        channel.gate.set()
+        await _settle(lambda: channel.sent == ["f0", "s0", "s1", "s2"])
+        assert outbox.stats.dropped == 0
+    finally:
+        await outbox.stop()
+
+
+async def test_stalled_channel_stays_bounded():
+    bus = MessageBus()
+    channel = GatedChannel("test", bus, open_gate=False)
+    outbox = ChannelOutbox(channel, bus, workers=1, queue_size=4, put_timeout=5.0)
+    outbox.start()
+    try:
+        for n in range(100):
+            outbox.offer(_out("test", f"m{n}"))
+            await asyncio.sleep(0)
+        assert outbox.depth <= 2 * 4
+        assert outbox.stats.dropped == 100 - 2 - outbox.depth  # With the stalled sender and the waiting feeder
+    finally:
+        await outbox.stop()
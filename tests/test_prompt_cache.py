@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+import httpx
+
+from nanobot.providers import openai_codex_provider as codex
+from nanobot.providers.litellm_provider import LiteLLMProvider
+
+EPHEMERAL = {"type": "ephemeral"}
+TOOLS = [
+    {"type": "function", "function": {"name": "read_file", "description": "Read", "parameters": {"type": "object"}}},
+    {"type": "function", "function": {"name": "exec", "description": "Run", "parameters": {"type": "object"}}},
+]
+
+
+def _conversation(question: str) -> list[dict]:
+    return [
+        {"role": "system", "content": "You are nanobot."},
+        {"role": "user", "content": "hi"},
+        {"role": "assistant", "content": "hello"},
+        {"role": "user", "content": question},
+    ]
+
+
+def _breakpoints(messages: list[dict]) -> list[int]:
+    return [
+        i for i, m in enumerate(messages)
+        if isinstance(m["content"], list) and m["content"][-1].get("cache_control") == EPHEMERAL
+    ]
+
+
+def test_litellm_sets_cache_breakpoints_for_caching_providers():
+    provider = LiteLLMProvider(default_model="anthropic/claude-opus-4-5")
+    messages = _conversation("What's new?")
+    kwargs = provider._build_kwargs(messages, TOOLS, None, 1024, 0.1)
+
+    # System prompt, end of the history before the current message, and the last message
+    assert _breakpoints(kwargs["messages"]) == [0, 2, 3]
+    assert kwargs["messages"][0]["content"] == [
+        {"type": "text", "text": "You are nanobot.", "cache_control": EPHEMERAL},
+    ]
+    assert kwargs["tools"][-1]["cache_control"] == EPHEMERAL
+    assert "cache_control" not in kwargs["tools"][0]
+    assert messages == _conversation("What's new?") and "cache_control" not in TOOLS[-1]  # Inputs untouched
+
+
+def test_litellm_leaves_other_providers_alone():
+    provider = LiteLLMProvider(default_model="openai/gpt-4o")
+    kwargs = provider._build_kwargs(_conversation("What's new?"), TOOLS, None, 1024, 0.1)
+    assert _breakpoints(kwargs["messages"]) == []
+    assert all("cache_control" not in tool for tool in kwargs["tools"])
+
+
+def _completion(**usage) -> SimpleNamespace:
+    message = SimpleNamespace(content="ok", tool_calls=None)
+    totals = {"prompt_tokens": 1200, "completion_tokens": 20, "total_tokens": 1220}
+    return SimpleNamespace(
+        choices=[SimpleNamespace(message=message, finish_reason="stop")],
+        usage=SimpleNamespace(**totals, **usage),
+    )
+
+
+def test_litellm_reads_cached_tokens_of_either_usage_style():
+    provider = LiteLLMProvider(default_model="anthropic/claude-opus-4-5")
+    openai_style = _completion(prompt_tokens_details=SimpleNamespace(cached_tokens=1024))
+    anthropic_style = _completion(cache_read_input_tokens=896)
+    assert provider._parse_response(openai_style).usage["cached_tokens"] == 1024
+    assert provider._parse_response(anthropic_style).usage["cached_tokens"] == 896
+    assert provider._parse_response(_completion()).usage["cached_tokens"] == 0
+
+
+def test_codex_prompt_cache_key_follows_the_shared_prefix():
+    key = codex._prompt_cache_key("You are nanobot.", TOOLS)
+    assert key == codex._prompt_cache_key("You are nanobot.", list(TOOLS))
+    assert key != codex._prompt_cache_key("You are nanobot.", TOOLS[:1])
+    assert key != codex._prompt_cache_key("You are someone else.", TOOLS)
+
+
+async def test_codex_sends_the_same_cache_key_every_turn(monkeypatch):
+    bodies: list[dict] = []
+
+    async def request(url, headers, body, verify, on_delta=None):
+        bodies.append(body)
+        return "ok", [], "stop", {}
+
+    monkeypatch.setattr(codex, "get_codex_token", lambda: SimpleNamespace(account_id="acct", access="token"))
+    monkeypatch.setattr(codex, "_request_codex", request)
+    provider = codex.OpenAICodexProvider()
+    await provider.chat(_conversation("What's new?"), tools=TOOLS)
+    await provider.chat(_conversation("And now?"), tools=TOOLS)
+
+    assert bodies[0]["input"] != bodies[1]["input"]
+    assert bodies[0]["prompt_cache_key"] == bodies[1]["prompt_cache_key"]
+    assert bodies[0]["prompt_cache_key"] == codex._prompt_cache_key("You are nanobot.", TOOLS)
+
+
+async def test_codex_reads_cached_tokens_from_the_completed_event():
+    completed = (
+        'data: {"type": "response.completed", "response": {"status": "completed", "usage": '
+        '{"input_tokens": 1200, "output_tokens": 20, "input_tokens_details": {"cached_tokens": 1024}}}}\n\n'
+    )
+    stream = 'data: {"type": "response.output_text.delta", "delta": "ok"}\n\n' + completed
+    content, _, finish_reason, usage = await codex._consume_sse(httpx.Response(200, content=stream.encode()))
+    assert (content, finish_reason) == ("ok", "stop")
+    assert usage == {"prompt_tokens": 1200, "completion_tokens": 20, "total_tokens": 1220, "cached_tokens": 1024}
+    assert codex._map_usage({"input_tokens": 10, "output_tokens": 2})["cached_tokens"] == 0
@@ -0,0 +1,62 @@
+import asyncio
+from collections import Counter
+
+from nanobot.bus.scheduler import FairScheduler
+from tests.conftest import inbound, replies
+
+
+def _drain(scheduler: FairScheduler) -> list:
+    out = []
+    while not scheduler.empty():
+        out.append(scheduler.get_nowait())
+    return out
+
+
+def test_lanes_share_dequeues_by_weight():
+    scheduler = FairScheduler({"interactive": 3, "background": 1})
+    for n in range(40):
+        scheduler.put_nowait(inbound(chat_id=f"i{n}"))
+        scheduler.put_nowait(inbound(chat_id=f"b{n}", _lane="background"))
+    first = [m.metadata.get("_lane", "interactive") for m in _drain(scheduler)[:40]]
+    assert Counter(first) == {"interactive": 30, "background": 10}
+
+
+def test_chats_are_served_round_robin_in_order():
+    scheduler = FairScheduler()
+    for n in range(3):
+        scheduler.put_nowait(inbound(chat_id="noisy", content=f"n{n}"))
+    scheduler.put_nowait(inbound(chat_id="quiet", content="q0"))
+    assert [m.content for m in _drain(scheduler)] == ["n0", "q0", "n1", "n2"]
+
+
+def test_tenants_are_weighted():
+    scheduler = FairScheduler(tenant_weights={"big": 2})
+    for n in range(6):
+        scheduler.put_nowait(inbound(chat_id=f"a{n}", tenant_id="big"))
+        scheduler.put_nowait(inbound(chat_id=f"b{n}", tenant_id="small"))
+    first = [m.metadata["tenant_id"] for m in _drain(scheduler)[:6]]
+    assert Counter(first) == {"big": 4, "small": 2}
+
+
+async def test_get_drains_then_ends_after_close():
+    scheduler = FairScheduler()
+    scheduler.put_nowait(inbound())
+    scheduler.close()
+    assert (await scheduler.get()) is not None
+    assert (await asyncio.wait_for(scheduler.get(), 1)) is None
+
+
+async def test_submit_runs_in_background_lane(make_agent):
+    agent = make_agent()
+    assert await asyncio.wait_for(agent.submit("check", session_key="heartbeat"), 5) == "Done."
+    assert agent.bus.lane_stats()["background"]["dequeued"] == 1
+
+
+async def test_replayed_submit_without_caller_is_dropped(make_agent):
+    agent = make_agent()
+    await agent.bus.publish_inbound(inbound(content="old job", _lane="background", _submit_id="gone"))
+    await agent.bus.publish_inbound(inbound(chat_id="c2"))
+    (reply,) = await replies(agent.bus, 1)
+    assert reply.chat_id == "c2"
+    assert not agent.sessions.get_or_create("test:c1").messages
+
@@ -0,0 +1,50 @@
+from datetime import datetime, timedelta
+
+from nanobot.session.archive import SessionArchive
+from nanobot.session.manager import Session, SessionManager
+from nanobot.session.store import SqliteSessionStore
+
+
+def _manager(tmp_path) -> SessionManager:
+    return SessionManager(
+        tmp_path,
+        store=SqliteSessionStore(tmp_path / "sessions.db"),
+        archive=SessionArchive(tmp_path / "archive"),
+    )
+
+
+def _idle_session(key: str, days: float, consolidated: bool = False) -> Session:
+    session = Session(key=key)
+    session.add_message("user", f"hello from {key}")
+    session.add_message("assistant", "hi")
+    session.updated_at = datetime.now() - timedelta(days=days)
+    session.last_consolidated = len(session.messages) if consolidated else 0
+    return session
+
+
+def test_idle_sessions_move_to_the_archive_and_come_back(tmp_path):
+    writer = _manager(tmp_path)  # Another process that wrote the sessions earlier
+    for session in (_idle_session("test:old", 40), _idle_session("test:recent", 2),
+                    _idle_session("test:done", 10, consolidated=True)):
+        writer.store.save(session)
+    writer.close()
+
+    manager = _manager(tmp_path)
+    archived = manager.archive_idle(idle_days=30, consolidated_idle_days=7)
+    assert sorted(archived) == ["test:done", "test:old"]
+    assert [s["key"] for s in manager.list_sessions()] == ["test:recent"]
+    assert [m["content"] for m in manager.get_history("test:old")] == ["hello from test:old", "hi"]
+
+    restored = manager.get_or_create("test:old")
+    assert [m["content"] for m in restored.messages] == ["hello from test:old", "hi"]
+    assert "test:old" not in manager.archive
+    assert manager.store.load("test:old") is not None
+    manager.close()
+
+
+def test_sessions_in_use_are_not_archived(tmp_path):
+    manager = _manager(tmp_path)
+    manager.store.save(_idle_session("test:old", 40))
+    manager.get_or_create("test:old")  # Loaded by this process
+    assert manager.archive_idle(idle_days=30) == []
+    manager.close()
@@ -0,0 +1,70 @@
+from nanobot.session.cache import SessionCache, estimate_message_bytes
+from nanobot.session.manager import Session, SessionManager
+from nanobot.session.store import JsonlSessionStore
+
+
+def _session(key: str, messages: int = 1, size: int = 10) -> Session:
+    session = Session(key=key)
+    for _ in range(messages):
+        session.add_message("user", "x" * size)
+    return session
+
+
+def test_evicts_least_recently_used_over_count():
+    cache = SessionCache(max_sessions=2)
+    for key in ("a", "b"):
+        cache.put(_session(key))
+    cache.get("a")
+    cache.put(_session("c"))
+    assert "b" not in cache
+    assert ("a" in cache, "c" in cache) == (True, True)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_over_bytes_and_tracks_growth():
+    one = estimate_message_bytes({"role": "user", "content": "x" * 1000})
+    cache = SessionCache(max_bytes=3 * one)
+    a, b = _session("a", size=1000), _session("b", size=1000)
+    cache.put(a)
+    cache.put(b)
+    a.add_message("user", "x" * 1000)
+    cache.put(a)  # Now the most recent, and three messages in all
+    assert cache.bytes <= 3 * one and len(cache) == 2
+    b.add_message("user", "x" * 1000)
+    cache.put(b)
+    assert "a" not in cache and cache.bytes == 2 * one
+
+
+def test_pinned_sessions_are_not_evicted_until_unpinned():
+    cache = SessionCache(max_sessions=1)
+    cache.put(_session("a"))
+    cache.pin("a")
+    cache.put(_session("b"))
+    assert "a" in cache and "b" not in cache
+    cache.unpin("a")
+    cache.put(_session("b"))
+    assert "a" not in cache and "b" in cache
+
+
+def test_cleared_session_is_recounted():
+    cache = SessionCache()
+    session = _session("a", messages=5, size=1000)
+    cache.put(session)
+    session.clear()
+    for _ in range(6):
+        session.add_message("user", "y")
+    cache.put(session)
+    assert cache.bytes == sum(estimate_message_bytes(m) for m in session.messages)
+
+
+def test_evicted_session_is_reloaded_from_the_store(tmp_path):
+    manager = SessionManager(tmp_path, cache_max_sessions=1, store=JsonlSessionStore(tmp_path / "sessions"))
+    first = manager.get_or_create("test:a")
+    first.add_message("user", "remember me")
+    manager.save(first)
+    manager.save(manager.get_or_create("test:b"))
+    assert manager.cache_stats()["sessions"] == 1
+
+    reloaded = manager.get_or_create("test:a")
+    assert reloaded is not first
+    assert [m["content"] for m in reloaded.messages] == ["remember me"]
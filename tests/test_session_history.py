@@ -0,0 +1,50 @@
+from nanobot.config.schema import Config
+from nanobot.session.manager import Session
+
+
+def _session(*sizes: int) -> Session:
+    session = Session(key="test:c1")
+    for i, size in enumerate(sizes):
+        session.add_message("user" if i % 2 == 0 else "assistant", "x" * size)
+    return session
+
+
+def test_budget_fills_from_newest():
+    session = _session(4000, 400, 400, 400)
+    counts = session.token_counts()
+    history = session.get_history(max_tokens=sum(counts[1:]))
+    assert [len(m["content"]) for m in history] == [400, 400, 400]
+
+
+def test_tool_results_stay_with_their_call():
+    session = Session(key="test:c1")
+    session.add_message("user", "question")
+    session.add_message("assistant", "", tool_calls=[{"id": "t1"}, {"id": "t2"}])
+    session.add_message("tool", "a" * 400, tool_call_id="t1", name="read_file")
+    session.add_message("tool", "b" * 400, tool_call_id="t2", name="read_file")
+    session.add_message("assistant", "answer")
+    counts = session.token_counts()
+    # Room for the final answer and one tool result, but not the whole call block
+    history = session.get_history(max_tokens=counts[-1] + counts[-2])
+    assert [m["role"] for m in history] == ["assistant"]
+    history = session.get_history(max_tokens=sum(counts[1:]))
+    assert [m["role"] for m in history] == ["assistant", "tool", "tool", "assistant"]
+
+
+def test_token_counts_follow_replaced_message_list():
+    session = _session(40, 40)
+    assert len(session.token_counts()) == 2
+    session.messages = [{"role": "user", "content": "y" * 4000}, {"role": "assistant", "content": "z"}]
+    counts = session.token_counts()
+    assert counts[0] > 500
+    session.messages = session.messages + [{"role": "user", "content": "more"}]
+    assert session.token_counts()[0] == counts[0]
+    assert len(session.token_counts()) == 3
+
+
+def test_context_window_per_model():
+    config = Config.model_validate({"agents": {"defaults": {
+        "model": "a/small", "contextWindowTokens": 8000, "contextWindows": {"a/small": 4000},
+    }}})
+    assert config.get_context_window() == 4000
+    assert config.get_context_window("b/other") == 8000
@@ -0,0 +1,168 @@
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from nanobot.session.archive import SessionArchive
+from nanobot.session.maintenance import (
+    Journal,
+    StoreSpec,
+    archive_store,
+    migrate_task,
+    run_bulk,
+    verify_task,
+)
+from nanobot.session.manager import Session
+
+WORKERS = [1, 2]  # Inline, and a process pool
+
+
+def _session(key: str, turns: int = 2, idle_days: float = 0) -> Session:
+    session = Session(key=key)
+    for n in range(turns):
+        session.add_message("user", f"{key} question {n}")
+        session.add_message("assistant", f"{key} answer {n}")
+    session.updated_at = datetime.now() - timedelta(days=idle_days)
+    return session
+
+
+def _fill(spec: StoreSpec, *sessions: Session) -> None:
+    store = spec.open()
+    try:
+        for session in sessions:
+            store.save(session)
+            if path_for := getattr(store, "path_for", None):  # File stores also go by the mtime
+                os.utime(path_for(session.key), (session.updated_at.timestamp(),) * 2)
+    finally:
+        store.close()
+
+
+def _keys(spec: StoreSpec) -> set[str]:
+    store = spec.open()
+    try:
+        return {info["key"] for info in store.list_sessions()}
+    finally:
+        store.close()
+
+
+def _messages(spec: StoreSpec, key: str) -> list[str]:
+    store = spec.open()
+    try:
+        return _contents(store.load(key))
+    finally:
+        store.close()
+
+
+def _contents(session: Session) -> list[str]:
+    return [m["content"] for m in session.messages]
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_migrate_jsonl_to_sqlite(tmp_path, workers):
+    source = StoreSpec("jsonl", tmp_path / "sessions")
+    target = StoreSpec("sqlite", tmp_path / "sessions.db")
+    sessions = [_session(f"test:c{n}") for n in range(5)]
+    _fill(source, *sessions)
+
+    results = list(run_bulk(migrate_task, sorted(_keys(source)), source, target=target, workers=workers))
+    assert sorted(r["status"] for r in results) == ["migrated"] * 5
+    for session in sessions:
+        assert _messages(target, session.key) == _contents(session)
+    assert _keys(source) == {s.key for s in sessions}  # Copied, not moved
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_legacy_sessions_move_unless_the_workspace_has_them(tmp_path, workers):
+    legacy = StoreSpec("jsonl", tmp_path / "legacy")
+    workspace = StoreSpec("jsonl", tmp_path / "sessions")
+    _fill(legacy, _session("test:old"), _session("test:both", turns=1))
+    _fill(workspace, _session("test:both", turns=3))
+
+    results = run_bulk(
+        migrate_task, sorted(_keys(legacy)), legacy, target=workspace,
+        options={"move": True, "keep_existing": True}, workers=workers,
+    )
+    assert {r["key"]: r["status"] for r in results} == {"test:old": "migrated", "test:both": "skipped"}
+    assert _keys(legacy) == {"test:both"}  # Kept where the workspace already had the session
+    assert len(_messages(workspace, "test:both")) == 6
+    assert _messages(workspace, "test:old") == _contents(_session("test:old"))
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_interrupted_run_resumes_from_the_journal(tmp_path, workers):
+    source = StoreSpec("jsonl", tmp_path / "sessions")
+    target = StoreSpec("sqlite", tmp_path / "sessions.db")
+    _fill(source, *(_session(f"test:c{n}") for n in range(6)))
+    keys = sorted(_keys(source)) + ["test:missing"]  # Unreadable: fails every run
+    journal_path = tmp_path / "migrate.journal"
+
+    journal = Journal(journal_path)
+    results = run_bulk(migrate_task, keys, source, target=target, workers=workers, journal=journal, chunksize=1)
+    first = [next(results) for _ in range(2)]
+    results.close()  # Interrupted
+    journal.close()
+    done = {r["key"] for r in first if r["status"] != "error"}
+    assert Journal(journal_path).done == done
+
+    journal = Journal(journal_path)
+    rest = list(run_bulk(migrate_task, keys, source, target=target, workers=workers, journal=journal))
+    journal.close()
+    assert {r["key"] for r in rest} == set(keys) - done
+    assert [r["key"] for r in rest if r["status"] == "error"] == ["test:missing"]
+    assert Journal(journal_path).done == set(keys) - {"test:missing"}  # Failures are retried by a rerun
+    assert _keys(target) == set(keys) - {"test:missing"}
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_verify_reports_and_repairs_a_torn_file(tmp_path, workers):
+    spec = StoreSpec("jsonl", tmp_path / "sessions")
+    torn, intact = _session("test:torn"), _session("test:intact")
+    _fill(spec, torn, intact)
+    path = spec.open().path_for(torn.key)
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"role": "user", "content": "cut sh')  # Crash in the middle of an append
+
+    keys = sorted(_keys(spec))
+    results = {r["key"]: r for r in run_bulk(verify_task, keys, spec, workers=workers)}
+    assert results["test:intact"]["status"] == "ok"
+    assert results["test:torn"]["status"] == "problem"
+    assert path.read_text(encoding="utf-8").endswith("cut sh")  # Only reported
+
+    results = {r["key"]: r for r in run_bulk(verify_task, keys, spec, options={"repair": True}, workers=workers)}
+    assert results["test:torn"]["status"] == "repaired"
+    assert {r["status"] for r in run_bulk(verify_task, keys, spec, workers=workers)} == {"ok"}
+    assert _messages(spec, torn.key) == _contents(torn)
+
+
+@pytest.mark.parametrize("workers", WORKERS)
+def test_archive_store_deletes_only_archived_sessions(tmp_path, workers, monkeypatch):
+    spec = StoreSpec("jsonl", tmp_path / "sessions")
+    archive = SessionArchive(tmp_path / "archive")
+    idle = [_session(f"test:idle{n}", idle_days=40) for n in range(3)]
+    _fill(spec, *idle, _session("test:active"))
+
+    written = 0
+    put_frames = archive.put_frames
+
+    def put_frames_then_fail(frames):
+        nonlocal written
+        if written:
+            raise OSError("disk full")
+        written += 1
+        return put_frames(frames)
+
+    monkeypatch.setattr(archive, "put_frames", put_frames_then_fail)
+    archived = []
+    with pytest.raises(OSError):
+        for r in archive_store(spec, archive, idle_days=30, consolidated_idle_days=30, workers=workers, batch_size=2):
+            archived.append(r["key"])
+    assert len(archived) == 2
+    assert set(archive.keys()) == set(archived)
+    assert _keys(spec) == {"test:active", *({s.key for s in idle} - set(archived))}
+
+    monkeypatch.setattr(archive, "put_frames", put_frames)
+    rest = list(archive_store(spec, archive, idle_days=30, consolidated_idle_days=30, workers=workers))
+    assert [r["status"] for r in rest] == ["archived"]
+    assert _keys(spec) == {"test:active"}
+    for session in idle:
+        assert _contents(archive.load(session.key)) == _contents(session)
@@ -0,0 +1,223 @@
+import json
+
+import msgpack
+import pytest
+
+from nanobot.session.binary import MAGIC, MsgpackSessionStore
+from nanobot.session.manager import Session
+from nanobot.session.store import JsonlSessionStore, SqliteSessionStore, migrate_sessions
+
+BACKENDS = {
+    "jsonl": lambda tmp_path: JsonlSessionStore(tmp_path / "sessions"),
+    "sqlite": lambda tmp_path: SqliteSessionStore(tmp_path / "sessions.db"),
+    "msgpack": lambda tmp_path: MsgpackSessionStore(tmp_path / "sessions"),
+}
+
+
+@pytest.fixture(params=list(BACKENDS))
+def store(request, tmp_path):
+    store = BACKENDS[request.param](tmp_path)
+    yield store
+    store.close()
+
+
+def _session(key: str = "test:c1", turns: int = 2) -> Session:
+    session = Session(key=key)
+    for n in range(turns):
+        session.add_message("user", f"question {n}")
+        session.add_message("assistant", f"answer {n}")
+    return session
+
+
+def _lines(store: JsonlSessionStore, key: str) -> list[dict]:
+    return [json.loads(line) for line in store.path_for(key).read_text(encoding="utf-8").splitlines()]
+
+
+def test_jsonl_save_appends_only_new_messages(tmp_path):
+    store = JsonlSessionStore(tmp_path)
+    session = _session()
+    store.save(session)
+    first = store.path_for(session.key).read_bytes()
+
+    session.add_message("user", "one more")
+    store.save(session)
+    data = store.path_for(session.key).read_bytes()
+    assert data.startswith(first)
+    assert [r.get("content") for r in _lines(store, session.key)[-1:]] == ["one more"]
+
+    loaded = store.load(session.key)
+    assert loaded.messages == session.messages
+    assert loaded._persisted == len(session.messages)
+
+
+def test_jsonl_metadata_trailer_wins_and_compacts(tmp_path):
+    store = JsonlSessionStore(tmp_path)
+    session = _session()
+    store.save(session)
+    session.last_consolidated = 2
+    session.metadata["topic"] = "x"
+    store.save(session)
+    assert sum(1 for r in _lines(store, session.key) if r.get("_type") == "metadata") == 2
+
+    loaded = store.load(session.key)
+    assert (loaded.last_consolidated, loaded.metadata) == (2, {"topic": "x"})
+    assert loaded._trailers == 1
+
+    store.compact(loaded)
+    records = _lines(store, session.key)
+    assert [r.get("_type") for r in records].count("metadata") == 1
+    assert store.load(session.key).messages == session.messages
+
+
+def test_jsonl_torn_append_is_skipped_then_rewritten(tmp_path):
+    store = JsonlSessionStore(tmp_path)
+    session = _session()
+    store.save(session)
+    with open(store.path_for(session.key), "a", encoding="utf-8") as f:
+        f.write('{"role": "user", "content": "cut sh')  # Crash in the middle of an append
+
+    loaded = store.load(session.key)
+    assert loaded.messages == session.messages
+    assert loaded._persisted == 0  # Not trusted for appends
+
+    loaded.add_message("user", "after the crash")
+    store.save(loaded)
+    reloaded = store.load(session.key)
+    assert [m["content"] for m in reloaded.messages][-2:] == ["answer 1", "after the crash"]
+    assert reloaded._persisted == len(reloaded.messages)
+
+
+def test_jsonl_clear_rewrites_the_file(tmp_path):
+    store = JsonlSessionStore(tmp_path)
+    session = _session()
+    store.save(session)
+    session.clear()
+    session.add_message("user", "fresh start")
+    store.save(session)
+    assert [m["content"] for m in store.load(session.key).messages] == ["fresh start"]
+
+
+def test_incremental_saves_round_trip(store):
+    session = _session()
+    store.save(session)
+    for n in range(3):
+        session.add_message("user", f"more {n}", tools_used=["exec"])
+        session.last_consolidated = n
+        store.save(session)
+    loaded = store.load(session.key)
+    assert loaded.messages == session.messages
+    assert loaded.last_consolidated == 2
+    assert loaded._persisted == len(session.messages)
+    assert store.load("test:missing") is None
+
+
+def test_history_tail_and_clear(store):
+    session = _session(turns=5)
+    store.save(session)
+    assert [m["content"] for m in store.get_history(session.key, 3)] == ["answer 3", "question 4", "answer 4"]
+    assert store.get_history(session.key, 0) == []
+
+    session.clear()
+    session.add_message("user", "fresh start")
+    store.save(session)
+    assert [m["content"] for m in store.load(session.key).messages] == ["fresh start"]
+
+
+def test_list_and_delete(store):
+    store.save(_session("test:a"))
+    store.save(_session("test:b"))
+    assert {s["key"] for s in store.list_sessions()} == {"test:a", "test:b"}
+    assert store.delete("test:a")
+    assert not store.delete("test:a")
+    assert [s["key"] for s in store.list_sessions()] == ["test:b"]
+
+
+def test_sqlite_store_is_shared_between_connections(tmp_path):
+    first, second = SqliteSessionStore(tmp_path / "s.db"), SqliteSessionStore(tmp_path / "s.db")
+    try:
+        session = _session()
+        first.save(session)
+        other = second.load(session.key)
+        other.add_message("user", "from the other worker")
+        second.save(other)
+        assert first.load(session.key).messages == other.messages
+    finally:
+        first.close()
+        second.close()
+
+
+def test_migrate_between_backends(tmp_path):
+    source = JsonlSessionStore(tmp_path / "sessions")
+    target = SqliteSessionStore(tmp_path / "sessions.db")
+    try:
+        sessions = [_session(f"test:{n}") for n in range(3)]
+        for session in sessions:
+            source.save(session)
+        target.save(_session("test:0", turns=7))  # Replaced by the migrated copy
+        assert migrate_sessions(source, target) == 3
+        for session in sessions:
+            assert target.load(session.key).messages == session.messages
+    finally:
+        target.close()
+
+
+def _grow(store: MsgpackSessionStore, session: Session, saves: int) -> None:
+    for n in range(saves):
+        session.add_message("user", f"more {n}")
+        store.save(session)
+
+
+def test_msgpack_append_keeps_the_old_index_intact(tmp_path):
+    store = MsgpackSessionStore(tmp_path)
+    session = _session()
+    store.save(session)
+    before = store.path_for(session.key).read_bytes()
+    _grow(store, session, 3)
+    assert store.path_for(session.key).read_bytes().startswith(before)
+
+    assert store.load(session.key).messages == session.messages
+    assert store.get_history(session.key, 4) == session.messages[-4:]
+    assert store.list_sessions()[0]["messages"] == len(session.messages)
+
+
+def test_msgpack_torn_append_recovers_earlier_messages(tmp_path):
+    store = MsgpackSessionStore(tmp_path)
+    session = _session()
+    store.save(session)
+    _grow(store, session, 2)
+    path = store.path_for(session.key)
+    path.write_bytes(path.read_bytes()[:-20])  # Crash while writing the last index
+
+    loaded = store.load(session.key)
+    assert loaded.messages == session.messages
+    assert loaded._persisted == 0
+    loaded.add_message("user", "after the crash")
+    store.save(loaded)
+    reloaded = store.load(session.key)
+    assert reloaded.messages == loaded.messages
+    assert reloaded._persisted == len(loaded.messages)
+
+
+def test_msgpack_scan_keeps_only_messages(tmp_path):
+    store = MsgpackSessionStore(tmp_path)
+    records = [{"role": "user", "content": "kept"}, 42, {"content": "no role"}, "text"]
+    data = MAGIC + b"".join(msgpack.packb(r) for r in records)
+    store.path_for("test:c1").write_bytes(data + msgpack.packb({"role": "user", "content": "torn"})[:-2])
+    assert store.load("test:c1").messages == [{"role": "user", "content": "kept"}]
+
+
+def test_msgpack_rewrites_after_many_appends(tmp_path):
+    store = MsgpackSessionStore(tmp_path)
+    session = _session()
+    store.save(session)
+    _grow(store, session, store.compact_after)
+    grown = store.path_for(session.key).stat().st_size
+    _grow(store, session, 1)
+    assert store.path_for(session.key).stat().st_size < grown
+    assert session._trailers == 0
+    assert store.load(session.key).messages == session.messages
+
+    _grow(store, session, 2)
+    store.compact(session)
+    assert store.load(session.key)._trailers == 0
+    assert store.get_history(session.key, 3) == session.messages[-3:]
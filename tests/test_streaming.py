@@ -0,0 +1,86 @@
+import re
+
+import pytest
+
+from nanobot.agent.loop import _TurnStream
+from nanobot.bus.events import OutboundMessage
+from nanobot.bus.queue import MessageBus
+from nanobot.channels.base import BaseChannel
+
+
+class _Recorder:
+    def __init__(self):
+        self.sent: list[OutboundMessage] = []
+
+    async def publish_outbound(self, msg: OutboundMessage) -> None:
+        self.sent.append(msg)
+
+
+async def _stream(deltas: list[str]) -> list[OutboundMessage]:
+    bus = _Recorder()
+    stream = _TurnStream(bus, "test", "c1", {})
+    stream.begin()
+    for delta in deltas:
+        await stream.feed(delta)
+    return bus.sent
+
+
+@pytest.mark.parametrize("deltas", [
+    ["Hel", "lo <th", "ink>secret</thi", "nk> world <", "b>"],
+    ["<think>", "plan", "</think>", "  Answer", " <thin", "k>more"],
+    ["a < b", " and <t", "able>"],
+    list("<think>x</think>Hi <think>y</think>there"),
+])
+async def test_visible_text_matches_full_text_filter(deltas):
+    sent = await _stream(deltas)
+    raw = "".join(deltas)
+    expected = re.sub(r"<think>[\s\S]*?</think>", "", raw)
+    if "<think>" in expected:
+        expected = expected[:expected.index("<think>")]
+    assert "".join(m.content for m in sent) == expected.lstrip()
+    assert all(m.content for m in sent)
+    assert len({m.metadata["_stream_id"] for m in sent}) <= 1
+
+
+async def test_only_new_text_is_scanned():
+    bus = _Recorder()
+    stream = _TurnStream(bus, "test", "c1", {})
+    stream.begin()
+    await stream.feed("<think>" + "x" * 10_000)
+    await stream.feed("y" * 10_000)
+    assert len(stream._pending) < len("</think>")
+    assert not stream.streamed
+
+
+class _PlainChannel(BaseChannel):
+    name = "plain"
+    supports_streaming = True
+    stream_edit_interval = 0.0
+
+    async def start(self) -> None: ...
+
+    async def stop(self) -> None: ...
+
+    async def send(self, msg: OutboundMessage) -> None: ...
+
+
+async def test_channel_without_stream_hooks_falls_back_to_final_message():
+    channel = _PlainChannel(None, MessageBus())
+    meta = {"_stream": True, "_stream_id": "s1"}
+    await channel.send_delta(OutboundMessage(channel="plain", chat_id="c1", content="partial", metadata=meta))
+    final = OutboundMessage(channel="plain", chat_id="c1", content="full", metadata={"_stream_id": "s1"})
+    assert await channel._finish_stream(final) is False
+
+
+async def test_abandoned_streams_expire():
+    channel = _PlainChannel(None, MessageBus())
+    def delta(stream_id: str) -> OutboundMessage:
+        meta = {"_stream": True, "_stream_id": stream_id}
+        return OutboundMessage(channel="plain", chat_id="c1", content="text", metadata=meta)
+
+    await channel.send_delta(delta("s1"))
+    assert set(channel._streams) == {"s1"}  # Its turn was cancelled: no end, no final message
+
+    channel._streams["s1"].last_delta -= channel.stream_ttl + 1
+    await channel.send_delta(delta("s2"))
+    assert set(channel._streams) == {"s2"}
@@ -0,0 +1,82 @@
+import asyncio
+import time
+from typing import Any
+
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+
+
+class SleepTool(Tool):
+    """Sleeps, then returns its label; records start and end order."""
+
+    def __init__(self, name: str, safe: bool, log: list[str]):
+        self._name = name
+        self._safe = safe
+        self.log = log
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "sleep"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {"label": {"type": "string"}}, "required": ["label"]}
+
+    @property
+    def concurrency_safe(self) -> bool:
+        return self._safe
+
+    async def execute(self, label: str, **kwargs: Any) -> str:
+        self.log.append(f"start {label}")
+        await asyncio.sleep(0.1)
+        self.log.append(f"end {label}")
+        return label
+
+
+def _registry(log: list[str]) -> ToolRegistry:
+    registry = ToolRegistry()
+    registry.register(SleepTool("read", True, log))
+    registry.register(SleepTool("write", False, log))
+    return registry
+
+
+async def test_safe_calls_run_together_and_keep_their_order():
+    registry = _registry([])
+    started = time.perf_counter()
+    results = await registry.execute_batch([("read", {"label": str(i)}) for i in range(4)])
+    assert results == ["0", "1", "2", "3"]
+    assert time.perf_counter() - started < 0.3
+
+
+async def test_max_concurrency_limits_calls_in_flight():
+    registry = _registry([])
+    started = time.perf_counter()
+    await registry.execute_batch([("read", {"label": str(i)}) for i in range(4)], max_concurrency=2)
+    assert time.perf_counter() - started >= 0.2
+
+
+async def test_side_effecting_call_is_a_barrier():
+    log: list[str] = []
+    registry = _registry(log)
+    results = await registry.execute_batch([
+        ("read", {"label": "a"}), ("read", {"label": "b"}),
+        ("write", {"label": "w"}),
+        ("read", {"label": "c"}),
+    ])
+    assert results == ["a", "b", "w", "c"]
+    w = log.index("start w")
+    assert {"end a", "end b"} <= set(log[:w])
+    assert log[w + 1] == "end w"
+    assert log.index("start c") > w + 1
+
+
+async def test_errors_stay_with_their_call():
+    registry = _registry([])
+    results = await registry.execute_batch([("read", {"label": "a"}), ("missing", {}), ("read", {})])
+    assert results[0] == "a"
+    assert "not found" in results[1]
+    assert "Invalid parameters" in results[2]
@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from nanobot.agent.tools.offload import ReadToolResultTool, ToolResultStore
+
+
+def test_small_results_stay_inline():
+    store = ToolResultStore(threshold=100, preview_chars=20)
+    store.start_turn()
+    assert store.offload("exec", "short") == "short"
+
+
+async def test_large_result_is_previewed_and_readable():
+    store = ToolResultStore(threshold=100, preview_chars=20)
+    store.start_turn()
+    result = "".join(f"line {i}\n" for i in range(100))
+    preview = store.offload("exec", result)
+    assert "'exec-1'" in preview
+    assert len(preview) < len(result)
+    tool = ReadToolResultTool(store)
+    page = await tool.execute(handle="exec-1", offset=7, limit=7)
+    assert page.endswith("line 1\n")
+    assert "offset 49:" in await tool.execute(handle="exec-1", search="LINE 7\n")
+
+
+async def test_results_are_scoped_to_the_turn_task():
+    store = ToolResultStore(threshold=10, preview_chars=4)
+
+    async def turn(text: str) -> str | None:
+        store.start_turn()
+        store.offload("exec", text)
+        await asyncio.sleep(0)
+        return store.get("exec-1")
+
+    assert await asyncio.gather(turn("a" * 50), turn("b" * 50)) == ["a" * 50, "b" * 50]
+
+
+@pytest.mark.parametrize("preview_chars", [100, 200, -1])
+def test_preview_must_be_shorter_than_threshold(preview_chars):
+    with pytest.raises(ValueError):
+        ToolResultStore(threshold=100, preview_chars=preview_chars)
+
+
+def test_disabled_offloading_accepts_any_preview():
+    store = ToolResultStore(threshold=0, preview_chars=2000)
+    store.start_turn()
+    assert store.offload("exec", "x" * 5000) == "x" * 5000
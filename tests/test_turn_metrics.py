@@ -0,0 +1,54 @@
+import asyncio
+import json
+from typing import Any
+
+from nanobot.agent.timing import TurnMetrics, current_timer
+from nanobot.agent.tools.base import Tool
+from nanobot.agent.tools.registry import ToolRegistry
+
+
+class NapTool(Tool):
+    name = "nap"
+    description = "Sleeps"
+    parameters: dict[str, Any] = {"type": "object", "properties": {}}
+    concurrency_safe = True
+
+    async def execute(self, **kwargs: Any) -> str:
+        await asyncio.sleep(0.1)
+        return "ok"
+
+
+async def test_parallel_tools_count_wall_time_once():
+    registry = ToolRegistry()
+    registry.register(NapTool())
+    metrics = TurnMetrics()
+    timer = metrics.start("test", "test:c1")
+    await registry.execute_batch([("nap", {})] * 4)
+    assert current_timer() is timer
+    record = metrics.finish(timer)
+    assert len(record["tools"]) == 4
+    assert 100 <= record["phases"]["tool"] < 250
+    assert record["phases"]["tool"] <= record["total_ms"]
+
+
+def test_records_are_written_off_the_caller_thread(tmp_path):
+    path = tmp_path / "metrics" / "turns.jsonl"
+    metrics = TurnMetrics(path)
+    for _ in range(3):
+        metrics.finish(metrics.start("test", "test:c1"))
+    metrics.close()
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["status"] for line in lines] == ["ok"] * 3
+
+
+def test_file_is_rotated_at_max_bytes(tmp_path):
+    path = tmp_path / "turns.jsonl"
+    metrics = TurnMetrics(path, max_bytes=1)
+    metrics.finish(metrics.start("test", "a"))
+    metrics._writer.flush()
+    metrics.finish(metrics.start("test", "b"))
+    metrics.close()
+    assert json.loads(path.read_text(encoding="utf-8"))["session"] == "b"
+    assert json.loads(TurnMetrics.rotated_path(path).read_text(encoding="utf-8"))["session"] == "a"
+    loaded = TurnMetrics.load(path)
+    assert loaded.histograms[("channel", "test")].count == 2
@@ -0,0 +1,90 @@
+import threading
+import time
+
+import pytest
+
+from nanobot.session.manager import SessionManager
+from nanobot.session.store import JsonlSessionStore
+from nanobot.utils.writebehind import WriteBehind
+
+
+@pytest.fixture
+def writer():
+    writer = WriteBehind(window_ms=50)
+    yield writer
+    writer.close()
+
+
+def test_keyed_writes_collapse_and_keep_their_place(writer):
+    done: list[str] = []
+    futures = [
+        writer.submit("a", lambda: done.append("a1")),
+        writer.submit(None, lambda: done.append("log")),
+        writer.submit("a", lambda: done.append("a2")),
+    ]
+    for future in futures:
+        future.result(timeout=5)
+    assert done == ["a2", "log"]
+    assert writer.stats()["coalesced"] == 1
+
+
+def test_failed_write_reports_and_later_writes_run(writer):
+    def fail() -> None:
+        raise OSError("disk full")
+
+    failed = writer.submit("a", fail)
+    ok = writer.submit("b", lambda: "written")
+    with pytest.raises(OSError):
+        failed.result(timeout=5)
+    assert ok.result(timeout=5) == "written"
+    assert writer.stats()["failed"] == 1
+
+
+def test_flush_skips_the_window():
+    writer = WriteBehind(window_ms=60_000)
+    try:
+        done = threading.Event()
+        writer.submit("a", done.set)
+        started = time.monotonic()
+        assert writer.flush(timeout=5)
+        assert done.is_set() and time.monotonic() - started < 5
+    finally:
+        writer.close()
+
+
+def test_close_drains_then_writes_inline():
+    writer = WriteBehind(window_ms=60_000)
+    done: list[str] = []
+    writer.submit("a", lambda: done.append("queued"))
+    writer.close()
+    assert done == ["queued"]
+    writer.submit("a", lambda: done.append(threading.current_thread().name))
+    assert done[-1] == threading.current_thread().name
+
+
+def test_manager_serves_unsaved_sessions_and_flushes_on_close(tmp_path):
+    manager = SessionManager(
+        tmp_path, cache_max_sessions=1, store=JsonlSessionStore(tmp_path / "sessions"),
+        writer=WriteBehind(window_ms=60_000),
+    )
+    session = manager.get_or_create("test:a")
+    session.add_message("user", "not on disk yet")
+    manager.save(session)
+    manager.save(manager.get_or_create("test:b"))  # Evicts test:a from the cache
+    assert manager.get_or_create("test:a") is session  # Not reloaded stale from the store
+    assert manager.storage_stats()["pending"] >= 1
+    manager.close()
+
+    restarted = SessionManager(tmp_path, store=JsonlSessionStore(tmp_path / "sessions"))
+    assert [m["content"] for m in restarted.get_or_create("test:a").messages] == ["not on disk yet"]
+
+
+def test_manager_delete_replaces_a_queued_save(tmp_path):
+    store = JsonlSessionStore(tmp_path / "sessions")
+    manager = SessionManager(tmp_path, store=store, writer=WriteBehind(window_ms=200))
+    session = manager.get_or_create("test:a")
+    session.add_message("user", "hi")
+    manager.save(session)
+    assert manager.delete("test:a") is False  # Never written
+    manager.close()
+    assert store.load("test:a") is None